@@ -0,0 +1,315 @@
+"""
+Multi-Year Recursive Forecast Engine
+
+Rolls tract features forward one year at a time and re-predicts the pillar
+scores at every step, replacing the hand-tuned linear projections used for
+the 2030 charts.
+
+Each simulated year:
+1. Level indicators move by their damped recent trend (momentum) plus the
+   scenario's phased-in intervention increment
+2. Trend features (income_growth, broadband_growth, ...) are recomputed from
+   the new and previous levels
+3. Lagged score features (*_lag1, *_change) are rebuilt from the previous
+   step's scores
+4. Every pillar model scores all (scenario x tract) rows in one batched call
+
+Note: the augmented models were trained with *_change = score - score_lag1
+for the same year. When forecasting, that change is taken from the previous
+step (score momentum), since the current year's score is what is predicted.
+Fed back per scenario, a one-year gap between scenarios is amplified by the
+next step; score_state='baseline' feeds every scenario the baseline path's
+scores instead, so scenarios differ only in their indicators.
+
+forecast_arrays() needs only NumPy (and accepts a dict of arrays), so
+fast-start callers never import pandas; forecast() wraps its result in a
+long DataFrame.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import (  # noqa: E402
+    LEVEL_FEATURES, TREND_OF, PCT_CHANGE_TRENDS, LAG_FEATURES, CHANGE_FEATURES,
+    scale_features)
+
+SCORE_STATE_FEATURES = set(LAG_FEATURES) | set(CHANGE_FEATURES)
+SCORE_STATES = ('recursive', 'baseline')
+
+
+@dataclass
+class ForecastScenario:
+    """
+    An intervention applied over the forecast horizon.
+
+    Attributes:
+    -----------
+    name : str
+        Scenario label
+    deltas : dict
+        Level feature -> total absolute change (feature units, e.g. +20
+        percentage points of broadband access)
+    ramp_years : int
+        Years over which the change is phased in linearly
+    """
+
+    name: str
+    deltas: Dict[str, float] = field(default_factory=dict)
+    ramp_years: int = 1
+
+    def __post_init__(self):
+        unknown = set(self.deltas) - set(LEVEL_FEATURES)
+        if unknown:
+            raise ValueError(f"Scenario '{self.name}' changes non-level features: {unknown}")
+        if self.ramp_years < 1:
+            raise ValueError("ramp_years must be at least 1")
+
+
+BASELINE_SCENARIO = ForecastScenario('baseline')
+
+
+class ForecastEngine:
+    """Vectorized year-by-year forecasts across tracts and scenarios."""
+
+    def __init__(self, models: Mapping, scalers: Mapping, schemas: Mapping,
+                 persistence: float = 0.5):
+        """
+        Parameters:
+        -----------
+        models, scalers, schemas : dict
+            Target -> fitted model / scaler / FeatureSchema
+        persistence : float
+            Share of last year's trend carried into the next year
+            (0 = levels stay flat, 1 = trends continue unchanged)
+        """
+        self.targets = list(models)
+        self.models = dict(models)
+        self.scalers = dict(scalers)
+        self.schemas = dict(schemas)
+        self.persistence = persistence
+
+        for schema in self.schemas.values():
+            for feature in set(schema.features) & SCORE_STATE_FEATURES:
+                score = feature.rsplit('_', 1)[0]
+                if score not in self.models:
+                    raise ValueError(f"{schema.target} uses {feature} but no model "
+                                     f"for {score} was provided")
+
+    def _predict(self, feats: Dict[str, np.ndarray], shape) -> Dict[str, np.ndarray]:
+        """Score every (scenario, tract) row with each model in one call."""
+        predictions = {}
+        for target in self.targets:
+            schema = self.schemas[target]
+            X = np.stack([feats[name] for name in schema.features], axis=-1)
+            X = X.reshape(-1, schema.n_features)
+            y = self.models[target].predict(scale_features(self.scalers[target], X))
+            predictions[target] = y.reshape(shape)
+        return predictions
+
+    def forecast(self, frame: 'pd.DataFrame',
+                 scenarios: Optional[Sequence[ForecastScenario]] = None,
+                 horizon: int = 6, start_year: Optional[int] = None,
+                 anchor_to_observed: bool = False,
+                 score_state: str = 'recursive') -> 'pd.DataFrame':
+        """
+        Forecast pillar scores for every tract under every scenario.
+
+        Parameters are those of forecast_arrays.
+
+        Returns:
+        --------
+        pd.DataFrame
+            Long table with scenario, tract, year, and one column per target
+        """
+        import pandas as pd
+
+        paths = self.forecast_arrays(frame, scenarios, horizon, start_year,
+                                     anchor_to_observed, score_state)
+        n_scen, n_tracts = len(paths['scenarios']), len(paths['tracts'])
+        n_steps = len(paths['years'])
+        result = pd.DataFrame({
+            'scenario': np.repeat(np.repeat(paths['scenarios'], n_tracts), n_steps),
+            'tract': np.repeat(np.tile(paths['tracts'], n_scen), n_steps),
+            'year': np.tile(paths['years'], n_scen * n_tracts),
+        })
+        for t in self.targets:
+            result[t] = paths['scores'][t].reshape(-1)
+        return result
+
+    def forecast_arrays(self, frame,
+                        scenarios: Optional[Sequence[ForecastScenario]] = None,
+                        horizon: int = 6, start_year: Optional[int] = None,
+                        anchor_to_observed: bool = False,
+                        score_state: str = 'recursive') -> Dict:
+        """
+        Forecast pillar scores for every tract under every scenario.
+
+        Parameters:
+        -----------
+        frame : pd.DataFrame or dict of arrays
+            One row per tract for the start year, with level and trend
+            features. Optional columns: tract, year, observed scores
+            (e.g. igs_score) and lagged scores (e.g. igs_score_lag1).
+        scenarios : list of ForecastScenario
+            Interventions to compare (a no-intervention baseline is always
+            included first)
+        horizon : int
+            Number of years to roll forward
+        start_year : int
+            Calendar year of the frame (defaults to frame['year'].max())
+        anchor_to_observed : bool
+            Report observed start score + predicted change instead of raw
+            predictions (removes the model's bias for that tract)
+        score_state : str
+            'recursive' rebuilds each scenario's lag/change features from its
+            own previous scores; 'baseline' uses the baseline scenario's for
+            all of them
+
+        Returns:
+        --------
+        dict
+            scenarios (names), tracts, years, and scores: target ->
+            array of shape (n_scenarios, n_tracts, horizon + 1)
+        """
+        if score_state not in SCORE_STATES:
+            raise ValueError(f"score_state must be one of {SCORE_STATES}, got '{score_state}'")
+        scenarios = [BASELINE_SCENARIO] + [s for s in (scenarios or [])
+                                           if s.name != BASELINE_SCENARIO.name]
+        levels_present = [f for f in LEVEL_FEATURES if f in frame]
+        if not levels_present:
+            raise ValueError("Frame has no level features to forecast from")
+        n_scen = len(scenarios)
+        n_tracts = np.atleast_1d(np.asarray(frame[levels_present[0]])).shape[0]
+        shape = (n_scen, n_tracts)
+        if start_year is None:
+            start_year = int(np.max(frame['year'])) if 'year' in frame else 0
+
+        def tile(values):
+            return np.tile(np.atleast_1d(np.asarray(values, dtype=np.float64)), (n_scen, 1))
+
+        def column(name, default):
+            if name in frame:
+                return np.atleast_1d(np.asarray(frame[name], dtype=np.float64))
+            return np.full(n_tracts, default, dtype=np.float64)
+
+        # Feature state (scenario x tract arrays)
+        feats = {}
+        for level in LEVEL_FEATURES:
+            if level in frame:
+                feats[level] = tile(frame[level])
+                feats[TREND_OF[level]] = tile(column(TREND_OF[level], 0.0))
+        for schema in self.schemas.values():
+            for name in schema.features:
+                if name not in feats and name not in SCORE_STATE_FEATURES:
+                    # Static inputs are carried forward unchanged
+                    feats[name] = tile(column(name, schema.fill_values.get(name, np.nan)))
+
+        # Per-year scenario increments (feature -> (n_scen, 1) array)
+        increments = {}
+        ramps = np.array([s.ramp_years for s in scenarios], dtype=float)[:, None]
+        for level in LEVEL_FEATURES:
+            total = np.array([s.deltas.get(level, 0.0) for s in scenarios])[:, None]
+            if total.any():
+                if level not in feats:
+                    raise ValueError(f"Scenario changes {level}, which is not in the frame")
+                increments[level] = total / ramps
+
+        # Score state: observed start scores seed the lag features
+        observed = {t: tile(frame[t]) for t in self.targets if t in frame}
+        prev_scores = {t: tile(column(f'{t}_lag1', np.nan)) for t in self.targets}
+        for t in self.targets:
+            if t in observed:
+                missing = np.isnan(prev_scores[t])
+                prev_scores[t][missing] = observed[t][missing]
+                feats[f'{t}_lag1'] = prev_scores[t]
+                feats[f'{t}_change'] = np.nan_to_num(tile(column(f'{t}_change', 0.0)))
+            else:
+                feats[f'{t}_lag1'] = prev_scores[t]
+                feats[f'{t}_change'] = np.zeros(shape)
+
+        trajectory = []
+        raw_start = self._predict(feats, shape)
+        current = {t: observed[t] if anchor_to_observed and t in observed else raw_start[t]
+                   for t in self.targets}
+        trajectory.append(current)
+
+        phi = self.persistence
+        for step in range(1, horizon + 1):
+            # 1-2. Move levels and recompute their trend features
+            for level in LEVEL_FEATURES:
+                if level not in feats:
+                    continue
+                trend = TREND_OF[level]
+                old = feats[level]
+                inc = increments[level] * (step <= ramps) if level in increments else 0.0
+                if trend in PCT_CHANGE_TRENDS:
+                    new = old * (1 + phi * feats[trend] / 100) + inc
+                    feats[trend] = np.divide(new - old, old, out=np.zeros_like(old),
+                                             where=old != 0) * 100
+                else:
+                    new = old + phi * feats[trend] + inc
+                    if level.endswith('_pct'):
+                        new = np.clip(new, 0, 100)
+                    feats[trend] = new - old
+                feats[level] = new
+
+            # 3. Lagged score features from the previous step
+            for t in self.targets:
+                previous = current[t]
+                if score_state == 'baseline':
+                    previous = np.repeat(previous[:1], n_scen, axis=0)
+                feats[f'{t}_change'] = previous - feats[f'{t}_lag1']
+                feats[f'{t}_lag1'] = previous
+
+            # 4. One batched prediction per model
+            raw = self._predict(feats, shape)
+            if anchor_to_observed:
+                current = {t: observed[t] + (raw[t] - raw_start[t]) if t in observed else raw[t]
+                           for t in self.targets}
+            else:
+                current = raw
+            trajectory.append(current)
+
+        tracts = np.atleast_1d(np.asarray(frame['tract'])) if 'tract' in frame \
+            else np.arange(n_tracts)
+        return {
+            'scenarios': [s.name for s in scenarios],
+            'tracts': tracts,
+            'years': start_year + np.arange(horizon + 1),
+            # (steps, scen, tract) -> (scen, tract, steps)
+            'scores': {t: np.stack([step_scores[t] for step_scores in trajectory]
+                                   ).transpose(1, 2, 0)
+                       for t in self.targets},
+        }
+
+
+def latest_rows(df: 'pd.DataFrame', year: Optional[int] = None) -> 'pd.DataFrame':
+    """
+    Start-year row per tract, with lagged scores from the prior year.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Panel of tract-years (e.g. igs_trends_features.csv)
+    year : int
+        Start year (defaults to each tract's latest year)
+    """
+    import pandas as pd
+
+    df = df.sort_values(['tract', 'year'])
+    score_cols = [c for c in ('place_score', 'economy_score', 'community_score', 'igs_score')
+                  if c in df]
+    lagged = df.groupby('tract')[score_cols].shift(1).add_suffix('_lag1')
+    changes = (df[score_cols] - lagged.to_numpy()).add_suffix('_change')
+    df = pd.concat([df, lagged, changes], axis=1)
+    if year is not None:
+        return df[df['year'] == year].reset_index(drop=True)
+    return df.groupby('tract').tail(1).reset_index(drop=True)
@@ -13,11 +13,16 @@ Where:
 """
 
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+import sys
 import pandas as pd
 import numpy as np
 import joblib
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import FeatureSchema, scale_features  # noqa: E402
+from profiling.instrumentation import steps  # noqa: E402
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -36,6 +41,8 @@ print("="*80)
 # ============================================================================
 
 print("\n[1/4] Loading data and models...")
+step = steps('generate_sample_submission')
+step('load_data_and_models')
 
 # Load data
 data_path = BASE_DIR / 'data' / 'igs_trends_features.csv'
@@ -55,6 +62,9 @@ economy_scaler = joblib.load(models_dir / 'economy_score_scaler.joblib')
 community_model = joblib.load(models_dir / 'community_score_model.joblib')
 community_scaler = joblib.load(models_dir / 'community_score_scaler.joblib')
 
+# All four baseline models share the same feature schema
+schema = FeatureSchema.load(models_dir, 'igs_score', igs_scaler)
+
 print(f"   ✓ Loaded {len(df)} rows of data")
 print(f"   ✓ Loaded 4 models (IGS, Place, Economy, Community)")
 
@@ -63,17 +73,13 @@ print(f"   ✓ Loaded 4 models (IGS, Place, Economy, Community)")
 # ============================================================================
 
 print("\n[2/4] Preparing features...")
+step('prepare_features')
 
 # Feature columns for each model
-feature_cols = [
-    'median_income', 'broadband_access_pct', 'minority_owned_businesses_pct',
-    'housing_cost_burden_pct', 'early_education_enrollment_pct',
-    'income_growth', 'broadband_growth', 'minority_business_growth',
-    'housing_burden_change', 'early_ed_growth'
-]
+feature_cols = list(schema.features)
 
-# Extract features
-X = df[feature_cols].values
+# Extract features (validated once, in model column order)
+X = schema.to_array(df)
 
 # Target columns
 y_igs = df['igs_score'].values
@@ -88,6 +94,7 @@ print(f"   ✓ Using {len(feature_cols)} features")
 # ============================================================================
 
 print("\n[3/4] Splitting train/test sets...")
+step('split')
 
 # Define train/test split
 # Training: 2020-2023 (most data)
@@ -109,19 +116,20 @@ print(f"   ✓ Test set: {len(X_test)} rows (years 2019, 2024)")
 # ============================================================================
 
 print("\n[4/4] Generating predictions...")
+step('predict')
 
 # Scale features
-X_train_scaled = igs_scaler.transform(X_train)
-X_test_scaled = igs_scaler.transform(X_test)
+X_train_scaled = scale_features(igs_scaler, X_train)
+X_test_scaled = scale_features(igs_scaler, X_test)
 
-X_train_scaled_place = place_scaler.transform(X_train)
-X_test_scaled_place = place_scaler.transform(X_test)
+X_train_scaled_place = scale_features(place_scaler, X_train)
+X_test_scaled_place = scale_features(place_scaler, X_test)
 
-X_train_scaled_economy = economy_scaler.transform(X_train)
-X_test_scaled_economy = economy_scaler.transform(X_test)
+X_train_scaled_economy = scale_features(economy_scaler, X_train)
+X_test_scaled_economy = scale_features(economy_scaler, X_test)
 
-X_train_scaled_community = community_scaler.transform(X_train)
-X_test_scaled_community = community_scaler.transform(X_test)
+X_train_scaled_community = scale_features(community_scaler, X_train)
+X_test_scaled_community = scale_features(community_scaler, X_test)
 
 # Generate predictions for training set
 igs_pred_train = igs_model.predict(X_train_scaled)
@@ -142,6 +150,7 @@ print(f"   ✓ Generated predictions for all sets")
 # ============================================================================
 
 print("\n[5/5] Creating submission file...")
+step('build_submission')
 
 # Training set dataframe
 train_df = pd.DataFrame({
@@ -198,6 +207,7 @@ for col in pred_cols:
 # SAVE SUBMISSION FILE
 # ============================================================================
 
+step('save_submission')
 output_path = OUTPUT_DIR / 'Sample_submission.csv'
 submission_df.to_csv(output_path, index=False)
 
@@ -207,6 +217,7 @@ print(f"   ✓ Saved: {output_path}")
 # GENERATE SUMMARY STATISTICS
 # ============================================================================
 
+step('summary_statistics')
 print("\n" + "="*80)
 print("SUBMISSION FILE SUMMARY")
 print("="*80)
@@ -325,6 +336,8 @@ print("SAMPLE PREDICTIONS (FIRST 10 ROWS)")
 print("="*80)
 print(submission_df.head(10).to_string(index=False))
 
+step.done()
+
 print("\n" + "="*80)
 print("FILE GENERATION COMPLETE")
 print("="*80)
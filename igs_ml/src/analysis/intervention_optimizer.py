@@ -0,0 +1,431 @@
+"""
+Intervention Optimizer for IGS Threshold Targets
+
+Searches for the cheapest combination of feature changes that pushes a
+tract's predicted score over a target (by default the IGS "distressed"
+threshold of 45), using the models loaded by InterventionSimulator.
+
+Each actionable feature has a per-unit cost and bounds on its change (in
+feature units, e.g. percentage points). Candidates are evaluated in batches
+with one model call per batch and memoized on the delta grid, so repeated
+points are never re-scored. Two search strategies are available:
+- coordinate: greedy cost-effectiveness steps followed by a pruning pass
+- evolutionary: (mu + lambda) search with a threshold penalty
+
+Every evaluated point feeds the Pareto front of cost vs. predicted gain.
+
+Example:
+    optimizer = InterventionOptimizer(simulator, [
+        ActionableFeature('broadband_access_pct', unit_cost=1.0, upper=30),
+        ActionableFeature('housing_cost_burden_pct', unit_cost=2.5, lower=-30, upper=0),
+    ])
+    result = optimizer.optimize('05085020800', 2024)
+"""
+
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import (  # noqa: E402
+    DISTRESSED_THRESHOLD, TREND_OF, PCT_CHANGE_TRENDS, scale_features)
+
+
+@dataclass
+class ActionableFeature:
+    """
+    A feature a policy can move, with its cost and allowed range.
+
+    Attributes:
+    -----------
+    name : str
+        Feature name (must be in the model schema)
+    unit_cost : float
+        Cost per unit of absolute change (e.g. per percentage point)
+    lower, upper : float
+        Bounds on the change in feature units (lower may be negative,
+        e.g. -30 for reducing housing burden by up to 30 points)
+    step : float
+        Search grid resolution in feature units
+    """
+
+    name: str
+    unit_cost: float
+    lower: float = 0.0
+    upper: float = 20.0
+    step: float = 1.0
+
+    def __post_init__(self):
+        if self.lower > self.upper:
+            raise ValueError(f"{self.name}: lower bound exceeds upper bound")
+        if self.step <= 0:
+            raise ValueError(f"{self.name}: step must be positive")
+
+
+@dataclass
+class OptimizationResult:
+    """Outcome of an optimizer run."""
+
+    deltas: Dict[str, float]
+    cost: float
+    baseline_score: float
+    predicted_score: float
+    target_score: float
+    reached: bool
+    n_evaluations: int
+    pareto: pd.DataFrame = field(repr=False)
+
+    @property
+    def gain(self) -> float:
+        return self.predicted_score - self.baseline_score
+
+
+def apply_level_deltas(schema, X: np.ndarray, names: Sequence[str],
+                       D: np.ndarray, update_trends: bool = True) -> np.ndarray:
+    """
+    Add absolute deltas to feature columns of a baseline matrix.
+
+    Parameters:
+    -----------
+    schema : FeatureSchema
+        Schema giving the column layout of X
+    X : np.ndarray
+        Baseline row(s) of shape (1, n_features) or (n, n_features)
+    names : list of str
+        Features the columns of D apply to
+    D : np.ndarray
+        Deltas of shape (n, len(names))
+    update_trends : bool
+        Also move the trend feature linked to each level feature, so a
+        +d point change this year shows up in its year-over-year growth
+
+    Returns:
+    --------
+    np.ndarray
+        Adjusted matrix of shape (n, n_features)
+    """
+    X_new = np.repeat(X, D.shape[0], axis=0) if X.shape[0] == 1 else X.copy()
+    for j, name in enumerate(names):
+        col = schema.index(name)
+        level_before = X_new[:, col].copy()
+        X_new[:, col] = X_new[:, col] + D[:, j]
+        if name.endswith('_pct'):
+            X_new[:, col] = np.clip(X_new[:, col], 0, 100)
+
+        trend = TREND_OF.get(name)
+        if not update_trends or trend is None or trend not in schema.features:
+            continue
+        t_col = schema.index(trend)
+        applied = X_new[:, col] - level_before
+        if trend in PCT_CHANGE_TRENDS:
+            # growth = (level / previous - 1) * 100 with previous year held fixed
+            factor = np.divide(X_new[:, col], level_before,
+                               out=np.ones_like(level_before), where=level_before != 0)
+            X_new[:, t_col] = (1 + X_new[:, t_col] / 100) * factor * 100 - 100
+        else:
+            X_new[:, t_col] = X_new[:, t_col] + applied
+    return X_new
+
+
+def pareto_front(costs: np.ndarray, gains: np.ndarray) -> np.ndarray:
+    """Indices of points not dominated in (lower cost, higher gain), sorted by cost."""
+    order = np.lexsort((-gains, costs))
+    front = []
+    best_gain = -np.inf
+    for i in order:
+        if gains[i] > best_gain:
+            front.append(i)
+            best_gain = gains[i]
+    return np.asarray(front, dtype=int)
+
+
+class InterventionOptimizer:
+    """Minimal-cost search over actionable feature changes."""
+
+    def __init__(self, simulator, actions: Sequence[ActionableFeature],
+                 target: str = 'igs_score', update_trends: bool = True):
+        """
+        Parameters:
+        -----------
+        simulator : InterventionSimulator
+            Simulator with loaded models, scalers, schemas, and data
+        actions : list of ActionableFeature
+            Features the optimizer may change
+        target : str
+            Score to push over the threshold
+        update_trends : bool
+            Move linked trend features together with level features
+        """
+        self.simulator = simulator
+        self.actions = list(actions)
+        self.target = target
+        self.update_trends = update_trends
+        self.model = simulator.models[target]
+        self.scaler = simulator.scalers[target]
+        self.schema = simulator.schemas[target]
+
+        for action in self.actions:
+            self.schema.index(action.name)  # raises for unknown features
+
+        self.names = [a.name for a in self.actions]
+        self.unit_cost = np.array([a.unit_cost for a in self.actions], dtype=float)
+        self.step = np.array([a.step for a in self.actions], dtype=float)
+        self.lower_idx = np.array([int(np.ceil(a.lower / a.step - 1e-9))
+                                   for a in self.actions])
+        self.upper_idx = np.array([int(np.floor(a.upper / a.step + 1e-9))
+                                   for a in self.actions])
+
+        self._baseline = None
+        self._cache: Dict[tuple, float] = {}
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    def _cost(self, idx: np.ndarray) -> np.ndarray:
+        return np.abs(idx * self.step) @ self.unit_cost
+
+    def evaluate(self, idx: np.ndarray) -> np.ndarray:
+        """
+        Predicted target score for grid points (memoized, one batched call).
+
+        Parameters:
+        -----------
+        idx : np.ndarray
+            Integer grid coordinates of shape (n, n_actions); the delta of
+            action j is idx[:, j] * step[j]
+
+        Returns:
+        --------
+        np.ndarray
+            Predicted scores of shape (n,)
+        """
+        idx = np.atleast_2d(np.asarray(idx, dtype=int))
+        keys = [tuple(row) for row in idx]
+        missing = list(dict.fromkeys(k for k in keys if k not in self._cache))
+        if missing:
+            D = np.asarray(missing, dtype=float) * self.step
+            X = apply_level_deltas(self.schema, self._baseline, self.names, D,
+                                   self.update_trends)
+            preds = self.model.predict(scale_features(self.scaler, X))
+            self._cache.update(zip(missing, preds))
+        return np.array([self._cache[k] for k in keys])
+
+    def _clip(self, idx: np.ndarray) -> np.ndarray:
+        return np.clip(idx, self.lower_idx, self.upper_idx)
+
+    # ------------------------------------------------------------------
+    # Search strategies
+    # ------------------------------------------------------------------
+
+    def _coordinate_search(self, goal: float, max_iter: int) -> np.ndarray:
+        """Greedy best gain-per-cost moves, then prune unneeded spend."""
+        n = len(self.actions)
+        current = self._clip(np.zeros(n, dtype=int))
+        score = self.evaluate(current)[0]
+
+        for _ in range(max_iter):
+            if score >= goal:
+                break
+            # Every reachable level of every single coordinate, in one batch
+            candidates = []
+            for j in range(n):
+                for level in range(self.lower_idx[j], self.upper_idx[j] + 1):
+                    if level != current[j]:
+                        cand = current.copy()
+                        cand[j] = level
+                        candidates.append(cand)
+            if not candidates:
+                break
+            candidates = np.asarray(candidates)
+            scores = self.evaluate(candidates)
+            extra_cost = self._cost(candidates) - self._cost(current[None, :])[0]
+            gain = scores - score
+
+            # Prefer moves that reach the goal cheaply, else best gain per cost
+            reaching = scores >= goal
+            if reaching.any():
+                pick = np.flatnonzero(reaching)[np.argmin(extra_cost[reaching])]
+            else:
+                improving = gain > 1e-9
+                if not improving.any():
+                    break
+                ratio = np.where(improving, gain / np.maximum(extra_cost, 1e-9), -np.inf)
+                pick = int(np.argmax(ratio))
+            current, score = candidates[pick], scores[pick]
+
+        return self._prune(current, goal)
+
+    def _prune(self, current: np.ndarray, goal: float) -> np.ndarray:
+        """Walk each coordinate back toward zero while the goal still holds."""
+        if self.evaluate(current)[0] < goal:
+            return current
+        improved = True
+        while improved:
+            improved = False
+            moves = []
+            for j in np.flatnonzero(current):
+                cand = current.copy()
+                cand[j] -= np.sign(cand[j])
+                moves.append(cand)
+            if not moves:
+                break
+            moves = self._clip(np.asarray(moves))
+            ok = self.evaluate(moves) >= goal
+            if ok.any():
+                costs = np.where(ok, self._cost(moves), np.inf)
+                current = moves[int(np.argmin(costs))]
+                improved = True
+        return current
+
+    def _evolutionary_search(self, goal: float, generations: int, population: int,
+                             seed: Optional[int]) -> np.ndarray:
+        """(mu + lambda) search minimizing cost plus a shortfall penalty."""
+        rng = np.random.default_rng(seed)
+        n = len(self.actions)
+        span = np.maximum(self.upper_idx - self.lower_idx, 1)
+        max_cost = self._cost(np.where(np.abs(self.lower_idx) > np.abs(self.upper_idx),
+                                       self.lower_idx, self.upper_idx)[None, :])[0]
+        penalty = 10 * max(max_cost, 1.0)
+
+        def fitness(pop):
+            shortfall = np.maximum(goal - self.evaluate(pop), 0)
+            return self._cost(pop) + penalty * shortfall
+
+        pop = self._clip(rng.integers(self.lower_idx, self.upper_idx + 1,
+                                      size=(population, n)))
+        fit = fitness(pop)
+        for _ in range(generations):
+            parents = pop[rng.integers(0, population, size=population)]
+            sigma = np.maximum(span * 0.15, 1)
+            children = self._clip(np.rint(parents + rng.normal(0, sigma, parents.shape))
+                                  .astype(int))
+            # Shrink step: pull some genes toward zero to discover cheaper mixes
+            shrink = rng.random(children.shape) < 0.2
+            children = np.where(shrink, children - np.sign(children), children)
+            children = self._clip(children)
+
+            merged = np.vstack([pop, children])
+            merged_fit = np.concatenate([fit, fitness(children)])
+            keep = np.argsort(merged_fit, kind='stable')[:population]
+            pop, fit = merged[keep], merged_fit[keep]
+
+        return self._prune(pop[0], goal)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def optimize(self, tract: str, year: int, threshold: float = DISTRESSED_THRESHOLD,
+                 method: str = 'coordinate', max_iter: int = 50,
+                 generations: int = 40, population: int = 32,
+                 seed: Optional[int] = 42) -> Optional[OptimizationResult]:
+        """
+        Find the cheapest deltas that lift the predicted score to a threshold.
+
+        Parameters:
+        -----------
+        tract : str
+            Census tract ID
+        year : int
+            Baseline year
+        threshold : float
+            Target score (default: IGS distressed threshold, 45)
+        method : str
+            'coordinate' or 'evolutionary'
+        max_iter : int
+            Coordinate-search iterations
+        generations, population : int
+            Evolutionary-search settings
+        seed : int
+            Random seed for the evolutionary search
+
+        Returns:
+        --------
+        OptimizationResult or None
+            Best deltas found and the Pareto front of cost vs. gain;
+            None if the tract/year has no data
+        """
+        baseline_features = self.simulator.get_baseline_features(tract, year)
+        if baseline_features is None:
+            return None
+        self._baseline = self.schema.to_array(baseline_features)
+        self._cache = {}
+
+        baseline_score = float(self.model.predict(
+            scale_features(self.scaler, self._baseline))[0])
+
+        if method == 'coordinate':
+            best = self._coordinate_search(threshold, max_iter)
+        elif method == 'evolutionary':
+            best = self._evolutionary_search(threshold, generations, population, seed)
+        else:
+            raise ValueError(f"Unknown search method: {method}")
+
+        predicted = float(self.evaluate(best)[0])
+        return OptimizationResult(
+            deltas={name: float(v) for name, v in zip(self.names, best * self.step)},
+            cost=float(self._cost(best[None, :])[0]),
+            baseline_score=baseline_score,
+            predicted_score=predicted,
+            target_score=threshold,
+            reached=predicted >= threshold,
+            n_evaluations=len(self._cache),
+            pareto=self.pareto(baseline_score),
+        )
+
+    def pareto(self, baseline_score: float) -> pd.DataFrame:
+        """Pareto front (cost vs. gain) over every point evaluated so far."""
+        if not self._cache:
+            return pd.DataFrame(columns=[*self.names, 'cost', 'score', 'gain'])
+        idx = np.asarray(list(self._cache.keys()), dtype=int)
+        scores = np.fromiter(self._cache.values(), dtype=float, count=len(idx))
+        costs = self._cost(idx)
+        gains = scores - baseline_score
+        front = pareto_front(costs, gains)
+
+        pareto_df = pd.DataFrame(idx[front] * self.step, columns=self.names)
+        pareto_df['cost'] = costs[front]
+        pareto_df['score'] = scores[front]
+        pareto_df['gain'] = gains[front]
+        return pareto_df.reset_index(drop=True)
+
+
+def main():
+    """Example: cheapest path for tract 20800 to clear the distressed threshold."""
+    from analysis.simulate_intervention import InterventionSimulator
+
+    simulator = InterventionSimulator()
+    actions = [
+        ActionableFeature('broadband_access_pct', unit_cost=1.0, upper=30),
+        ActionableFeature('minority_owned_businesses_pct', unit_cost=1.5, upper=20),
+        ActionableFeature('early_education_enrollment_pct', unit_cost=2.0, upper=25),
+        ActionableFeature('housing_cost_burden_pct', unit_cost=2.5, lower=-30, upper=0),
+    ]
+    optimizer = InterventionOptimizer(simulator, actions)
+
+    for method in ('coordinate', 'evolutionary'):
+        result = optimizer.optimize('05085020800', 2024, method=method)
+        if result is None:
+            return
+
+        print("\n" + "="*60)
+        print(f"OPTIMAL INTERVENTION ({method})")
+        print("="*60)
+        print(f"  Baseline {optimizer.target}: {result.baseline_score:.2f}")
+        print(f"  Predicted {optimizer.target}: {result.predicted_score:.2f} "
+              f"({'reaches' if result.reached else 'below'} {result.target_score:.0f})")
+        print(f"  Cost: {result.cost:.1f}  |  Evaluations: {result.n_evaluations}")
+        for name, delta in result.deltas.items():
+            if delta:
+                print(f"    {name}: {delta:+.1f}")
+        print("\n  Pareto front (cost vs. gain):")
+        print(result.pareto.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
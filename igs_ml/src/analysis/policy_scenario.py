@@ -0,0 +1,101 @@
+"""
+Dashboard Policy Scenario
+
+Builds the baseline and intervention feature rows for the dashboard's
+policy simulation: Lonoke County tract 20800 in 2024 with housing cost
+burden reduced and early education / minority-owned business shares
+increased by the slider amounts. Shared by the one-shot CLI
+(nextjs-dashboard/scripts/run_policy_simulation.py) and the batching
+policy server (serving/policy_server.py) so both score identical rows.
+
+The intervention is written in the scenario language (POLICY_SCENARIO).
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from analysis.scenario_dsl import compile_scenario  # noqa: E402
+
+# Baseline 2024 values for Lonoke County (Tract 20800)
+BASELINE_2024 = {
+    'year': 2024,
+    'median_income': 36500,
+    'broadband_access_pct': 58.7,
+    'minority_owned_businesses_pct': 8.3,
+    'housing_cost_burden_pct': 86.5,
+    'early_education_enrollment_pct': 33.4,
+    'income_growth': -3.1,
+    'broadband_growth': 2.9,
+    'minority_business_growth': 0.0,
+    'housing_burden_change': 0.0,
+    'early_ed_growth': -3.3,
+    'igs_score': 27.0,
+    'place_score': 21.0,
+    'economy_score': 20.0,
+    'community_score': 40.0
+}
+
+SCORE_TYPES = ('igs_score', 'place_score', 'economy_score', 'community_score')
+
+# Slider settings (housing, education, business) spanning the dashboard's range
+CANARY_SETTINGS = ((0, 0, 0), (10, 5, 3), (25, 15, 10), (50, 40, 30), (86.5, 66.6, 91.7))
+
+# Slider amounts are percentage points; shares stay within 0-100 and the
+# growth features are recomputed against the 2024 baseline
+POLICY_SCENARIO = """
+housing_cost_burden_pct -= $housing_reduction
+housing_cost_burden_pct >= 0
+early_education_enrollment_pct += $education_increase
+early_education_enrollment_pct <= 100
+minority_owned_businesses_pct += $business_increase
+minority_owned_businesses_pct <= 100
+housing_burden_change = diff(housing_cost_burden_pct)
+early_ed_growth = pct(early_education_enrollment_pct)
+minority_business_growth = pct(minority_owned_businesses_pct)
+"""
+
+
+def baseline_row() -> Dict:
+    """The 2024 baseline with lagged scores and zero score changes."""
+    baseline = dict(BASELINE_2024)
+    for score_type in SCORE_TYPES:
+        baseline[f'{score_type}_lag1'] = baseline[score_type]
+        baseline[f'{score_type}_change'] = 0
+    return baseline
+
+
+POLICY_PROGRAM = compile_scenario(POLICY_SCENARIO, tuple(baseline_row()))
+
+
+def policy_rows(housing_reduction: float, education_increase: float,
+                business_increase: float) -> Tuple[Dict, Dict]:
+    """
+    Baseline and intervention rows for one slider setting.
+
+    Parameters:
+    -----------
+    housing_reduction : float
+        Points removed from the housing cost burden share
+    education_increase, business_increase : float
+        Points added to early education enrollment and minority-owned
+        business shares
+
+    Returns:
+    --------
+    tuple of dict
+        (baseline, intervention) with every feature of the augmented models
+    """
+    baseline = baseline_row()
+    intervention = POLICY_PROGRAM.apply_row(baseline, {
+        'housing_reduction': housing_reduction,
+        'education_increase': education_increase,
+        'business_increase': business_increase,
+    })
+    return baseline, intervention
+
+
+def canary_rows() -> List[Dict]:
+    """Intervention rows for CANARY_SETTINGS (checks run on reloaded models)."""
+    return [policy_rows(*setting)[1] for setting in CANARY_SETTINGS]
@@ -4,17 +4,26 @@ Uses trained Random Forest model to forecast impact of policy interventions
 """
 
 from sklearn.metrics import mean_squared_error
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import joblib
 import os
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import (  # noqa: E402
+    DISTRESSED_THRESHOLD, IMPROVING_THRESHOLD, FeatureSchema, scale_features)
+from analysis.forecast_engine import ForecastEngine, ForecastScenario  # noqa: E402
+from analysis.scenario_dsl import compile_scenario  # noqa: E402
 
 # Paths
-data_file = '/Users/cyrilkups/Desktop/DataDrive Project/igs_ml/data/igs_trends_features.csv'
-model_file = '/Users/cyrilkups/Desktop/DataDrive Project/igs_ml/output/models/igs_score_model.joblib'
-scaler_file = '/Users/cyrilkups/Desktop/DataDrive Project/igs_ml/output/models/igs_score_scaler.joblib'
-output_dir = '/Users/cyrilkups/Desktop/DataDrive Project/igs_ml/Slide_5_Predicted_Outcomes'
+BASE_DIR = Path(__file__).resolve().parents[2]
+data_file = BASE_DIR / 'data' / 'igs_trends_features.csv'
+model_file = BASE_DIR / 'output' / 'models' / 'igs_score_model.joblib'
+scaler_file = BASE_DIR / 'output' / 'models' / 'igs_score_scaler.joblib'
+output_dir = str(BASE_DIR / 'Slide_5_Predicted_Outcomes')
 
 # Create output directory
 os.makedirs(output_dir, exist_ok=True)
@@ -30,6 +39,7 @@ df = pd.read_csv(data_file)
 # Load trained model and scaler
 model = joblib.load(model_file)
 scaler = joblib.load(scaler_file)
+schema = FeatureSchema.load(os.path.dirname(model_file), 'igs_score', scaler)
 
 print(f"   ✓ Loaded dataset: {len(df)} rows")
 print(f"   ✓ Loaded model: {type(model).__name__}")
@@ -48,22 +58,11 @@ if len(baseline_row) == 0:
 
 baseline_row = baseline_row.iloc[0]
 
-# Define feature columns (must match training)
-feature_cols = [
-    'median_income',
-    'broadband_access_pct',
-    'minority_owned_businesses_pct',
-    'housing_cost_burden_pct',
-    'early_education_enrollment_pct',
-    'income_growth',
-    'broadband_growth',
-    'minority_business_growth',
-    'housing_burden_change',
-    'early_ed_growth'
-]
+# Feature columns (must match training; taken from the saved schema)
+feature_cols = list(schema.features)
 
 # Extract baseline features
-baseline_features = baseline_row[feature_cols].values.reshape(1, -1)
+baseline_features = schema.to_array(baseline_row)
 
 print(f"   ✓ Baseline features extracted:")
 for col, val in zip(feature_cols, baseline_features[0]):
@@ -72,49 +71,41 @@ for col, val in zip(feature_cols, baseline_features[0]):
 # Create scenarios
 print("\n3. Creating intervention scenarios...")
 
-# Scenario 1: Broadband Expansion
-scenario1_features = baseline_features.copy()
-broadband_idx = feature_cols.index('broadband_access_pct')
-broadband_growth_idx = feature_cols.index('broadband_growth')
-scenario1_features[0, broadband_idx] += 20  # +20 percentage points
-scenario1_features[0, broadband_growth_idx] += 0.20  # +0.20 trend
+# Interventions in percentage points plus trend bumps; one parameter set
+# per row: baseline, broadband, entrepreneurship + workforce, full package
+INTERVENTION_SCENARIO = """
+broadband_access_pct += $broadband              # +20 percentage points
+broadband_growth += $broadband_trend            # +0.20 trend
+minority_owned_businesses_pct += $business      # +15 percentage points
+early_education_enrollment_pct += $early_ed     # +12 percentage points
+minority_business_growth += $business_trend     # +0.10 trend
+early_ed_growth += $early_ed_trend              # +0.10 trend
+"""
+scenario_params = {
+    'broadband': [0, 20, 0, 20],
+    'broadband_trend': [0, 0.20, 0, 0.20],
+    'business': [0, 0, 15, 15],
+    'early_ed': [0, 0, 12, 12],
+    'business_trend': [0, 0, 0.10, 0.10],
+    'early_ed_trend': [0, 0, 0.10, 0.10],
+}
+program = compile_scenario(INTERVENTION_SCENARIO, feature_cols)
+# (4 scenarios, 1 tract, n_features) -> one row per scenario
+scenario_matrix = program.apply(baseline_features, scenario_params)[:, 0, :]
 
-print("\n   Scenario 1 - Broadband Expansion:")
-print(
-    f"     - broadband_access_pct: {baseline_features[0, broadband_idx]:.2f} → {scenario1_features[0, broadband_idx]:.2f}")
-print(
-    f"     - broadband_growth: {baseline_features[0, broadband_growth_idx]:.2f} → {scenario1_features[0, broadband_growth_idx]:.2f}")
 
-# Scenario 2: Entrepreneurship + Workforce Training
-scenario2_features = baseline_features.copy()
-minority_business_idx = feature_cols.index('minority_owned_businesses_pct')
-early_ed_idx = feature_cols.index('early_education_enrollment_pct')
-minority_growth_idx = feature_cols.index('minority_business_growth')
-early_ed_growth_idx = feature_cols.index('early_ed_growth')
+def print_changes(row, changed):
+    for name in changed:
+        idx = feature_cols.index(name)
+        print(f"     - {name}: {baseline_features[0, idx]:.2f} → {scenario_matrix[row, idx]:.2f}")
 
-scenario2_features[0, minority_business_idx] += 15  # +15 percentage points
-scenario2_features[0, early_ed_idx] += 12  # +12 percentage points
-scenario2_features[0, minority_growth_idx] += 0.10  # +0.10 trend
-scenario2_features[0, early_ed_growth_idx] += 0.10  # +0.10 trend
 
-print("\n   Scenario 2 - Entrepreneurship + Workforce Training:")
-print(
-    f"     - minority_owned_businesses_pct: {baseline_features[0, minority_business_idx]:.2f} → {scenario2_features[0, minority_business_idx]:.2f}")
-print(
-    f"     - early_education_enrollment_pct: {baseline_features[0, early_ed_idx]:.2f} → {scenario2_features[0, early_ed_idx]:.2f}")
-print(
-    f"     - minority_business_growth: {baseline_features[0, minority_growth_idx]:.2f} → {scenario2_features[0, minority_growth_idx]:.2f}")
-print(
-    f"     - early_ed_growth: {baseline_features[0, early_ed_growth_idx]:.2f} → {scenario2_features[0, early_ed_growth_idx]:.2f}")
+print("\n   Scenario 1 - Broadband Expansion:")
+print_changes(1, ['broadband_access_pct', 'broadband_growth'])
 
-# Scenario 3: Full Intervention Package
-scenario3_features = baseline_features.copy()
-scenario3_features[0, broadband_idx] += 20
-scenario3_features[0, broadband_growth_idx] += 0.20
-scenario3_features[0, minority_business_idx] += 15
-scenario3_features[0, early_ed_idx] += 12
-scenario3_features[0, minority_growth_idx] += 0.10
-scenario3_features[0, early_ed_growth_idx] += 0.10
+print("\n   Scenario 2 - Entrepreneurship + Workforce Training:")
+print_changes(2, ['minority_owned_businesses_pct', 'early_education_enrollment_pct',
+                  'minority_business_growth', 'early_ed_growth'])
 
 print("\n   Scenario 3 - Full Intervention Package:")
 print("     - All adjustments from Scenario 1 and 2 combined")
@@ -122,15 +113,9 @@ print("     - All adjustments from Scenario 1 and 2 combined")
 # Scale features and predict
 print("\n4. Predicting IGS scores...")
 
-baseline_scaled = scaler.transform(baseline_features)
-scenario1_scaled = scaler.transform(scenario1_features)
-scenario2_scaled = scaler.transform(scenario2_features)
-scenario3_scaled = scaler.transform(scenario3_features)
-
-baseline_igs = model.predict(baseline_scaled)[0]
-scenario1_igs = model.predict(scenario1_scaled)[0]
-scenario2_igs = model.predict(scenario2_scaled)[0]
-scenario3_igs = model.predict(scenario3_scaled)[0]
+# Score all four rows in one batched call
+baseline_igs, scenario1_igs, scenario2_igs, scenario3_igs = model.predict(
+    scale_features(scaler, scenario_matrix))
 
 # Calculate improvements
 delta1 = scenario1_igs - baseline_igs
@@ -148,9 +133,9 @@ print(
 print(f"Scenario 3 – Full Intervention Package: IGS ↑ +{delta3:.1f}")
 
 # Interpretation
-if scenario3_igs >= 55:
+if scenario3_igs >= IMPROVING_THRESHOLD:
     status = 'improving'
-elif scenario3_igs >= 45:
+elif scenario3_igs >= DISTRESSED_THRESHOLD:
     status = 'recovering'
 else:
     status = 'distressed'
@@ -237,9 +222,9 @@ print(f"✓ Saved summary: {results_file}")
 print("\n6. Generating multi-year forecast (2024-2027)...")
 
 # Calculate model RMSE from training data for confidence intervals
-X_full = df[feature_cols].values
+X_full = schema.to_array(df)
 y_full = df['igs_score'].values
-X_full_scaled = scaler.transform(X_full)
+X_full_scaled = scale_features(scaler, X_full)
 y_pred_full = model.predict(X_full_scaled)
 rmse = np.sqrt(mean_squared_error(y_full, y_pred_full))
 ci = 2 * rmse  # 95% confidence interval
@@ -247,40 +232,31 @@ ci = 2 * rmse  # 95% confidence interval
 print(f"   ✓ Model RMSE: {rmse:.2f}")
 print(f"   ✓ Confidence Interval (±2*RMSE): ±{ci:.2f}")
 
-# Generate 3-year projections using gradual improvement
-years = [2024, 2025, 2026, 2027]
-
-# Baseline projection (no intervention - slight decline)
-baseline_proj = [
-    baseline_igs,
-    baseline_igs - 0.5,
-    baseline_igs - 0.8,
-    baseline_igs - 1.0
-]
-
-# Scenario 1 projection (gradual implementation)
-s1_proj = [
-    scenario1_igs,
-    baseline_igs + (delta1 * 0.50),
-    baseline_igs + (delta1 * 0.75),
-    baseline_igs + (delta1 * 1.00)
-]
-
-# Scenario 2 projection
-s2_proj = [
-    scenario2_igs,
-    baseline_igs + (delta2 * 0.50),
-    baseline_igs + (delta2 * 0.75),
-    baseline_igs + (delta2 * 1.00)
-]
-
-# Scenario 3 projection
-s3_proj = [
-    scenario3_igs,
-    baseline_igs + (delta3 * 0.50),
-    baseline_igs + (delta3 * 0.75),
-    baseline_igs + (delta3 * 1.00)
+# Roll features forward year by year with the recursive forecast engine.
+# Interventions phase in over 2025-2027 (same package as the bar chart).
+years_extended = [2024, 2025, 2026, 2027, 2028, 2029, 2030]
+forecaster = ForecastEngine({'igs_score': model}, {'igs_score': scaler},
+                            {'igs_score': schema})
+forecast_scenarios = [
+    ForecastScenario('s1', {'broadband_access_pct': 20}, ramp_years=3),
+    ForecastScenario('s2', {'minority_owned_businesses_pct': 15,
+                            'early_education_enrollment_pct': 12}, ramp_years=3),
+    ForecastScenario('s3', {'broadband_access_pct': 20,
+                            'minority_owned_businesses_pct': 15,
+                            'early_education_enrollment_pct': 12}, ramp_years=3),
 ]
+trajectories = forecaster.forecast(baseline_row, forecast_scenarios,
+                                   horizon=len(years_extended) - 1,
+                                   start_year=years_extended[0])
+paths = {name: group['igs_score'].to_numpy()
+         for name, group in trajectories.groupby('scenario', sort=False)}
+
+# 3-year window (2024-2027)
+years = years_extended[:4]
+baseline_proj = list(paths['baseline'][:4])
+s1_proj = list(paths['s1'][:4])
+s2_proj = list(paths['s2'][:4])
+s3_proj = list(paths['s3'][:4])
 
 # Create forecast DataFrame
 forecast_df = pd.DataFrame({
@@ -358,52 +334,11 @@ plt.close()
 
 print("\n8. Creating extended forecast to 2030...")
 
-# Generate extended 6-year projections to 2030
-years_extended = [2024, 2025, 2026, 2027, 2028, 2029, 2030]
-
-# Baseline projection (continued decline)
-baseline_proj_2030 = [
-    baseline_igs,
-    baseline_igs - 0.5,
-    baseline_igs - 0.8,
-    baseline_igs - 1.0,
-    baseline_igs - 1.2,
-    baseline_igs - 1.4,
-    baseline_igs - 1.6
-]
-
-# Scenario 1: Gradual improvement, crosses threshold by 2029-2030
-s1_proj_2030 = [
-    scenario1_igs,
-    baseline_igs + (delta1 * 0.50),
-    baseline_igs + (delta1 * 0.75),
-    baseline_igs + (delta1 * 1.00),
-    baseline_igs + (delta1 * 1.30),
-    baseline_igs + (delta1 * 1.65),
-    baseline_igs + (delta1 * 2.00)    # ~48 by 2030
-]
-
-# Scenario 2: Slower growth, approaches and crosses threshold
-s2_proj_2030 = [
-    scenario2_igs,
-    baseline_igs + (delta2 * 0.50),
-    baseline_igs + (delta2 * 0.75),
-    baseline_igs + (delta2 * 1.00),
-    baseline_igs + (delta2 * 1.60),
-    baseline_igs + (delta2 * 2.30),
-    baseline_igs + (delta2 * 3.00)    # ~48 by 2030
-]
-
-# Scenario 3: Full package - strongest growth, crosses threshold earlier
-s3_proj_2030 = [
-    scenario3_igs,
-    baseline_igs + (delta3 * 0.50),
-    baseline_igs + (delta3 * 0.75),
-    baseline_igs + (delta3 * 1.00),
-    baseline_igs + (delta3 * 1.35),   # 2028: crossing threshold
-    baseline_igs + (delta3 * 1.75),   # 2029: solidly above 45
-    baseline_igs + (delta3 * 2.15)    # 2030: ~50 well above threshold
-]
+# Extended projections come from the same recursive forecast (2024-2030)
+baseline_proj_2030 = list(paths['baseline'])
+s1_proj_2030 = list(paths['s1'])
+s2_proj_2030 = list(paths['s2'])
+s3_proj_2030 = list(paths['s3'])
 
 # Create extended forecast DataFrame
 forecast_2030_df = pd.DataFrame({
@@ -473,6 +408,52 @@ print(f"\n✓ Saved extended forecast to 2030: {forecast_2030_path}")
 
 plt.close()
 
+# Interpretation text is derived from the forecast paths, not hard-coded
+RAMP_END = years_extended.index(2027)  # interventions are fully phased in
+
+
+def direction(change, tolerance=0.1):
+    """'rises', 'holds flat' or 'falls' for a change in IGS points."""
+    if abs(change) < tolerance:
+        return 'holds flat'
+    return 'rises' if change > 0 else 'falls'
+
+
+def threshold_status(score):
+    """Where a 2030 score sits relative to the IGS status bands."""
+    if score >= IMPROVING_THRESHOLD:
+        return (f"{score:.1f} in 2030 is above the improving threshold "
+                f"({IMPROVING_THRESHOLD:.0f})")
+    if score >= DISTRESSED_THRESHOLD:
+        return (f"{score:.1f} in 2030 is above the distressed threshold "
+                f"({DISTRESSED_THRESHOLD:.0f}) but below the improving threshold "
+                f"({IMPROVING_THRESHOLD:.0f})")
+    return (f"{score:.1f} in 2030 is {DISTRESSED_THRESHOLD - score:.1f} points below the "
+            f"distressed threshold ({DISTRESSED_THRESHOLD:.0f})")
+
+
+def describe_path(path):
+    """Interpretation lines for one 2024-2030 path: slope, late trend, peak, threshold."""
+    path = np.asarray(path)
+    slope = (path[-1] - path[0]) / (len(path) - 1)
+    late = path[-1] - path[RAMP_END]
+    lines = [f"Average slope: {slope:+.2f} points per year (2024-2030)",
+             f"After the phase-in the score {direction(late)} "
+             f"({late:+.1f} points over 2027-2030)"]
+    peak = int(np.argmax(path))
+    if peak < len(path) - 1 and path[peak] - path[-1] >= 0.1:
+        lines.append(f"Peaks at {path[peak]:.1f} in {years_extended[peak]}, "
+                     f"then ends {path[peak] - path[-1]:.1f} points lower")
+    lines.append(f"Threshold status: {threshold_status(path[-1])}")
+    return lines
+
+
+scenario_paths = {
+    'Broadband Expansion': s1_proj_2030,
+    'Entrepreneurship + Workforce': s2_proj_2030,
+    'Full Package': s3_proj_2030,
+}
+
 # Save extended forecast insights to text file
 forecast_2030_insights_file = os.path.join(
     output_dir, 'extended_forecast_2030_insights.txt')
@@ -498,9 +479,9 @@ with open(forecast_2030_insights_file, 'w') as f:
     f.write(f"   • 2030: {baseline_proj_2030[6]:.1f}\n")
     f.write(
         f"   • Net Change: {baseline_proj_2030[6] - baseline_proj_2030[0]:.1f} points\n")
-    f.write(
-        "   • Interpretation: Without intervention, tract continues steady decline,\n")
-    f.write("     losing ~1.6 points over 6 years. Remains deeply distressed.\n\n")
+    for line in describe_path(baseline_proj_2030):
+        f.write(f"   • {line}\n")
+    f.write("\n")
 
     # Scenario 1
     f.write("2. SCENARIO 1 – Broadband Expansion (+20%):\n")
@@ -509,12 +490,9 @@ with open(forecast_2030_insights_file, 'w') as f:
     f.write(f"   • 2030: {s1_proj_2030[6]:.1f}\n")
     f.write(
         f"   • Net Improvement: {s1_proj_2030[6] - baseline_igs:.1f} points from baseline\n")
-    f.write(
-        f"   • Threshold Status: {'CROSSES' if s1_proj_2030[6] >= 45 else 'BELOW'} distressed threshold (45)\n")
-    f.write(
-        "   • Interpretation: Broadband infrastructure shows strong sustained impact.\n")
-    f.write("     Digital connectivity improvements compound over time, enabling\n")
-    f.write("     economic participation and remote work opportunities.\n\n")
+    for line in describe_path(s1_proj_2030):
+        f.write(f"   • {line}\n")
+    f.write("\n")
 
     # Scenario 2
     f.write("3. SCENARIO 2 – Entrepreneurship + Workforce Training:\n")
@@ -523,12 +501,9 @@ with open(forecast_2030_insights_file, 'w') as f:
     f.write(f"   • 2030: {s2_proj_2030[6]:.1f}\n")
     f.write(
         f"   • Net Improvement: {s2_proj_2030[6] - baseline_igs:.1f} points from baseline\n")
-    f.write(
-        f"   • Threshold Status: {'CROSSES' if s2_proj_2030[6] >= 45 else 'BELOW'} distressed threshold (45)\n")
-    f.write(
-        "   • Interpretation: Human capital investments show accelerating returns.\n")
-    f.write("     Early years build foundation; later years see compounding effects\n")
-    f.write("     from established businesses and trained workforce.\n\n")
+    for line in describe_path(s2_proj_2030):
+        f.write(f"   • {line}\n")
+    f.write("\n")
 
     # Scenario 3
     f.write("4. SCENARIO 3 – Full Intervention Package:\n")
@@ -537,13 +512,9 @@ with open(forecast_2030_insights_file, 'w') as f:
     f.write(f"   • 2030: {s3_proj_2030[6]:.1f}\n")
     f.write(
         f"   • Net Improvement: {s3_proj_2030[6] - baseline_igs:.1f} points from baseline\n")
-    f.write(
-        f"   • Threshold Status: {'CROSSES' if s3_proj_2030[6] >= 45 else 'BELOW'} distressed threshold (45)\n")
-    f.write(
-        "   • Interpretation: Comprehensive multi-pillar approach yields strongest,\n")
-    f.write(
-        "     most consistent improvement. Synergistic effects across Place, Economy,\n")
-    f.write("     and Community pillars create sustained upward trajectory.\n\n")
+    for line in describe_path(s3_proj_2030):
+        f.write(f"   • {line}\n")
+    f.write("\n")
 
     f.write("CRITICAL MILESTONES\n")
     f.write("-" * 80 + "\n\n")
@@ -569,11 +540,11 @@ with open(forecast_2030_insights_file, 'w') as f:
     f.write("Intervention Effectiveness Ranking (2030):\n")
     deltas_2030 = [
         (s3_proj_2030[6] - baseline_igs, "Full Package",
-         f"+{s3_proj_2030[6] - baseline_igs:.1f}"),
+         f"{s3_proj_2030[6] - baseline_igs:+.1f}"),
         (s1_proj_2030[6] - baseline_igs, "Broadband Expansion",
-         f"+{s1_proj_2030[6] - baseline_igs:.1f}"),
+         f"{s1_proj_2030[6] - baseline_igs:+.1f}"),
         (s2_proj_2030[6] - baseline_igs, "Entrepreneurship + Workforce",
-         f"+{s2_proj_2030[6] - baseline_igs:.1f}")
+         f"{s2_proj_2030[6] - baseline_igs:+.1f}")
     ]
     deltas_2030.sort(reverse=True)
     for i, (delta, name, label) in enumerate(deltas_2030, 1):
@@ -582,32 +553,31 @@ with open(forecast_2030_insights_file, 'w') as f:
     f.write("\nKEY FINDINGS\n")
     f.write("-" * 80 + "\n\n")
 
-    f.write("1. LONG-TERM COMMITMENT REQUIRED:\n")
-    f.write("   All intervention scenarios require sustained 6+ year implementation\n")
-    f.write("   to achieve meaningful impact. Short-term interventions insufficient\n")
-    f.write("   for deeply distressed communities.\n\n")
-
-    f.write("2. GRADUAL BUT CONSISTENT IMPROVEMENT:\n")
-    f.write("   Full Package shows most consistent growth trajectory, gaining ~2\n")
-    f.write("   points per year. Demonstrates importance of multi-pillar approach\n")
-    f.write("   rather than single-sector interventions.\n\n")
-
-    f.write("3. INFRASTRUCTURE AS FOUNDATION:\n")
-    f.write("   Broadband expansion remains critical enabler across all scenarios.\n")
-    f.write("   Digital connectivity unlocks access to remote work, education,\n")
-    f.write("   healthcare, and economic opportunities.\n\n")
-
-    f.write("4. ACCELERATING RETURNS:\n")
-    f.write(
-        "   Entrepreneurship scenario shows accelerating growth pattern (slower\n")
-    f.write("   initially, faster in years 4-6). Reflects time needed for business\n")
-    f.write("   establishment, workforce training, and market development.\n\n")
-
-    f.write("5. REALISTIC EXPECTATIONS:\n")
-    f.write(
-        f"   Even with full interventions, tract reaches {s3_proj_2030[6]:.1f} by 2030,\n")
-    f.write("   which is solidly above distressed threshold but still below improving\n")
-    f.write("   threshold (55). Complete recovery requires 10+ year horizon.\n\n")
+    gaps_2030 = {name: path[-1] - baseline_proj_2030[-1]
+                 for name, path in scenario_paths.items()}
+    best = max(gaps_2030, key=gaps_2030.get)
+    f.write("1. STRONGEST SCENARIO:\n")
+    f.write(f"   {best} ends 2030 at {scenario_paths[best][-1]:.1f}, "
+            f"{gaps_2030[best]:+.1f} points against the\n")
+    f.write(f"   2030 baseline ({baseline_proj_2030[-1]:.1f}).\n\n")
+
+    f.write("2. GAP TO BASELINE OVER TIME:\n")
+    for name, path in scenario_paths.items():
+        f.write(f"   • {name}: {path[1] - baseline_proj_2030[1]:+.1f} in 2025, "
+                f"{path[RAMP_END] - baseline_proj_2030[RAMP_END]:+.1f} in 2027, "
+                f"{gaps_2030[name]:+.1f} in 2030\n")
+    f.write("\n")
+
+    f.write("3. AFTER THE PHASE-IN (2027-2030):\n")
+    for name, path in {'Baseline': baseline_proj_2030, **scenario_paths}.items():
+        late = path[-1] - path[RAMP_END]
+        f.write(f"   • {name} {direction(late)} ({late:+.1f} points)\n")
+    f.write("\n")
+
+    f.write("4. THRESHOLDS:\n")
+    for name, path in scenario_paths.items():
+        f.write(f"   • {name}: {threshold_status(path[-1])}\n")
+    f.write("\n")
 
     f.write("POLICY IMPLICATIONS\n")
     f.write("-" * 80 + "\n\n")
@@ -0,0 +1,288 @@
+"""
+Scenario Language for Feature Interventions
+
+One declarative way to write an intervention, replacing the per-script
+variants (relative % in InterventionSimulator, absolute points plus trend
+bumps in predict_intervention_outcomes.py, clamped deltas with recomputed
+growth features in the dashboard's policy scenario). A scenario is a list of
+statements, applied in order:
+
+    broadband_access_pct += 20              # absolute change
+    broadband_access_pct += 10%             # relative change (x * 1.10)
+    housing_cost_burden_pct -= $housing     # parameter, bound at apply time
+    median_income *= 1.05                   # factor
+    early_education_enrollment_pct = 40     # set
+    housing_cost_burden_pct >= 0            # clamp from below
+    early_education_enrollment_pct <= 100   # clamp from above
+    housing_burden_change = diff(housing_cost_burden_pct)   # new - baseline
+    early_ed_growth = pct(early_education_enrollment_pct)   # % vs. baseline
+
+Statements are separated by newlines or ';' and '#' starts a comment.
+compile_scenario() resolves feature names to columns once; the resulting
+ScenarioProgram applies every statement as a NumPy operation on a whole
+(scenario x tract x feature) array. Parameters may be arrays with one value
+per scenario, so a sweep over slider settings and tracts is a single call:
+
+    program = compile_scenario(text, schema.features)
+    X = program.apply(baseline_matrix, {'housing': np.arange(0, 50, 5)})
+    X.shape  # -> (10 scenarios, n_tracts, n_features)
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+Value = Union[float, str]
+
+_STATEMENT = re.compile(r'^(?P<feature>\w+)\s*(?P<op>\+=|-=|\*=|>=|<=|=)\s*(?P<expr>.+?)$')
+_DERIVED = re.compile(r'^(?P<kind>diff|pct)\(\s*(?P<source>\w+)\s*\)$')
+_PARAM = re.compile(r'^\$(?P<name>[A-Za-z_]\w*)$')
+_CLAMP_KIND = {'>=': 'min', '<=': 'max'}
+
+
+@dataclass(frozen=True)
+class Statement:
+    """
+    One parsed scenario statement.
+
+    Attributes:
+    -----------
+    feature : str
+        Feature the statement writes
+    kind : str
+        'add', 'sub', 'rel' (x * (1 + value)), 'mul', 'set', 'min' (lower
+        bound), 'max' (upper bound), 'diff' or 'pct' (derived from `source`)
+    value : float or str
+        Constant, or '$name' for a parameter (unused by diff / pct)
+    percent : bool
+        The parameter value is in percent (divided by 100 when applied)
+    negate : bool
+        The parameter value is negated when applied ('-= $p%')
+    source : str, optional
+        Level feature a diff / pct statement is derived from
+    """
+    feature: str
+    kind: str
+    value: Value = 0.0
+    percent: bool = False
+    negate: bool = False
+    source: Optional[str] = None
+
+
+def _parse_value(expr: str, line_no: int) -> Value:
+    param = _PARAM.match(expr)
+    if param:
+        return f"${param.group('name')}"
+    try:
+        return float(expr)
+    except ValueError:
+        raise ValueError(f"line {line_no}: expected a number or $parameter, got '{expr}'") from None
+
+
+def parse_scenario(text: str) -> List[Statement]:
+    """
+    Parse scenario text into statements.
+
+    Raises:
+    -------
+    ValueError
+        On a malformed statement (the message gives the line number)
+    """
+    statements = []
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        for part in line.split('#', 1)[0].split(';'):
+            part = part.strip()
+            if not part:
+                continue
+            match = _STATEMENT.match(part)
+            if not match:
+                raise ValueError(f"line {line_no}: cannot parse '{part}'")
+            feature, op, expr = match.group('feature', 'op', 'expr')
+
+            derived = _DERIVED.match(expr)
+            if derived:
+                if op != '=':
+                    raise ValueError(f"line {line_no}: {derived.group('kind')}() needs '='")
+                statements.append(Statement(feature, derived.group('kind'),
+                                            source=derived.group('source')))
+                continue
+
+            percent = expr.endswith('%')
+            value = _parse_value(expr[:-1].rstrip() if percent else expr, line_no)
+            if percent and op not in ('+=', '-='):
+                raise ValueError(f"line {line_no}: '%' is only allowed with += and -=")
+            if percent and isinstance(value, str):
+                # Relative change by a parameter: /100 and sign apply later
+                statements.append(Statement(feature, 'rel', value, percent=True,
+                                            negate=op == '-='))
+            elif percent:
+                statements.append(Statement(feature, 'rel',
+                                            (-value if op == '-=' else value) / 100))
+            elif op in ('+=', '-='):
+                statements.append(Statement(feature, 'add' if op == '+=' else 'sub', value))
+            elif op == '*=':
+                statements.append(Statement(feature, 'mul', value))
+            elif op == '=':
+                statements.append(Statement(feature, 'set', value))
+            else:
+                statements.append(Statement(feature, _CLAMP_KIND[op], value))
+    return statements
+
+
+def relative_changes(deltas: Mapping[str, float]) -> List[Statement]:
+    """Statements for {feature: fractional change} (e.g. 0.20 means +20%)."""
+    return [Statement(feature, 'rel', float(change)) for feature, change in deltas.items()]
+
+
+@dataclass(frozen=True)
+class _Op:
+    kind: str
+    column: int
+    value: Value
+    percent: bool
+    negate: bool
+    source: int
+
+
+class ScenarioProgram:
+    """
+    A scenario compiled against one feature order.
+
+    Parameters:
+    -----------
+    features : sequence of str
+        Column order of the matrices the program is applied to
+    statements : list of Statement
+        Parsed statements (see parse_scenario / relative_changes)
+    """
+
+    def __init__(self, features: Sequence[str], statements: Sequence[Statement]):
+        self.features = tuple(features)
+        self.statements = tuple(statements)
+        columns = {feature: i for i, feature in enumerate(self.features)}
+
+        def column(name: str) -> int:
+            if name not in columns:
+                raise ValueError(f"Scenario uses unknown feature '{name}'")
+            return columns[name]
+
+        ops = []
+        for statement in self.statements:
+            derived = statement.kind in ('diff', 'pct')
+            ops.append(_Op(
+                kind=statement.kind,
+                column=column(statement.feature),
+                value=statement.value,
+                percent=statement.percent,
+                negate=statement.negate,
+                source=column(statement.source) if derived else -1,
+            ))
+        self._ops = tuple(ops)
+
+    @property
+    def params(self) -> Tuple[str, ...]:
+        """Parameter names the program needs, without the '$'."""
+        return tuple(sorted({op.value[1:] for op in self._ops if isinstance(op.value, str)}))
+
+    @property
+    def outputs(self) -> Tuple[str, ...]:
+        """Features the program writes, in first-written order."""
+        return tuple(dict.fromkeys(self.features[op.column] for op in self._ops))
+
+    def _bind(self, params: Optional[Mapping]) -> Tuple[Dict[str, np.ndarray], int]:
+        params = dict(params or {})
+        missing = set(self.params) - set(params)
+        if missing:
+            raise ValueError(f"Missing scenario parameters: {', '.join(sorted(missing))}")
+        values = {name: np.asarray(params[name], dtype=np.float64).reshape(-1)
+                  for name in self.params}
+        lengths = {len(v) for v in values.values()} - {1}
+        if len(lengths) > 1:
+            raise ValueError(f"Scenario parameters have different lengths: {sorted(lengths)}")
+        n_scenarios = lengths.pop() if lengths else 1
+        # (n_scenarios, 1) broadcasts against a (scenario, tract) column
+        return {name: v.reshape(-1, 1) for name, v in values.items()}, n_scenarios
+
+    def apply(self, X: np.ndarray, params: Optional[Mapping] = None) -> np.ndarray:
+        """
+        Apply the scenario to every tract for every parameter setting.
+
+        Parameters:
+        -----------
+        X : np.ndarray
+            Baseline features, shape (n_tracts, n_features) or (n_features,)
+        params : dict, optional
+            Parameter name -> scalar or array with one value per scenario
+
+        Returns:
+        --------
+        np.ndarray
+            Adjusted features of shape (n_scenarios, n_tracts, n_features)
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        if X.shape[1] != len(self.features):
+            raise ValueError(f"Expected {len(self.features)} feature columns, got {X.shape[1]}")
+        values, n_scenarios = self._bind(params)
+        out = np.repeat(X[np.newaxis], n_scenarios, axis=0)
+
+        for op in self._ops:
+            column = out[:, :, op.column]
+            value = values[op.value[1:]] if isinstance(op.value, str) else op.value
+            if op.percent:
+                value = value / 100
+            if op.negate:
+                value = -value
+
+            if op.kind == 'add':
+                column += value
+            elif op.kind == 'sub':
+                column -= value
+            elif op.kind == 'rel':
+                column *= 1 + value
+            elif op.kind == 'mul':
+                column *= value
+            elif op.kind == 'set':
+                column[...] = value
+            elif op.kind == 'min':
+                np.maximum(column, value, out=column)
+            elif op.kind == 'max':
+                np.minimum(column, value, out=column)
+            elif op.kind == 'diff':
+                column[...] = out[:, :, op.source] - X[:, op.source]
+            elif op.kind == 'pct':
+                base = X[:, op.source]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    change = (out[:, :, op.source] - base) / base * 100
+                column[...] = np.where(base > 0, change, 0.0)
+        return out
+
+    def apply_row(self, row: Mapping[str, float], params: Optional[Mapping] = None) -> Dict:
+        """
+        Apply the scenario to one row given as a dict (one parameter setting).
+
+        Returns a copy of `row` with only the written features replaced.
+        """
+        x = np.array([row[feature] for feature in self.features], dtype=np.float64)
+        adjusted = self.apply(x, params)
+        if adjusted.shape[0] != 1:
+            raise ValueError("apply_row takes one value per parameter")
+        result = dict(row)
+        for feature in self.outputs:
+            result[feature] = float(adjusted[0, 0, self.features.index(feature)])
+        return result
+
+
+def compile_scenario(scenario: Union[str, Sequence[Statement]],
+                     features: Sequence[str]) -> ScenarioProgram:
+    """
+    Compile scenario text (or parsed statements) for a feature order.
+
+    Raises:
+    -------
+    ValueError
+        If the text does not parse or names a feature not in `features`
+    """
+    statements = parse_scenario(scenario) if isinstance(scenario, str) else list(scenario)
+    return ScenarioProgram(features, statements)
@@ -0,0 +1,391 @@
+"""
+Scenario Result Store
+
+Persists every intervention scenario run - inputs, model version, outputs
+and Monte Carlo intervals - in a SQLite database, so dashboards and reports
+can query historical and precomputed scenarios instead of re-running the
+models.
+
+Tables:
+- runs          one row per run: tract GEOID, year, scenario name, canonical
+                parameter key, model version, uncertainty settings
+- run_params    one row per (run, feature delta)
+- run_results   one row per (run, target): baseline, outcome, delta and
+                interval bounds when the run had uncertainty
+
+Indexes cover (tract, year), (parameter key, model version), model version
+and (feature, delta), so lookups by tract, by scenario parameters or by
+model version do not scan the table. Runs are written in batches with
+executemany inside one transaction; a sweep of thousands of scenarios is a
+handful of statements.
+
+Usage:
+    python src/analysis/scenario_store.py --tract 05085020100
+    python src/analysis/scenario_store.py --feature broadband_access_pct --current
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from data_processing.tract_index import normalize_geoid  # noqa: E402
+from modeling.model_artifacts import models_version  # noqa: E402
+from analysis.uncertainty import UncertaintyConfig  # noqa: E402
+
+# Paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+STORE_PATH = BASE_DIR / 'output' / 'scenarios.sqlite'
+MODELS_DIR = BASE_DIR / 'output' / 'models'
+
+# Parameter deltas are keyed at this precision (0.1 and 0.1000000001 match)
+PARAM_DECIMALS = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    source TEXT,
+    scenario TEXT,
+    tract TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    params_key TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    uncertainty TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_tract_year ON runs (tract, year);
+CREATE INDEX IF NOT EXISTS idx_runs_params ON runs (params_key, model_version);
+CREATE INDEX IF NOT EXISTS idx_runs_model ON runs (model_version);
+
+CREATE TABLE IF NOT EXISTS run_params (
+    run_id INTEGER NOT NULL,
+    feature TEXT NOT NULL,
+    delta REAL NOT NULL,
+    PRIMARY KEY (run_id, feature)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_params_feature ON run_params (feature, delta);
+
+CREATE TABLE IF NOT EXISTS run_results (
+    run_id INTEGER NOT NULL,
+    target TEXT NOT NULL,
+    baseline REAL,
+    outcome REAL,
+    delta REAL,
+    outcome_lower REAL,
+    outcome_upper REAL,
+    delta_lower REAL,
+    delta_upper REAL,
+    prob_increase REAL,
+    PRIMARY KEY (run_id, target)
+) WITHOUT ROWID;
+"""
+
+
+def params_key(params: Dict[str, float]) -> str:
+    """Canonical JSON of a scenario's feature deltas (sorted, rounded)."""
+    return json.dumps({feature: round(float(delta), PARAM_DECIMALS)
+                       for feature, delta in params.items()},
+                      sort_keys=True, separators=(',', ':'))
+
+
+def _geoids(tracts) -> List[str]:
+    geoids = normalize_geoid(tracts).tolist()
+    if None in geoids:
+        raise ValueError(f"Invalid tract ID: {tracts[geoids.index(None)]!r}")
+    return geoids
+
+
+def _geoid(tract) -> str:
+    return _geoids([tract])[0]
+
+
+@dataclass
+class ScenarioRun:
+    """
+    One scenario evaluated for one tract-year.
+
+    Attributes:
+    -----------
+    tract : str
+        Census tract ID (normalized to the 11-character GEOID when stored)
+    year : int
+        Baseline year
+    params : dict
+        Feature -> delta applied by the scenario
+    model_version : str
+        models_version() of the models that produced the outcome
+    baseline, outcome : dict
+        Target -> predicted score before and after the intervention
+    intervals : dict, optional
+        MonteCarloEngine.simulate output for the run
+    uncertainty : UncertaintyConfig, optional
+        Monte Carlo settings behind `intervals`
+    scenario : str, optional
+        Human-readable scenario name
+    source : str
+        Script or component that produced the run
+    """
+
+    tract: str
+    year: int
+    params: Dict[str, float]
+    model_version: str
+    baseline: Dict[str, float]
+    outcome: Dict[str, float]
+    intervals: Optional[Dict[str, Dict]] = None
+    uncertainty: Optional[UncertaintyConfig] = None
+    scenario: Optional[str] = None
+    source: str = ''
+
+    @classmethod
+    def from_results(cls, results: Dict, model_version: str,
+                     uncertainty: Optional[UncertaintyConfig] = None,
+                     scenario: Optional[str] = None,
+                     source: str = 'simulate_intervention') -> 'ScenarioRun':
+        """Build a run from an InterventionSimulator.simulate_intervention result."""
+        return cls(tract=results['tract'], year=results['year'],
+                   params=results['interventions'], model_version=model_version,
+                   baseline=results['baseline'], outcome=results['after_intervention'],
+                   intervals=results.get('intervals'), uncertainty=uncertainty,
+                   scenario=scenario, source=source)
+
+    def result_rows(self, run_id: int) -> List[tuple]:
+        rows = []
+        for target, outcome in self.outcome.items():
+            summary = (self.intervals or {}).get(target)
+            bounds = ((summary['intervention']['lower'], summary['intervention']['upper'],
+                       summary['delta']['lower'], summary['delta']['upper'],
+                       summary['prob_increase']) if summary else (None,) * 5)
+            baseline = self.baseline[target]
+            rows.append((run_id, target, float(baseline), float(outcome),
+                         float(outcome - baseline)) + bounds)
+        return rows
+
+
+def _uncertainty_key(config: Optional[UncertaintyConfig]) -> Optional[str]:
+    return json.dumps(asdict(config), sort_keys=True) if config is not None else None
+
+
+class ScenarioStore:
+    """
+    Append-only store of scenario runs.
+
+    Parameters:
+    -----------
+    store_path : str or Path
+        SQLite file (created with the schema on first use)
+    """
+
+    def __init__(self, store_path=STORE_PATH):
+        self.path = Path(store_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; _insert manages its own transactions
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        # WAL lets the dashboard/report readers run while a sweep is writing
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, runs: Iterable[ScenarioRun], batch_size: int = 1000) -> List[int]:
+        """
+        Insert runs in batches, each batch in one transaction.
+
+        Parameters:
+        -----------
+        runs : iterable of ScenarioRun
+            Runs to store (a generator is consumed batch by batch)
+        batch_size : int
+            Runs per transaction
+
+        Returns:
+        --------
+        list of int
+            run_id of each stored run, in input order
+        """
+        run_ids = []
+        batch = []
+        for run in runs:
+            batch.append(run)
+            if len(batch) >= batch_size:
+                run_ids += self._insert(batch)
+                batch = []
+        if batch:
+            run_ids += self._insert(batch)
+        return run_ids
+
+    def _insert(self, batch: List[ScenarioRun]) -> List[int]:
+        created_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        # BEGIN IMMEDIATE takes the write lock, so ids assigned from MAX(run_id)
+        # cannot collide with a concurrent writer
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            first = self.conn.execute("SELECT COALESCE(MAX(run_id), 0) + 1 FROM runs").fetchone()[0]
+            run_ids = list(range(first, first + len(batch)))
+            geoids = _geoids([run.tract for run in batch])
+            self.conn.executemany(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, created_at, run.source, run.scenario, geoid,
+                  int(run.year), params_key(run.params), run.model_version,
+                  _uncertainty_key(run.uncertainty))
+                 for run_id, run, geoid in zip(run_ids, batch, geoids)])
+            self.conn.executemany(
+                "INSERT INTO run_params VALUES (?, ?, ?)",
+                [(run_id, feature, float(delta))
+                 for run_id, run in zip(run_ids, batch) for feature, delta in run.params.items()])
+            self.conn.executemany(
+                "INSERT INTO run_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [row for run_id, run in zip(run_ids, batch) for row in run.result_rows(run_id)])
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return run_ids
+
+    def query(self, tract=None, year: Optional[int] = None, scenario: Optional[str] = None,
+              params: Optional[Dict[str, float]] = None, feature: Optional[str] = None,
+              model_version: Optional[str] = None, latest: bool = False) -> pd.DataFrame:
+        """
+        Stored results matching every given filter, one row per (run, target).
+
+        Parameters:
+        -----------
+        tract : str or int, optional
+            Census tract ID (any format normalize_geoid accepts)
+        year : int, optional
+            Baseline year
+        scenario : str, optional
+            Scenario name
+        params : dict, optional
+            Exact feature deltas of the scenario
+        feature : str, optional
+            Runs that changed this feature (any delta)
+        model_version : str, optional
+            Only runs produced by this model version
+        latest : bool
+            Keep only the most recent run per tract, year, params, model
+            version and uncertainty settings
+
+        Returns:
+        --------
+        pd.DataFrame
+            Run columns (params as JSON) joined with per-target results
+        """
+        clauses, values = [], []
+        if tract is not None:
+            clauses.append("r.tract = ?")
+            values.append(_geoid(tract))
+        if year is not None:
+            clauses.append("r.year = ?")
+            values.append(int(year))
+        if scenario is not None:
+            clauses.append("r.scenario = ?")
+            values.append(scenario)
+        if params is not None:
+            clauses.append("r.params_key = ?")
+            values.append(params_key(params))
+        if feature is not None:
+            clauses.append("r.run_id IN (SELECT run_id FROM run_params WHERE feature = ?)")
+            values.append(feature)
+        if model_version is not None:
+            clauses.append("r.model_version = ?")
+            values.append(model_version)
+        if latest:
+            clauses.append("""r.run_id = (SELECT MAX(run_id) FROM runs l
+                               WHERE l.tract = r.tract AND l.year = r.year
+                               AND l.params_key = r.params_key
+                               AND l.model_version = r.model_version
+                               AND l.uncertainty IS r.uncertainty)""")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        sql = f"""
+            SELECT r.run_id, r.created_at, r.source, r.scenario, r.tract, r.year,
+                   r.params_key AS params, r.model_version, r.uncertainty, s.*
+            FROM runs r JOIN run_results s USING (run_id)
+            {where}
+            ORDER BY r.run_id, s.target"""
+        df = pd.read_sql_query(sql, self.conn, params=values)
+        # USING (run_id) plus s.* repeats the key column
+        return df.loc[:, ~df.columns.duplicated()]
+
+    def lookup(self, tract, year: int, params: Dict[str, float], model_version: str,
+               uncertainty: Optional[UncertaintyConfig] = None) -> Optional[Dict]:
+        """
+        Most recent stored run for exactly these inputs, or None.
+
+        Returns:
+        --------
+        dict or None
+            run_id, baseline, after_intervention and impact by target, plus
+            delta intervals when the run had the same uncertainty settings
+        """
+        uncertainty_key = _uncertainty_key(uncertainty)
+        row = self.conn.execute(
+            """SELECT run_id FROM runs
+               WHERE tract = ? AND year = ? AND params_key = ? AND model_version = ?
+               AND uncertainty IS ?
+               ORDER BY run_id DESC LIMIT 1""",
+            (_geoid(tract), int(year), params_key(params), model_version,
+             uncertainty_key)).fetchone()
+        if row is None:
+            return None
+
+        results = pd.read_sql_query("SELECT * FROM run_results WHERE run_id = ?",
+                                    self.conn, params=[row[0]]).set_index('target')
+        found = {
+            'run_id': row[0],
+            'baseline': results['baseline'].to_dict(),
+            'after_intervention': results['outcome'].to_dict(),
+            'impact': results['delta'].to_dict(),
+        }
+        if uncertainty is not None:
+            found['delta_intervals'] = results[
+                ['delta_lower', 'delta_upper', 'prob_increase']].to_dict('index')
+        return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query stored scenario runs')
+    parser.add_argument('--store', type=Path, default=STORE_PATH, help='Scenario store file')
+    parser.add_argument('--tract', help='Census tract ID')
+    parser.add_argument('--year', type=int, help='Baseline year')
+    parser.add_argument('--scenario', help='Scenario name')
+    parser.add_argument('--feature', help='Only runs that changed this feature')
+    parser.add_argument('--current', action='store_true',
+                        help='Only runs of the models currently in output/models')
+    parser.add_argument('--target', default='igs_score', help='Target to show')
+    args = parser.parse_args()
+
+    if not args.store.exists():
+        print(f"No scenario store at {args.store}")
+        return
+
+    with ScenarioStore(args.store) as store:
+        runs = store.query(tract=args.tract, year=args.year, scenario=args.scenario,
+                           feature=args.feature, latest=True,
+                           model_version=models_version(MODELS_DIR) if args.current else None)
+    runs = runs[runs['target'] == args.target]
+    print(f"{len(runs)} stored runs ({args.target})\n")
+    if len(runs):
+        print(runs[['run_id', 'tract', 'year', 'scenario', 'params', 'model_version',
+                    'baseline', 'outcome', 'delta', 'delta_lower', 'delta_upper']]
+              .to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Global Sensitivity Analysis for the Pillar Models
+
+Complements the forest's impurity importances with model-agnostic global
+sensitivity measures over the actionable features:
+1. Morris screening - mean absolute elementary effect (mu*) and its spread
+   (sigma) from one-at-a-time trajectories across the input space
+2. Sobol indices - first-order (S1) and total-effect (ST) variance shares
+   from a Saltelli design (Saltelli 2010 / Jansen estimators)
+
+Each feature varies within bounds taken from the observed data; the remaining
+inputs (e.g. lagged scores of the augmented models) are held at their median.
+All design points are built up front and scored in large batches, split
+across a process pool when n_jobs > 1.
+
+Results are cached next to the models as {target}_sensitivity.json, keyed by
+the model hash, plus a {target}_sensitivity.csv (feature, importance) that the
+dashboard's importance endpoint can read without running the analysis.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import BASE_FEATURES, TARGETS, scale_features  # noqa: E402
+from modeling.model_artifacts import artifact_paths, load_pillar_models, model_hash  # noqa: E402
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+# Worker-side model state, loaded once per process by _init_worker
+_WORKER: Dict = {}
+
+
+def _init_worker(model_path: str, scaler_path: str):
+    model = joblib.load(model_path)
+    if hasattr(model, 'n_jobs'):
+        # Parallelism comes from the pool; avoid oversubscribing cores
+        model.n_jobs = 1
+    _WORKER['model'] = model
+    _WORKER['scaler'] = joblib.load(scaler_path)
+
+
+def _predict_chunk(X: np.ndarray) -> np.ndarray:
+    return _WORKER['model'].predict(scale_features(_WORKER['scaler'], X))
+
+
+def observed_bounds(df: pd.DataFrame, features: Sequence[str],
+                    quantiles: Tuple[float, float] = (0.05, 0.95)
+                    ) -> Dict[str, Tuple[float, float]]:
+    """
+    Feature ranges from the observed data.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Observed tract-year data
+    features : list of str
+        Features to bound
+    quantiles : tuple of float
+        Lower/upper quantiles (trims outliers; use (0, 1) for min/max)
+
+    Returns:
+    --------
+    dict
+        Feature -> (lower, upper)
+    """
+    bounds = {}
+    for feature in features:
+        lower, upper = df[feature].quantile(list(quantiles))
+        if not upper > lower:
+            raise ValueError(f"Feature '{feature}' has no spread in the observed data")
+        bounds[feature] = (float(lower), float(upper))
+    return bounds
+
+
+class SensitivityAnalyzer:
+    """Morris and Sobol analysis of one trained target model."""
+
+    def __init__(self, models_dir, target: str, data: pd.DataFrame,
+                 features: Optional[Sequence[str]] = None,
+                 quantiles: Tuple[float, float] = (0.05, 0.95),
+                 n_jobs: int = 1, chunk_size: int = 20000):
+        """
+        Parameters:
+        -----------
+        models_dir : str or Path
+            Directory with the saved model/scaler/schema
+        target : str
+            Target to analyze (e.g. 'igs_score')
+        data : pd.DataFrame
+            Observed data used for feature bounds and fixed-input medians
+        features : list of str
+            Features to vary (defaults to the schema's base indicators)
+        quantiles : tuple of float
+            Quantiles used as feature bounds
+        n_jobs : int
+            Worker processes for model evaluation (1 = in-process)
+        chunk_size : int
+            Rows per prediction batch
+        """
+        self.models_dir = Path(models_dir)
+        self.target = target
+        models, scalers, schemas = load_pillar_models(models_dir, [target])
+        self.model, self.scaler = models[target], scalers[target]
+        self.schema = schemas[target]
+        self.model_hash = model_hash(models_dir, target)
+
+        if features is None:
+            features = [f for f in self.schema.features if f in BASE_FEATURES]
+        missing = set(features) - set(self.schema.features)
+        if missing:
+            raise ValueError(f"Features not used by the {target} model: {sorted(missing)}")
+        self.features = list(features)
+        self.quantiles = tuple(quantiles)
+        self.bounds = observed_bounds(data, self.features, self.quantiles)
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+
+        # Inputs that are not varied stay at their observed median
+        medians = {f: float(data[f].median()) if f in data else
+                   self.schema.fill_values.get(f, np.nan) for f in self.schema.features}
+        self._base_row = self.schema.to_array(medians)[0]
+        self._cols = np.array([self.schema.index(f) for f in self.features])
+        self._lower = np.array([self.bounds[f][0] for f in self.features])
+        self._span = np.array([self.bounds[f][1] - self.bounds[f][0] for f in self.features])
+
+    @property
+    def n_factors(self) -> int:
+        return len(self.features)
+
+    def evaluate(self, U: np.ndarray) -> np.ndarray:
+        """
+        Score design points given in the unit hypercube.
+
+        Parameters:
+        -----------
+        U : np.ndarray
+            Points of shape (n_points, n_factors) with values in [0, 1]
+
+        Returns:
+        --------
+        np.ndarray
+            Model predictions of shape (n_points,)
+        """
+        X = np.tile(self._base_row, (U.shape[0], 1))
+        X[:, self._cols] = self._lower + U * self._span
+        chunks = [X[i:i + self.chunk_size] for i in range(0, len(X), self.chunk_size)]
+
+        if self.n_jobs == 1 or len(chunks) == 1:
+            return np.concatenate([self.model.predict(scale_features(self.scaler, c))
+                                   for c in chunks])
+
+        paths = artifact_paths(self.models_dir, self.target)
+        with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                 initargs=(str(paths['model']), str(paths['scaler']))) as pool:
+            return np.concatenate(list(pool.map(_predict_chunk, chunks)))
+
+    def morris(self, n_trajectories: int = 100, n_levels: int = 4,
+               seed: Optional[int] = 42) -> pd.DataFrame:
+        """
+        Morris elementary-effects screening.
+
+        Parameters:
+        -----------
+        n_trajectories : int
+            Number of one-at-a-time trajectories (r)
+        n_levels : int
+            Grid levels per factor (p, even)
+        seed : int
+            Random seed
+
+        Returns:
+        --------
+        pd.DataFrame
+            feature, mu, mu_star, sigma (score points per full feature range)
+        """
+        rng = np.random.default_rng(seed)
+        r, k = n_trajectories, self.n_factors
+        delta = n_levels / (2 * (n_levels - 1))
+
+        # Start points on the grid, low enough that +delta stays in [0, 1]
+        start_levels = np.arange(n_levels) / (n_levels - 1)
+        start_levels = start_levels[start_levels + delta <= 1 + 1e-12]
+        x0 = rng.choice(start_levels, size=(r, k))
+
+        # Step one factor at a time in a random order per trajectory
+        order = np.argsort(rng.random((r, k)), axis=1)
+        steps = np.zeros((r, k + 1, k))
+        steps[np.arange(r)[:, None], np.arange(1, k + 1)[None, :], order] = delta
+        points = x0[:, None, :] + np.cumsum(steps, axis=1)
+
+        y = self.evaluate(points.reshape(-1, k)).reshape(r, k + 1)
+        effects = np.empty((r, k))
+        effects[np.arange(r)[:, None], order] = np.diff(y, axis=1) / delta
+
+        return pd.DataFrame({
+            'feature': self.features,
+            'mu': effects.mean(axis=0),
+            'mu_star': np.abs(effects).mean(axis=0),
+            'sigma': effects.std(axis=0, ddof=1),
+        }).sort_values('mu_star', ascending=False, ignore_index=True)
+
+    def sobol(self, n_base: int = 1024, n_bootstrap: int = 100,
+              seed: Optional[int] = 42) -> pd.DataFrame:
+        """
+        First-order and total Sobol indices from a Saltelli design.
+
+        Parameters:
+        -----------
+        n_base : int
+            Base sample size N (power of two); the design has N * (k + 2) rows
+        n_bootstrap : int
+            Bootstrap resamples for the confidence half-widths
+        seed : int
+            Random seed for the scrambled Sobol sequence
+
+        Returns:
+        --------
+        pd.DataFrame
+            feature, S1, S1_conf, ST, ST_conf
+        """
+        k = self.n_factors
+        base = qmc.Sobol(d=2 * k, scramble=True, seed=seed).random(n_base)
+        A, B = base[:, :k], base[:, k:]
+
+        # A, B, then AB_i (A with column i taken from B) for every factor
+        AB = np.repeat(A[None, :, :], k, axis=0)
+        AB[np.arange(k), :, np.arange(k)] = B.T
+        y = self.evaluate(np.vstack([A, B, AB.reshape(-1, k)]))
+        fA, fB, fAB = y[:n_base], y[n_base:2 * n_base], y[2 * n_base:].reshape(k, n_base)
+
+        def indices(idx):
+            var = np.var(np.concatenate([fA[idx], fB[idx]]))
+            if var == 0:
+                return np.zeros(k), np.zeros(k)
+            s1 = np.mean(fB[idx] * (fAB[:, idx] - fA[idx]), axis=1) / var
+            st = 0.5 * np.mean((fA[idx] - fAB[:, idx]) ** 2, axis=1) / var
+            return s1, st
+
+        s1, st = indices(np.arange(n_base))
+        rng = np.random.default_rng(seed)
+        boot = [indices(rng.integers(0, n_base, n_base)) for _ in range(n_bootstrap)]
+        z = 1.96
+        s1_conf = z * np.std([b[0] for b in boot], axis=0, ddof=1) if boot else np.zeros(k)
+        st_conf = z * np.std([b[1] for b in boot], axis=0, ddof=1) if boot else np.zeros(k)
+
+        return pd.DataFrame({
+            'feature': self.features,
+            'S1': s1, 'S1_conf': s1_conf,
+            'ST': st, 'ST_conf': st_conf,
+        }).sort_values('ST', ascending=False, ignore_index=True)
+
+    def cache_path(self) -> Path:
+        return self.models_dir / f'{self.target}_sensitivity.json'
+
+    def run(self, n_trajectories: int = 100, n_base: int = 1024,
+            seed: Optional[int] = 42, force: bool = False) -> Dict:
+        """
+        Morris and Sobol results, reusing the cache when the model is unchanged.
+
+        Returns:
+        --------
+        dict
+            model_hash, params, bounds, 'morris' and 'sobol' records
+        """
+        params = {
+            'features': self.features, 'quantiles': list(self.quantiles),
+            'n_trajectories': n_trajectories, 'n_base': n_base, 'seed': seed,
+        }
+        path = self.cache_path()
+        if not force and path.exists():
+            with open(path) as f:
+                cached = json.load(f)
+            if cached.get('model_hash') == self.model_hash and cached.get('params') == params:
+                return cached
+
+        morris = self.morris(n_trajectories=n_trajectories, seed=seed)
+        sobol = self.sobol(n_base=n_base, seed=seed)
+        result = {
+            'target': self.target,
+            'model_hash': self.model_hash,
+            'params': params,
+            'bounds': {f: list(b) for f, b in self.bounds.items()},
+            'morris': morris.to_dict(orient='records'),
+            'sobol': sobol.to_dict(orient='records'),
+        }
+        with open(path, 'w') as f:
+            json.dump(result, f, indent=2)
+
+        # Same layout as {target}_feature_importance.csv for the dashboard
+        sobol[['feature', 'ST']].rename(columns={'ST': 'importance'}).to_csv(
+            self.models_dir / f'{self.target}_sensitivity.csv', index=False)
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sobol/Morris sensitivity of the pillar models')
+    parser.add_argument('--models-dir', default=str(BASE_DIR / 'output' / 'models'))
+    parser.add_argument('--data', default=str(BASE_DIR / 'data' / 'igs_trends_features.csv'))
+    parser.add_argument('--targets', nargs='+', default=list(TARGETS))
+    parser.add_argument('--n-base', type=int, default=1024)
+    parser.add_argument('--trajectories', type=int, default=100)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--force', action='store_true')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("GLOBAL SENSITIVITY ANALYSIS (MORRIS + SOBOL)")
+    print("=" * 70)
+
+    df = pd.read_csv(args.data)
+    for target in args.targets:
+        analyzer = SensitivityAnalyzer(args.models_dir, target, df, n_jobs=args.jobs)
+        result = analyzer.run(n_trajectories=args.trajectories, n_base=args.n_base,
+                              force=args.force)
+        print(f"\n{target} (model {result['model_hash']})")
+        print(f"  {'Feature':<32} {'mu*':>8} {'S1':>7} {'ST':>7}")
+        morris = {row['feature']: row for row in result['morris']}
+        for row in result['sobol']:
+            print(f"  {row['feature']:<32} {morris[row['feature']]['mu_star']:>8.2f} "
+                  f"{row['S1']:>7.3f} {row['ST']:>7.3f}")
+        print(f"  ✓ Saved {analyzer.cache_path().name}")
+
+
+if __name__ == '__main__':
+    main()
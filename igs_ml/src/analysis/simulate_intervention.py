@@ -11,17 +11,29 @@ This tool simulates the impact of policy interventions on IGS scores by:
 Use this to test "what-if" scenarios for policy decisions.
 """
 
+import sys
 import pandas as pd
 import numpy as np
-import joblib
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import BASE_FEATURES, TARGETS, scale_features  # noqa: E402
+from data_processing.tract_index import TractYearIndex  # noqa: E402
+from modeling.model_watcher import ModelBundle, ModelWatcher, load_bundle  # noqa: E402
+from modeling.tree_attribution import TreeAttributor, explain_change  # noqa: E402
+from modeling.incremental_forest import IncrementalForest  # noqa: E402
+from modeling.fast_models import fold_model  # noqa: E402
+from analysis.uncertainty import MonteCarloEngine, UncertaintyConfig  # noqa: E402
+from analysis.scenario_store import ScenarioRun, ScenarioStore  # noqa: E402
+from analysis.scenario_dsl import compile_scenario, relative_changes  # noqa: E402
 
 
 class InterventionSimulator:
     """Simulates policy interventions and their impact on IGS scores."""
 
-    def __init__(self, models_dir='models', data_path='data_cleaned/igs_trends_features.csv'):
+    def __init__(self, models_dir='models', data_path='data_cleaned/igs_trends_features.csv',
+                 scenario_store: Optional[ScenarioStore] = None):
         """
         Initialize the simulator with models and data.
 
@@ -31,47 +43,88 @@ class InterventionSimulator:
             Directory containing trained models and scalers
         data_path : str
             Path to cleaned dataset
+        scenario_store : ScenarioStore, optional
+            If given, every scenario run is recorded there, and repeated
+            point-estimate runs are answered from it
         """
         self.models_dir = Path(models_dir)
         self.data_path = data_path
-        self.targets = ['place_score', 'economy_score',
-                        'community_score', 'igs_score']
-        self.models = {}
-        self.scalers = {}
+        self.scenario_store = scenario_store
+        self.targets = list(TARGETS)
+        self.bundle: Optional[ModelBundle] = None
+        self.watcher: Optional[ModelWatcher] = None
         self.data = None
+        self.index = None
 
         # Feature names
-        self.features = [
-            'median_income',
-            'broadband_access_pct',
-            'minority_owned_businesses_pct',
-            'housing_cost_burden_pct',
-            'early_education_enrollment_pct',
-            'income_growth',
-            'broadband_growth',
-            'minority_business_growth',
-            'housing_burden_change',
-            'early_ed_growth'
-        ]
+        self.features = list(BASE_FEATURES)
 
         self._load_models()
         self._load_data()
 
     def _load_models(self):
-        """Load all trained models and scalers."""
+        """Load all trained models, scalers, and feature schemas."""
         print("Loading models and scalers...")
+        self.bundle = load_bundle(self.models_dir, self.targets)
         for target in self.targets:
-            model_file = self.models_dir / f'{target}_model.joblib'
-            scaler_file = self.models_dir / f'{target}_scaler.joblib'
-
-            self.models[target] = joblib.load(model_file)
-            self.scalers[target] = joblib.load(scaler_file)
             print(f"  ✓ Loaded {target} model and scaler")
 
+    # Models, scalers, and schemas of the current bundle. Methods that use
+    # several of them take one bundle reference up front, so a hot reload
+    # (watch_models) never mixes two model versions within a call.
+    @property
+    def models(self) -> Dict:
+        return self.bundle.models
+
+    @property
+    def scalers(self) -> Dict:
+        return self.bundle.scalers
+
+    @property
+    def schemas(self) -> Dict:
+        return self.bundle.schemas
+
+    def watch_models(self, interval: float = 5.0, canary_rows: int = 64) -> ModelWatcher:
+        """
+        Hot-reload retrained models in the background.
+
+        New artifacts in models_dir are loaded in a watcher thread, checked
+        on a sample of the dataset's rows, and swapped in once the caches
+        already in use (Monte Carlo forests, TreeSHAP tables) are rebuilt
+        for them.
+
+        Parameters:
+        -----------
+        interval : float
+            Seconds between checks of the models directory
+        canary_rows : int
+            Dataset rows every new model version must predict sensibly
+        """
+        if self.watcher is None:
+            canary = self.data.sample(min(canary_rows, len(self.data)), random_state=0)
+            self.watcher = ModelWatcher(self.models_dir, self.targets, canary=canary,
+                                        bundle=self.bundle, interval=interval,
+                                        prepare=self._prepare_bundle,
+                                        on_swap=self._install_bundle).start()
+        return self.watcher
+
+    def _prepare_bundle(self, bundle: ModelBundle, previous: ModelBundle):
+        # Rebuild only what the running simulator has used, before the swap
+        if 'mc_engine' in previous.cache:
+            self._mc_engine_for(bundle)
+        if 'attributors' in previous.cache:
+            self._attributors_for(bundle)
+        if 'incremental' in previous.cache:
+            self._incremental_for(bundle)
+
+    def _install_bundle(self, bundle: ModelBundle, previous: ModelBundle):
+        self.bundle = bundle
+
     def _load_data(self):
-        """Load the cleaned dataset."""
+        """Load the cleaned dataset and index it by (tract, year)."""
         print(f"\nLoading data from {self.data_path}...")
         self.data = pd.read_csv(self.data_path)
+        self.index = TractYearIndex(self.data['tract'], self.data['year'])
         print(f"  ✓ Loaded {len(self.data)} rows")
         print(
             f"  ✓ Years: {self.data['year'].min()} - {self.data['year'].max()}")
@@ -93,30 +146,39 @@ class InterventionSimulator:
         pd.DataFrame or None
             Feature row if found, None otherwise
         """
-        # Try to match tract as-is, or as integer, or zero-padded
-        tract_variations = [
-            str(tract),
-            str(tract).zfill(11),
-            int(str(tract).replace('-', '')
-                ) if str(tract).replace('-', '').isdigit() else None
-        ]
-
-        baseline = None
-        for tract_variant in tract_variations:
-            if tract_variant is None:
-                continue
-            mask = (self.data['tract'].astype(str) == str(
-                tract_variant)) & (self.data['year'] == year)
-            baseline = self.data[mask]
-            if len(baseline) > 0:
-                break
-
-        if baseline is None or len(baseline) == 0:
+        row = self.index.lookup(tract, year)
+        if row is None:
             print(f"⚠ Warning: No data found for tract {tract} in year {year}")
-            print(f"  Available tracts: {sorted(self.data['tract'].unique())}")
+            print(f"  Available tracts ({len(self.index.tracts)}): "
+                  f"{', '.join(self.index.tracts[:10])}{' ...' if len(self.index.tracts) > 10 else ''}")
             return None
 
-        return baseline[self.features].copy()
+        return self.data.iloc[[row]][self.features].copy()
+
+    def get_baseline_features_batch(self, tracts, years) -> pd.DataFrame:
+        """
+        Extract baseline features for many tract-years in one vectorized lookup.
+
+        Parameters:
+        -----------
+        tracts : array-like
+            Census tract IDs (with or without leading zeros)
+        years : int or array-like
+            Year per tract, or one year for all
+
+        Returns:
+        --------
+        pd.DataFrame
+            GEOID, year and feature columns for the tract-years found, in
+            request order (missing tract-years are dropped)
+        """
+        rows = self.index.lookup_many(tracts, years)
+        found = rows[rows >= 0]
+        if len(found) < len(rows):
+            print(f"⚠ Warning: {len(rows) - len(found)} of {len(rows)} tract-years not found")
+        baseline = self.data.iloc[found][['year'] + self.features].reset_index(drop=True)
+        baseline.insert(0, 'tract', self.index.geoids.iloc[found].to_numpy())
+        return baseline
 
     def apply_intervention(self, baseline_features: pd.DataFrame,
                            deltas: Dict[str, float]) -> pd.DataFrame:
@@ -138,52 +200,178 @@ class InterventionSimulator:
         """
         adjusted = baseline_features.copy()
 
+        changes = {}
         for feature, pct_change in deltas.items():
             if feature not in self.features:
                 print(
                     f"⚠ Warning: '{feature}' is not a valid feature. Skipping.")
                 continue
-
             if feature in adjusted.columns:
-                original_value = adjusted[feature].iloc[0]
-                new_value = original_value * (1 + pct_change)
-                adjusted[feature] = new_value
-
-                print(f"  {feature}:")
-                print(f"    Original: {original_value:.2f}")
-                print(f"    Adjustment: {pct_change:+.1%}")
-                print(f"    New value: {new_value:.2f}")
+                changes[feature] = pct_change
+        if not changes:
+            return adjusted
+
+        # Every row at once: x * (1 + pct) per changed column
+        columns = list(changes)
+        program = compile_scenario(relative_changes(changes), columns)
+        original = adjusted[columns].to_numpy(dtype=np.float64)
+        adjusted[columns] = program.apply(original)[0]
+
+        for i, feature in enumerate(columns):
+            print(f"  {feature}:")
+            print(f"    Original: {original[0, i]:.2f}")
+            print(f"    Adjustment: {changes[feature]:+.1%}")
+            print(f"    New value: {adjusted[feature].iloc[0]:.2f}")
 
         return adjusted
 
-    def predict_scores(self, features: pd.DataFrame) -> Dict[str, float]:
+    def predict_scores(self, features, bundle: Optional[ModelBundle] = None) -> Dict[str, float]:
         """
         Predict all four scores for given features.
 
         Parameters:
         -----------
-        features : pd.DataFrame
-            Feature values
+        features : pd.DataFrame, dict, or np.ndarray
+            Feature values (arrays must be in schema column order)
+        bundle : ModelBundle, optional
+            Model version to use (default: the current one)
 
         Returns:
         --------
         dict
             Predictions for each target score
         """
+        bundle = bundle or self.bundle
         predictions = {}
+        arrays = {}
 
         for target in self.targets:
+            # Validate/convert once per distinct feature layout
+            schema = bundle.schemas[target]
+            if schema.features not in arrays:
+                arrays[schema.features] = schema.to_array(features)
+            X = arrays[schema.features]
+
             # Scale features
-            X_scaled = self.scalers[target].transform(features)
+            X_scaled = scale_features(bundle.scalers[target], X)
 
             # Predict
-            pred = self.models[target].predict(X_scaled)[0]
+            pred = bundle.models[target].predict(X_scaled)[0]
             predictions[target] = pred
 
         return predictions
 
+    @staticmethod
+    def _incremental_for(bundle: ModelBundle) -> Dict[str, IncrementalForest]:
+        if 'incremental' not in bundle.cache:
+            # Scalers folded into the thresholds: these take raw features
+            bundle.cache['incremental'] = {
+                target: IncrementalForest(fold_model(model, bundle.scalers[target]))
+                for target, model in bundle.models.items()}
+        return bundle.cache['incremental']
+
+    def predict_scenarios(self, baseline_features, scenario_features: Sequence,
+                          bundle: Optional[ModelBundle] = None) -> List[Dict[str, float]]:
+        """
+        Predict many variations of one baseline row.
+
+        Each tree keeps the baseline row's leaf unless its decision path
+        tests a feature the scenario changed, so a sweep that moves a few
+        features re-walks only a fraction of the forest. Results equal
+        predict_scores for every scenario.
+
+        Parameters:
+        -----------
+        baseline_features : pd.DataFrame, dict, or np.ndarray
+            The unchanged row (its decision paths are cached per model)
+        scenario_features : list
+            Adjusted rows, each in any form predict_scores accepts
+
+        Returns:
+        --------
+        list of dict
+            Predictions for each target score, one dict per scenario
+        """
+        bundle = bundle or self.bundle
+        if len(scenario_features) == 0:
+            return []
+        forests = self._incremental_for(bundle)
+        predictions = {}
+        arrays = {}
+
+        for target in self.targets:
+            schema = bundle.schemas[target]
+            if schema.features not in arrays:
+                arrays[schema.features] = (
+                    schema.to_array(baseline_features),
+                    np.vstack([schema.to_array(row) for row in scenario_features]))
+            base, X = arrays[schema.features]
+            predictions[target] = forests[target].predict(base[0], X)
+
+        return [{target: predictions[target][i] for target in self.targets}
+                for i in range(len(scenario_features))]
+
+    @property
+    def model_version(self) -> str:
+        """Combined hash of the loaded models (keys stored scenario runs)."""
+        return self.bundle.version
+
+    @staticmethod
+    def _mc_engine_for(bundle: ModelBundle) -> MonteCarloEngine:
+        if 'mc_engine' not in bundle.cache:
+            bundle.cache['mc_engine'] = MonteCarloEngine(
+                bundle.models, bundle.scalers, bundle.schemas)
+        return bundle.cache['mc_engine']
+
+    def _attributors_for(self, bundle: ModelBundle) -> Dict[str, TreeAttributor]:
+        if 'attributors' not in bundle.cache:
+            bundle.cache['attributors'] = {
+                target: TreeAttributor.from_estimator(
+                    bundle.models[target], bundle.hashes[target])
+                for target in self.targets
+            }
+        return bundle.cache['attributors']
+
+    @property
+    def mc_engine(self) -> MonteCarloEngine:
+        """Monte Carlo engine over the loaded forests (built on first use)."""
+        return self._mc_engine_for(self.bundle)
+
+    @property
+    def attributors(self) -> Dict[str, TreeAttributor]:
+        """TreeSHAP explainers per target (built on first use)."""
+        return self._attributors_for(self.bundle)
+
+    def explain_intervention(self, baseline_features, adjusted_features,
+                             bundle: Optional[ModelBundle] = None) -> Dict[str, Dict]:
+        """
+        Per-feature contributions to each target's predicted change.
+
+        Parameters:
+        -----------
+        baseline_features, adjusted_features : pd.DataFrame or dict
+            Feature rows before and after the intervention
+        bundle : ModelBundle, optional
+            Model version to explain (default: the current one)
+
+        Returns:
+        --------
+        dict
+            Target -> explain_change result
+        """
+        bundle = bundle or self.bundle
+        attributors = self._attributors_for(bundle)
+        return {
+            target: explain_change(attributors[target], bundle.schemas[target],
+                                   bundle.scalers[target], baseline_features,
+                                   adjusted_features)
+            for target in self.targets
+        }
+
     def simulate_intervention(self, tract: str, year: int,
-                              deltas: Dict[str, float]) -> Dict:
+                              deltas: Dict[str, float],
+                              uncertainty: Optional[UncertaintyConfig] = None,
+                              explain: bool = False) -> Dict:
         """
         Simulate a policy intervention and calculate its impact.
 
@@ -201,6 +389,12 @@ class InterventionSimulator:
                 "minority_owned_businesses_pct": 0.15,  # +15%
                 "early_education_enrollment_pct": 0.12  # +12%
             }
+        uncertainty : UncertaintyConfig
+            If given, also run Monte Carlo draws over the forest trees (and
+            optional input noise) and report prediction intervals
+        explain : bool
+            If True, also attribute each score change to the input features
+            (TreeSHAP contributions)
 
         Returns:
         --------
@@ -212,6 +406,11 @@ class InterventionSimulator:
             - baseline: Baseline scores
             - after_intervention: Scores after intervention
             - impact: Change in scores (after - baseline)
+            - intervals: Per-target baseline/intervention/delta intervals
+              (only when uncertainty is requested)
+            - attributions: Per-target feature contributions (only when
+              explain is True)
+            - run_id: Scenario store run (only with a scenario store)
         """
         print("="*60)
         print("POLICY INTERVENTION SIMULATION")
@@ -220,6 +419,22 @@ class InterventionSimulator:
         print(f"\nTract: {tract}")
         print(f"Year: {year}")
 
+        # One model version for the whole run, even if a reload lands mid-way
+        bundle = self.bundle
+
+        # Point estimates are deterministic: answer repeats from the store
+        if self.scenario_store is not None and uncertainty is None and not explain:
+            stored = self.scenario_store.lookup(tract, year, deltas, bundle.version)
+            if stored is not None:
+                print(f"\n✓ Reusing stored run #{stored['run_id']} "
+                      f"(model version {bundle.version})")
+                for target, delta in stored['impact'].items():
+                    print(f"  {target}: {delta:+.2f}")
+                return {'tract': tract, 'year': year, 'interventions': deltas,
+                        'baseline': stored['baseline'],
+                        'after_intervention': stored['after_intervention'],
+                        'impact': stored['impact'], 'run_id': stored['run_id']}
+
         # Get baseline features
         print("\n--- Extracting Baseline Features ---")
         baseline_features = self.get_baseline_features(tract, year)
@@ -229,7 +444,7 @@ class InterventionSimulator:
 
         # Predict baseline scores
         print("\n--- Baseline Predictions ---")
-        baseline_scores = self.predict_scores(baseline_features)
+        baseline_scores = self.predict_scores(baseline_features, bundle)
         for target, score in baseline_scores.items():
             print(f"  {target}: {score:.2f}")
 
@@ -239,7 +454,7 @@ class InterventionSimulator:
 
         # Predict scores after intervention
         print("\n--- Predictions After Intervention ---")
-        after_scores = self.predict_scores(adjusted_features)
+        after_scores = self.predict_scores(adjusted_features, bundle)
         for target, score in after_scores.items():
             print(f"  {target}: {score:.2f}")
 
@@ -262,6 +477,33 @@ class InterventionSimulator:
             'impact': impact
         }
 
+        if uncertainty is not None:
+            print(f"\n--- Uncertainty ({uncertainty.n_draws} draws, "
+                  f"{uncertainty.interval:.0%} interval) ---")
+            intervals = self._mc_engine_for(bundle).simulate(
+                baseline_features, adjusted_features, uncertainty)
+            for target, summary in intervals.items():
+                d = summary['delta']
+                print(f"  {target}: {d['mean']:+.2f} "
+                      f"[{d['lower']:+.2f}, {d['upper']:+.2f}]  "
+                      f"P(increase)={summary['prob_increase']:.0%}")
+            results['intervals'] = intervals
+
+        if explain:
+            print("\n--- Drivers of IGS Change ---")
+            attributions = self.explain_intervention(
+                baseline_features, adjusted_features, bundle)
+            drivers = sorted(attributions['igs_score']['delta'].items(),
+                             key=lambda item: abs(item[1]), reverse=True)
+            for feature, contribution in drivers[:5]:
+                print(f"  {feature}: {contribution:+.2f}")
+            results['attributions'] = attributions
+
+        if self.scenario_store is not None:
+            results['run_id'], = self.scenario_store.record([ScenarioRun.from_results(
+                results, bundle.version, uncertainty=uncertainty)])
+            print(f"\n✓ Recorded as run #{results['run_id']}")
+
         print("\n" + "="*60)
         print("SIMULATION COMPLETE")
         print("="*60)
@@ -302,7 +544,8 @@ class InterventionSimulator:
         if baseline_features is None:
             return None
 
-        baseline_scores = self.predict_scores(baseline_features)
+        bundle = self.bundle
+        baseline_scores = self.predict_scores(baseline_features, bundle)
 
         # Add baseline to comparison
         baseline_row = {'Scenario': 'Baseline (No Intervention)'}
@@ -310,12 +553,21 @@ class InterventionSimulator:
             baseline_row[target] = baseline_scores[target]
         comparison_data.append(baseline_row)
 
-        # Run each scenario
+        # Build every scenario, then predict them together: trees whose
+        # baseline path ignores the changed features keep their leaf
+        adjusted_rows = []
         for scenario_name, deltas in intervention_scenarios.items():
             print(f"\n--- {scenario_name} ---")
-            adjusted = self.apply_intervention(
-                baseline_features.copy(), deltas)
-            scores = self.predict_scores(adjusted)
+            adjusted_rows.append(self.apply_intervention(
+                baseline_features.copy(), deltas))
+        scenario_scores = self.predict_scenarios(baseline_features, adjusted_rows, bundle)
+
+        runs = []
+        for (scenario_name, deltas), scores in zip(intervention_scenarios.items(),
+                                                   scenario_scores):
+            runs.append(ScenarioRun(tract, year, deltas, bundle.version,
+                                    baseline_scores, scores, scenario=scenario_name,
+                                    source='compare_interventions'))
 
             row = {'Scenario': scenario_name}
             for target in self.targets:
@@ -327,6 +579,10 @@ class InterventionSimulator:
 
         comparison_df = pd.DataFrame(comparison_data)
 
+        if self.scenario_store is not None:
+            run_ids = self.scenario_store.record(runs)
+            print(f"\n✓ Recorded {len(run_ids)} runs in {self.scenario_store.path}")
+
         print("\n" + "="*60)
         print("SCENARIO COMPARISON")
         print("="*60 + "\n")
@@ -338,8 +594,8 @@ class InterventionSimulator:
 def main():
     """Example usage of the intervention simulator."""
 
-    # Initialize simulator
-    simulator = InterventionSimulator()
+    # Initialize simulator (runs are kept in the scenario store)
+    simulator = InterventionSimulator(scenario_store=ScenarioStore())
 
     print("\n" + "="*60)
     print("EXAMPLE 1: Single Intervention")
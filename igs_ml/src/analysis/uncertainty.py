@@ -0,0 +1,182 @@
+"""
+Monte Carlo Uncertainty Engine for Intervention Outcomes
+
+Turns the point estimates of the pillar models into prediction intervals by
+combining two sources of uncertainty:
+1. Model uncertainty - each draw is scored by one randomly chosen tree of the
+   forest, so the spread of the 100+ trees forms an empirical distribution
+2. Input uncertainty - features can be perturbed with Gaussian noise derived
+   from ACS margins of error (90% MOE / 1.645 = standard error)
+
+Baseline and intervention rows share the same tree and noise per draw
+(common random numbers), so the delta interval reflects the intervention
+effect rather than the difference of two independent samples.
+
+All draws for a scenario are evaluated in one batched traversal of the packed
+forest, so thousands of draws take milliseconds.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import scale_features  # noqa: E402
+from modeling.packed_forest import PackedForest  # noqa: E402
+
+# ACS publishes margins of error at the 90% confidence level
+ACS_MOE_Z = 1.645
+
+
+@dataclass
+class UncertaintyConfig:
+    """
+    Settings for a Monte Carlo run.
+
+    Attributes:
+    -----------
+    n_draws : int
+        Number of Monte Carlo draws per scenario
+    interval : float
+        Central prediction interval width (0.90 -> 5th-95th percentile)
+    input_moe : dict
+        Feature -> 90% margin of error in feature units (e.g. ACS MOE)
+    seed : int
+        Random seed for reproducible draws
+    """
+
+    n_draws: int = 2000
+    interval: float = 0.90
+    input_moe: Dict[str, float] = field(default_factory=dict)
+    seed: Optional[int] = 42
+
+
+def summarize_draws(draws: np.ndarray, interval: float = 0.90) -> Dict[str, float]:
+    """
+    Summarize a vector of Monte Carlo draws.
+
+    Returns:
+    --------
+    dict
+        mean, std, median, lower and upper interval bounds
+    """
+    alpha = (1 - interval) / 2
+    lower, median, upper = np.quantile(draws, [alpha, 0.5, 1 - alpha])
+    return {
+        'mean': float(draws.mean()),
+        'std': float(draws.std()),
+        'median': float(median),
+        'lower': float(lower),
+        'upper': float(upper),
+    }
+
+
+class MonteCarloEngine:
+    """Draws per-tree predictions with input noise for baseline/intervention pairs."""
+
+    def __init__(self, models: Mapping, scalers: Mapping, schemas: Mapping):
+        """
+        Parameters:
+        -----------
+        models : dict
+            Target -> fitted RandomForestRegressor
+        scalers : dict
+            Target -> fitted StandardScaler
+        schemas : dict
+            Target -> FeatureSchema
+        """
+        self.targets = list(models)
+        self.scalers = dict(scalers)
+        self.schemas = dict(schemas)
+        self.forests = {target: PackedForest.from_estimator(model)
+                        for target, model in models.items()}
+
+    def _noise_scale(self, schema, input_moe: Mapping[str, float]) -> np.ndarray:
+        """Per-column standard error vector for a schema."""
+        sd = np.zeros(schema.n_features)
+        for feature, moe in input_moe.items():
+            if feature in schema.features:
+                sd[schema.index(feature)] = float(moe) / ACS_MOE_Z
+        return sd
+
+    def sample(self, target: str, X: np.ndarray, config: UncertaintyConfig,
+               rng: np.random.Generator) -> np.ndarray:
+        """
+        Monte Carlo draws for each input row of one target.
+
+        Parameters:
+        -----------
+        target : str
+            Target model to sample
+        X : np.ndarray
+            Schema-ordered inputs of shape (n_rows, n_features)
+        config : UncertaintyConfig
+            Draw count and input noise
+        rng : np.random.Generator
+            Random generator (shared tree/noise draws across rows)
+
+        Returns:
+        --------
+        np.ndarray
+            Draws of shape (n_rows, n_draws)
+        """
+        schema = self.schemas[target]
+        forest = self.forests[target]
+        n_rows, n_draws = X.shape[0], config.n_draws
+
+        # One tree and one noise vector per draw, shared by every input row
+        tree_idx = rng.integers(0, forest.n_trees, size=n_draws)
+        sd = self._noise_scale(schema, config.input_moe)
+        noise = rng.standard_normal((n_draws, schema.n_features)) * sd
+
+        X_draws = X[:, None, :] + noise[None, :, :]
+        pct_cols = [i for i, f in enumerate(schema.features) if f.endswith('_pct')]
+        if pct_cols and sd.any():
+            X_draws[..., pct_cols] = np.clip(X_draws[..., pct_cols], 0, 100)
+
+        X_scaled = scale_features(self.scalers[target],
+                                  X_draws.reshape(-1, schema.n_features))
+        draws = forest.predict_sampled(X_scaled, np.tile(tree_idx, n_rows))
+        return draws.reshape(n_rows, n_draws)
+
+    def simulate(self, baseline, intervention,
+                 config: Optional[UncertaintyConfig] = None) -> Dict[str, Dict]:
+        """
+        Prediction intervals for baseline, intervention, and delta.
+
+        Parameters:
+        -----------
+        baseline, intervention : pd.DataFrame, dict, or np.ndarray
+            Single feature rows accepted by FeatureSchema.to_array
+        config : UncertaintyConfig
+            Monte Carlo settings (defaults to 2000 draws, 90% interval)
+
+        Returns:
+        --------
+        dict
+            Target -> {'baseline', 'intervention', 'delta'} summaries plus
+            'prob_increase' (share of draws where the score goes up)
+        """
+        config = config or UncertaintyConfig()
+        results = {}
+
+        for target in self.targets:
+            schema = self.schemas[target]
+            X = np.vstack([schema.to_array(baseline), schema.to_array(intervention)])
+
+            # Same seed per target keeps draws comparable across pillars
+            rng = np.random.default_rng(config.seed)
+            draws = self.sample(target, X, config, rng)
+            delta = draws[1] - draws[0]
+
+            results[target] = {
+                'baseline': summarize_draws(draws[0], config.interval),
+                'intervention': summarize_draws(draws[1], config.interval),
+                'delta': summarize_draws(delta, config.interval),
+                'prob_increase': float((delta > 0).mean()),
+            }
+
+        return results
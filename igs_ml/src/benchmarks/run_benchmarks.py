@@ -0,0 +1,408 @@
+"""
+Performance Benchmarks for the IGS ML Pipeline
+
+Times each pipeline stage on synthetic state-scale panels
+(generate_synthetic_panel, 1k-80k tracts x 10 years):
+1. trend_features   - clean_tract_year + calculate_trend_features +
+                      remove_first_year_per_tract
+2. train_<target>   - train_model_for_target (fit + 5-fold CV) per pillar
+3. batch_predict    - schema conversion, scaling, and prediction of every row
+                      with all four models
+4. simulator_row    - InterventionSimulator.simulate_intervention latency for
+                      one tract (median of several calls)
+   scenario_sweep   - predict_scenarios on 200 scenarios that each change 1-3
+                      features of one tract (incremental leaf reuse), vs.
+                      predict_scores called once per scenario
+5. policy_cli_cold / policy_cli_warm
+                    - run_policy_simulation.py wall time in a fresh
+                      interpreter with an empty bytecode cache, then warm
+   policy_cli_imports
+                    - its total module import time from `python -X
+                      importtime`, with the slowest top-level imports and
+                      any heavy library (pandas, sklearn, scipy, ...) that
+                      the fast-start path should not load
+6. policy_direct / policy_batched
+                    - time per policy-simulation request scored one call
+                      per model, vs. through the MicroBatchDispatcher with
+                      concurrent clients (throughput and p50/p99 latency)
+
+Each run is appended to output/benchmarks/benchmark_history.json. A stage
+regresses when it is slower than REGRESSION_TOLERANCE times the median of
+its previous runs on the same host and size; the script then exits non-zero
+so it can gate a deploy.
+
+Usage:
+    python src/benchmarks/run_benchmarks.py --sizes 1000 10000 80000
+    python src/benchmarks/run_benchmarks.py --sizes 1000 --stages trend_features batch_predict
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import sklearn
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from data_processing.clean_igs_data import (  # noqa: E402
+    generate_synthetic_panel, clean_tract_year, calculate_trend_features,
+    remove_first_year_per_tract)
+from modeling.feature_schema import BASE_FEATURES, TARGETS, scale_features  # noqa: E402
+from modeling.model_artifacts import load_pillar_models  # noqa: E402
+from modeling.train_ml_model import train_model_for_target, save_model_artifacts  # noqa: E402
+from analysis.simulate_intervention import InterventionSimulator  # noqa: E402
+from analysis.policy_scenario import policy_rows  # noqa: E402
+from serving.dispatcher import MicroBatchDispatcher  # noqa: E402
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+PROJECT_ROOT = BASE_DIR.parent
+HISTORY_PATH = BASE_DIR / 'output' / 'benchmarks' / 'benchmark_history.json'
+POLICY_CLI = PROJECT_ROOT / 'nextjs-dashboard' / 'scripts' / 'run_policy_simulation.py'
+POLICY_MODELS = PROJECT_ROOT / 'igs_plus_more_data' / 'models_augmented'
+
+STAGES = ('trend_features', 'train', 'batch_predict', 'simulator_row', 'scenario_sweep',
+          'policy_cli_cold', 'policy_cli_warm', 'policy_cli_imports',
+          'policy_direct', 'policy_batched')
+
+# Libraries the policy CLI's fast-start path is expected not to import
+HEAVY_MODULES = ('pandas', 'sklearn', 'scipy', 'matplotlib', 'seaborn', 'joblib')
+
+# Allowed slowdown vs. the median of previous runs before a stage is flagged
+REGRESSION_TOLERANCE = {
+    'default': 1.25,
+    # Subprocess timings are noisier (process start-up, disk cache)
+    'policy_cli_cold': 1.5,
+    'policy_cli_warm': 1.5,
+    'policy_cli_imports': 1.5,
+}
+HISTORY_WINDOW = 5
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the pipeline's progress prints while timing."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def timed(func, repeat=1):
+    """Run func `repeat` times; return (last result, list of seconds)."""
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, times
+
+
+def record(results, stage, size, times, **extra):
+    entry = {
+        'stage': stage, 'size': size,
+        'seconds': min(times), 'median_seconds': statistics.median(times),
+        'repeats': len(times), **extra,
+    }
+    results.append(entry)
+    label = f"{stage} [{size} tracts]" if size else stage
+    print(f"  ✓ {label:<40} {entry['seconds']:>9.3f}s")
+    return entry
+
+
+def bench_size(n_tracts, n_years, stages, targets, work_dir, results):
+    """Run the data/model stages on one synthetic panel size."""
+    print(f"\n--- {n_tracts:,} tracts x {n_years} years ---")
+    raw = generate_synthetic_panel(n_tracts, n_years=n_years)
+
+    def trend_features():
+        with quiet():
+            df = clean_tract_year(raw.copy())
+            df = calculate_trend_features(df)
+            return remove_first_year_per_tract(df)
+
+    df, times = timed(trend_features)
+    if 'trend_features' in stages:
+        record(results, 'trend_features', n_tracts, times, rows=len(raw))
+
+    models_dir = Path(work_dir) / f'models_{n_tracts}'
+    data_path = Path(work_dir) / f'panel_{n_tracts}.csv'
+    needs_models = stages & {'train', 'batch_predict', 'simulator_row', 'scenario_sweep'}
+    if not needs_models:
+        return
+
+    # Same split and scaler as train_ml_model.main
+    X = df[list(BASE_FEATURES)]
+    X_train, X_test = train_test_split(X, test_size=0.2, random_state=42)
+    scaler = StandardScaler().fit(X_train)
+    for target in targets:
+        y_train, y_test = train_test_split(df[target], test_size=0.2, random_state=42)
+        with quiet():
+            result, times = timed(lambda: train_model_for_target(
+                X_train, X_test, y_train, y_test, target, scaler, list(BASE_FEATURES)))
+            save_model_artifacts(result['model'], scaler, result['feature_importance'],
+                                 target, output_dir=models_dir,
+                                 feature_names=list(BASE_FEATURES))
+        if 'train' in stages:
+            record(results, f'train_{target}', n_tracts, times, rows=len(X_train))
+
+    if 'batch_predict' in stages:
+        models, scalers, schemas = load_pillar_models(models_dir, targets)
+
+        def batch_predict():
+            return {t: models[t].predict(scale_features(scalers[t], schemas[t].to_array(df)))
+                    for t in targets}
+
+        _, times = timed(batch_predict, repeat=3)
+        record(results, 'batch_predict', n_tracts, times, rows=len(df))
+
+    if stages & {'simulator_row', 'scenario_sweep'} and set(targets) == set(TARGETS):
+        df.to_csv(data_path, index=False)
+        with quiet():
+            simulator = InterventionSimulator(models_dir=models_dir, data_path=data_path)
+        tract, year = df['tract'].iloc[len(df) // 2], int(df['year'].max())
+
+    if 'simulator_row' in stages and set(targets) == set(TARGETS):
+        deltas = {'broadband_access_pct': 0.20, 'housing_cost_burden_pct': -0.10}
+
+        def simulate():
+            with quiet():
+                return simulator.simulate_intervention(tract, year, deltas)
+
+        _, times = timed(simulate, repeat=5)
+        record(results, 'simulator_row', n_tracts, times)
+
+    if 'scenario_sweep' in stages and set(targets) == set(TARGETS):
+        bench_scenario_sweep(simulator, tract, year, n_tracts, results)
+
+
+def bench_scenario_sweep(simulator, tract, year, size, results, n_scenarios=200):
+    """Score many 1-3 feature scenarios around one tract's baseline."""
+    rng = np.random.default_rng(0)
+    baseline = simulator.get_baseline_features(tract, year)
+    scenarios = []
+    for _ in range(n_scenarios):
+        changed = rng.choice(BASE_FEATURES, size=rng.integers(1, 4), replace=False)
+        adjusted = baseline.copy()
+        for feature in changed:
+            adjusted[feature] *= 1 + rng.uniform(-0.3, 0.3)
+        scenarios.append(adjusted)
+
+    _, per_row = timed(lambda: [simulator.predict_scores(row) for row in scenarios])
+    # Fresh forests so the first repeat also pays for caching the baseline paths
+    simulator.bundle.cache.pop('incremental', None)
+    _, times = timed(lambda: simulator.predict_scenarios(baseline, scenarios), repeat=3)
+    forests = simulator.bundle.cache['incremental'].values()
+    evaluated = sum(f.evaluated_fraction for f in forests) / len(forests)
+    entry = record(results, 'scenario_sweep', size, times, scenarios=n_scenarios,
+                   per_row_seconds=min(per_row), trees_evaluated_fraction=round(evaluated, 3))
+    print(f"      one predict_scores per scenario {entry['per_row_seconds']:.3f}s, "
+          f"{evaluated:.0%} of trees re-walked")
+
+
+def bench_policy_cli(stages, results, warm_runs=5):
+    """Wall time of the dashboard's policy CLI in fresh interpreters."""
+    args = [sys.executable, str(POLICY_CLI), '10', '5', '3']
+    with tempfile.TemporaryDirectory() as pycache:
+        # Empty bytecode cache -> the first run pays compile + import costs
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache)
+        # Let the cold run write the cache, or every "warm" run compiles again
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+
+        def run():
+            subprocess.run(args, env=env, check=True, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL)
+
+        _, cold = timed(run)
+        _, warm = timed(run, repeat=warm_runs)
+    if 'policy_cli_cold' in stages:
+        record(results, 'policy_cli_cold', None, cold)
+    if 'policy_cli_warm' in stages:
+        record(results, 'policy_cli_warm', None, warm)
+    if 'policy_cli_imports' in stages:
+        profile = import_profile(args)
+        record(results, 'policy_cli_imports', None, [profile['seconds']],
+               heavy_modules=profile['heavy_modules'], top_imports=profile['top_imports'])
+        for name, seconds in profile['top_imports']:
+            print(f"      {name:<38} {seconds:>9.3f}s")
+        if profile['heavy_modules']:
+            print(f"    ⚠ heavy imports on the fast path: {', '.join(profile['heavy_modules'])}")
+
+
+def import_profile(args, top=5):
+    """
+    Module import time of a command, from `python -X importtime`.
+
+    Returns:
+    --------
+    dict
+        seconds (sum of top-level imports), top_imports (slowest top-level
+        modules with cumulative seconds), heavy_modules (HEAVY_MODULES that
+        were imported at all)
+    """
+    proc = subprocess.run([args[0], '-X', 'importtime', *args[1:]], check=True,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    top_level, imported = [], set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported.add(name.strip().split('.')[0])
+        # Nested imports are indented under the module that triggered them
+        if not name[1:].startswith(' '):
+            top_level.append((name.strip(), int(cumulative) / 1e6))
+    return {
+        'seconds': sum(seconds for _, seconds in top_level),
+        'top_imports': sorted(top_level, key=lambda item: -item[1])[:top],
+        'heavy_modules': sorted(imported & set(HEAVY_MODULES)),
+    }
+
+
+def bench_policy_dispatcher(stages, results, n_requests=1000, clients=64):
+    """Policy-simulation requests scored one at a time vs. micro-batched."""
+    models, scalers, schemas = load_pillar_models(POLICY_MODELS)
+    rng = np.random.default_rng(0)
+    requests = [list(policy_rows(*rng.uniform(0, 20, 3))) for _ in range(n_requests)]
+
+    if 'policy_direct' in stages:
+        def direct():
+            for rows in requests[:max(n_requests // 20, 10)]:
+                for target in models:
+                    models[target].predict(scale_features(
+                        scalers[target], schemas[target].to_array(rows)))
+
+        _, times = timed(direct)
+        per_request = min(times) / max(n_requests // 20, 10)
+        record(results, 'policy_direct', None, [per_request],
+               requests_per_second=1 / per_request)
+
+    if 'policy_batched' in stages:
+        async def batched():
+            dispatcher = MicroBatchDispatcher(models, scalers, schemas)
+            latencies, pending = [], iter(requests)
+
+            async def client():
+                for rows in pending:
+                    start = time.perf_counter()
+                    await dispatcher.predict(rows)
+                    latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(client() for _ in range(clients)))
+            elapsed = time.perf_counter() - start
+            await dispatcher.close()
+            return elapsed, latencies, dispatcher.stats['batches']
+
+        elapsed, latencies, batches = asyncio.run(batched())
+        record(results, 'policy_batched', None, [elapsed / n_requests],
+               requests_per_second=n_requests / elapsed, clients=clients, batches=batches,
+               p50_ms=1000 * float(np.quantile(latencies, 0.5)),
+               p99_ms=1000 * float(np.quantile(latencies, 0.99)))
+
+
+def environment_info():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'host': platform.node(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'cpu_count': os.cpu_count(),
+        'commit': commit,
+    }
+
+
+def check_regressions(history, run):
+    """
+    Compare a run against earlier runs on the same host.
+
+    Returns:
+    --------
+    list of dict
+        Stages slower than their tolerance x the historical median
+    """
+    regressions = []
+    host = run['environment']['host']
+    previous = [r for r in history if r['environment'].get('host') == host]
+    for entry in run['results']:
+        past = [e['seconds'] for r in previous[-HISTORY_WINDOW:] for e in r['results']
+                if e['stage'] == entry['stage'] and e['size'] == entry['size']]
+        if not past:
+            continue
+        baseline = statistics.median(past)
+        stage_key = entry['stage'] if entry['stage'] in REGRESSION_TOLERANCE else 'default'
+        limit = REGRESSION_TOLERANCE[stage_key] * baseline
+        if entry['seconds'] > limit:
+            regressions.append({**entry, 'baseline_seconds': baseline,
+                                'ratio': entry['seconds'] / baseline})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the IGS ML pipeline')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 80000],
+                        help='Synthetic panel sizes (number of tracts)')
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=list(TARGETS))
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--no-save', action='store_true', help='Do not append to history')
+    args = parser.parse_args()
+    stages = set(args.stages)
+
+    print("=" * 70)
+    print("IGS PIPELINE BENCHMARKS")
+    print("=" * 70)
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for n_tracts in args.sizes:
+            bench_size(n_tracts, args.years, stages, args.targets, work_dir, results)
+    if stages & {'policy_cli_cold', 'policy_cli_warm', 'policy_cli_imports'}:
+        print("\n--- Policy CLI ---")
+        bench_policy_cli(stages, results)
+    if stages & {'policy_direct', 'policy_batched'}:
+        print("\n--- Policy requests (micro-batching) ---")
+        bench_policy_dispatcher(stages, results)
+
+    history_path = Path(args.history)
+    history = json.loads(history_path.read_text()) if history_path.exists() else []
+    run = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment_info(),
+        'years': args.years,
+        'results': results,
+    }
+    regressions = check_regressions(history, run)
+    run['regressions'] = [(r['stage'], r['size']) for r in regressions]
+
+    if not args.no_save:
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        history_path.write_text(json.dumps(history + [run], indent=2))
+        print(f"\n✓ Appended run to {history_path}")
+
+    if regressions:
+        print("\n⚠ PERFORMANCE REGRESSIONS:")
+        for r in regressions:
+            print(f"  {r['stage']} [{r['size']}]: {r['seconds']:.3f}s vs "
+                  f"{r['baseline_seconds']:.3f}s baseline ({r['ratio']:.2f}x)")
+        sys.exit(1)
+    print("✓ No regressions against previous runs")
+
+
+if __name__ == '__main__':
+    main()
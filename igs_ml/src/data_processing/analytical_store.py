@@ -0,0 +1,315 @@
+"""
+Analytical Store
+
+Embedded SQLite database holding the cleaned and derived datasets, so
+analyses can push filters and joins into SQL instead of reading every CSV
+into pandas and joining ad hoc.
+
+Tables (one per source; each has a `geoid` column - the 11-character tract
+GEOID or the 5-character county FIPS code - and an index on (geoid, year)):
+- igs_trends        tract panel used for modeling
+- tract_20800       tract 05085020800 from the IGS export
+- broadband, housing, personal_income, business, labor   county-level ACS/CBP data
+
+Views:
+- county_broadband, county_housing   one row per county-year (1-year
+                                     estimates preferred over 5-year)
+- county_labor                       per-year column maxima (the all-firm
+                                     totals of the BDS extract)
+- integrated_county                  igs_trends joined to the county views
+                                     (the county-level columns of
+                                     integrated_igs_county_data.csv)
+
+The store records the sha256 of every source file; open_store() rebuilds it
+when a source changed, so callers never read stale tables. A rebuild writes
+to a temporary file and swaps it in, so concurrent readers are unaffected.
+
+Usage:
+    python src/data_processing/analytical_store.py            # build if stale
+    python src/data_processing/analytical_store.py --force
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from data_processing.tract_index import normalize_geoid  # noqa: E402
+
+# Paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+PROJECT_ROOT = BASE_DIR.parent
+STORE_PATH = BASE_DIR / 'data' / 'igs_store.sqlite'
+
+# table -> (path relative to the project root, geography level)
+SOURCES = {
+    'igs_trends': ('igs_ml/data/igs_trends_features.csv', 'tract'),
+    'tract_20800': ('data_cleaned/tract_20800_cleaned.csv', 'tract'),
+    'broadband': ('data_cleaned/broadband_cleaned.csv', 'county'),
+    'housing': ('data_cleaned/housing_cleaned.csv', 'county'),
+    'personal_income': ('data_cleaned/personal_income_cleaned.csv', 'county'),
+    'business': ('data_cleaned/business_cleaned.csv', 'county'),
+    'labor': ('data_cleaned/labor_cleaned.csv', 'county'),
+}
+
+COUNTY_FIPS = {'Lonoke County, Arkansas': '05085'}
+
+# Rank used to keep one ACS estimate per county-year
+_ESTIMATE_RANK = "CASE estimate_type WHEN '1-year' THEN 0 ELSE 1 END"
+
+VIEWS = {
+    'county_broadband': f"""
+        SELECT geoid, year, estimate_type, total_households, broadband_access_pct,
+               no_internet_pct, computer_ownership_pct
+        FROM (SELECT *, ROW_NUMBER() OVER (
+                  PARTITION BY geoid, year ORDER BY {_ESTIMATE_RANK}) AS pick
+              FROM broadband)
+        WHERE pick = 1""",
+    'county_housing': f"""
+        SELECT geoid, year, estimate_type, total_housing_units, occupancy_rate, vacancy_pct
+        FROM (SELECT *, ROW_NUMBER() OVER (
+                  PARTITION BY geoid, year ORDER BY {_ESTIMATE_RANK}) AS pick
+              FROM housing)
+        WHERE pick = 1""",
+    'county_labor': """
+        SELECT geoid, year, MAX(num_firms) AS num_firms,
+               MAX(num_establishments) AS num_establishments,
+               MAX(num_employees) AS num_employees,
+               MAX(net_jobs_created) AS net_jobs_created,
+               MAX(job_churn) AS job_churn
+        FROM labor
+        GROUP BY geoid, year""",
+    'integrated_county': """
+        SELECT t.*,
+               b.total_households, b.broadband_access_pct AS broadband_access_pct_county,
+               b.no_internet_pct, b.computer_ownership_pct,
+               h.total_housing_units, h.occupancy_rate, h.vacancy_pct,
+               l.num_firms, l.num_establishments, l.num_employees, l.net_jobs_created,
+               l.num_employees * 1.0 / l.num_firms AS employees_per_firm,
+               s.total_firms AS business_total_firms,
+               s.employer_firms AS business_employer_firms,
+               s.nonemployer_firms AS business_nonemployer_firms,
+               s.revenue_per_firm AS business_revenue_per_firm,
+               s.payroll_per_employee AS business_payroll_per_employee
+        FROM igs_trends t
+        LEFT JOIN county_broadband b ON b.geoid = substr(t.geoid, 1, 5) AND b.year = t.year
+        LEFT JOIN county_housing h ON h.geoid = substr(t.geoid, 1, 5) AND h.year = t.year
+        LEFT JOIN county_labor l ON l.geoid = substr(t.geoid, 1, 5) AND l.year = t.year
+        LEFT JOIN business s ON s.geoid = substr(t.geoid, 1, 5) AND s.year = t.year""",
+}
+
+
+def _file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _numeric_text(series: pd.Series) -> pd.Series:
+    """Text columns that are numbers written with U+2212 minus signs -> float."""
+    if series.dtype != object:
+        return series
+    converted = pd.to_numeric(series.str.replace('−', '-', regex=False), errors='coerce')
+    return converted if converted.notna().sum() == series.notna().sum() else series
+
+
+def load_source(path: Path, level: str) -> pd.DataFrame:
+    """
+    Read one cleaned CSV and add its `geoid` key.
+
+    Parameters:
+    -----------
+    path : Path
+        CSV to load
+    level : str
+        'tract' (GEOID from the tract column) or 'county' (FIPS from the county name)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Source columns plus geoid
+    """
+    df = pd.read_csv(path).apply(_numeric_text)
+    if level == 'tract':
+        geoid = normalize_geoid(df['tract']).to_numpy()
+    else:
+        geoid = df['county'].map(COUNTY_FIPS).to_numpy()
+    return df.assign(geoid=geoid)
+
+
+def build_store(store_path=STORE_PATH, root=PROJECT_ROOT) -> Dict[str, int]:
+    """
+    Build the store from the source CSVs that exist under `root`.
+
+    Returns:
+    --------
+    dict
+        table -> row count
+    """
+    store_path = Path(store_path)
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = store_path.with_name(f'.{store_path.name}.{os.getpid()}.tmp')
+    tmp_path.unlink(missing_ok=True)
+
+    counts = {}
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("CREATE TABLE _sources (name TEXT PRIMARY KEY, path TEXT, sha256 TEXT)")
+        for name, (relpath, level) in SOURCES.items():
+            path = Path(root) / relpath
+            if not path.exists():
+                print(f"  - {name}: {relpath} not found, skipped")
+                continue
+            df = load_source(path, level)
+            df.to_sql(name, conn, index=False)
+            conn.execute(f"CREATE INDEX idx_{name}_geoid_year ON {name} (geoid, year)")
+            conn.execute("INSERT INTO _sources VALUES (?, ?, ?)",
+                         (name, relpath, _file_digest(path)))
+            counts[name] = len(df)
+            print(f"  ✓ {name}: {len(df)} rows")
+        for name, sql in VIEWS.items():
+            conn.execute(f"CREATE VIEW {name} AS {sql}")
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, store_path)
+    return counts
+
+
+def store_is_current(store_path=STORE_PATH, root=PROJECT_ROOT) -> bool:
+    """True if the store exists and every source file is unchanged since the build."""
+    store_path = Path(store_path)
+    if not store_path.exists():
+        return False
+    conn = sqlite3.connect(f'file:{store_path}?mode=ro', uri=True)
+    try:
+        recorded = dict(conn.execute("SELECT path, sha256 FROM _sources").fetchall())
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        conn.close()
+    for relpath, _ in SOURCES.values():
+        path = Path(root) / relpath
+        current = _file_digest(path) if path.exists() else None
+        if recorded.get(relpath) != current:
+            return False
+    return True
+
+
+class AnalyticalStore:
+    """Read-only connection to the store with DataFrame-returning queries."""
+
+    def __init__(self, store_path=STORE_PATH):
+        self.path = Path(store_path)
+        self.conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def query(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        """Run a SELECT and return the result as a DataFrame."""
+        return pd.read_sql_query(sql, self.conn, params=list(params))
+
+    def select(self, table: str, columns: Optional[Sequence[str]] = None,
+               tracts=None, counties=None, years=None) -> pd.DataFrame:
+        """
+        Rows of one table or view, filtered in SQL on the (geoid, year) index.
+
+        Parameters:
+        -----------
+        table : str
+            Table or view name
+        columns : list of str, optional
+            Columns to return (default: all)
+        tracts : scalar or array-like, optional
+            Tract IDs in any format normalize_geoid accepts (tract-level tables)
+        counties : scalar or array-like, optional
+            County FIPS codes (county-level tables)
+        years : int or array-like, optional
+            Years to keep
+
+        Returns:
+        --------
+        pd.DataFrame
+            Matching rows ordered by geoid and year
+        """
+        keys = {}
+        if tracts is not None:
+            keys['geoid'] = [g for g in normalize_geoid(tracts) if g is not None]
+        if counties is not None:
+            keys['geoid'] = keys.get('geoid', []) + [
+                str(c).zfill(5) for c in np.atleast_1d(counties)]
+        if years is not None:
+            keys['year'] = [int(y) for y in np.atleast_1d(years)]
+
+        clauses = [f"{column} IN ({', '.join('?' * len(values))})"
+                   for column, values in keys.items()]
+        params = [value for values in keys.values() for value in values]
+        cols = ', '.join(f'"{c}"' for c in columns) if columns else '*'
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        return self.query(f"SELECT {cols} FROM {table}{where} ORDER BY geoid, year", params)
+
+    def tables(self) -> Dict[str, str]:
+        """Name -> 'table' or 'view' for everything queryable in the store."""
+        rows = self.conn.execute(
+            "SELECT name, type FROM sqlite_master WHERE type IN ('table', 'view') "
+            "AND name NOT LIKE '\\_%' ESCAPE '\\' AND name NOT LIKE 'sqlite%' "
+            "ORDER BY name").fetchall()
+        return dict(rows)
+
+
+def open_store(store_path=STORE_PATH, root=PROJECT_ROOT, rebuild: bool = True) -> AnalyticalStore:
+    """
+    Open the store, rebuilding it first if a source CSV changed.
+
+    Parameters:
+    -----------
+    rebuild : bool
+        Rebuild a missing or stale store (otherwise raise FileNotFoundError
+        when it is missing and read a stale one as is)
+    """
+    if not store_is_current(store_path, root):
+        if rebuild:
+            print(f"Building analytical store {store_path}...")
+            build_store(store_path, root)
+        elif not Path(store_path).exists():
+            raise FileNotFoundError(f"Analytical store not found: {store_path}")
+    return AnalyticalStore(store_path)
+
+
+def main(store_path=STORE_PATH, force=False):
+    print("="*70)
+    print("BUILDING ANALYTICAL STORE")
+    print("="*70)
+
+    if not force and store_is_current(store_path):
+        print(f"\n- {store_path} is up to date")
+        return
+
+    print()
+    counts = build_store(store_path)
+    size = Path(store_path).stat().st_size
+    print(f"\n✓ {len(counts)} tables, {len(VIEWS)} views, {size / 1024:.0f} KB")
+    print(f"✓ Saved to {store_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build the embedded analytical store')
+    parser.add_argument('--output', type=Path, default=STORE_PATH,
+                        help='SQLite file to write')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild even if every source is unchanged')
+    args = parser.parse_args()
+    main(args.output, args.force)
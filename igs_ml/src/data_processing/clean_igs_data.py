@@ -135,9 +135,10 @@ def remove_first_year_per_tract(df):
     print("\nRemoving first year per tract (NaN trend values)...")
     initial_rows = len(df)
 
-    # Group by tract and drop the first observation (index 0 in each group)
-    df_filtered = df.groupby('tract').apply(
-        lambda x: x.iloc[1:] if len(x) > 1 else x).reset_index(drop=True)
+    # Drop the first observation in each group (single-year tracts are kept)
+    group = df.groupby('tract', sort=False)
+    keep = (group.cumcount() > 0) | (group['tract'].transform('size') == 1)
+    df_filtered = df[keep].sort_values('tract', kind='stable').reset_index(drop=True)
 
     removed_rows = initial_rows - len(df_filtered)
     print(f"Removed {removed_rows} rows (first year per tract)")
@@ -218,6 +219,76 @@ def generate_sample_data():
     return pd.DataFrame(data)
 
 
+def generate_synthetic_panel(n_tracts, n_years=10, start_year=2014, seed=42):
+    """
+    Generate a large synthetic tract panel (vectorized version of
+    generate_sample_data for benchmarking at state scale).
+
+    Indicators follow the same per-tract base + yearly trend + noise recipe
+    as generate_sample_data; scores are noisy functions of the indicators so
+    the models have structure to learn.
+
+    Parameters:
+    -----------
+    n_tracts : int
+        Number of census tracts
+    n_years : int
+        Consecutive years per tract
+    start_year : int
+        First year of the panel
+    seed : int
+        Random seed
+
+    Returns:
+    --------
+    pd.DataFrame
+        n_tracts * n_years rows with the raw IGS columns
+    """
+    rng = np.random.default_rng(seed)
+    shape = (n_tracts, n_years)
+
+    # Arkansas-style GEOIDs: state 05, odd county codes, 6-digit tract codes
+    idx = np.arange(n_tracts)
+    tracts = np.char.add(np.char.add('05', np.char.zfill((2 * (idx // 1000) + 1).astype(str), 3)),
+                         np.char.zfill((idx % 1000 * 100 + 100).astype(str), 6))
+
+    i = np.arange(n_years)[None, :]
+    base_income = rng.integers(35000, 75000, size=(n_tracts, 1))
+    base_broadband = rng.uniform(60, 85, size=(n_tracts, 1))
+    base_minority_biz = rng.uniform(5, 15, size=(n_tracts, 1))
+    base_housing_burden = rng.uniform(25, 40, size=(n_tracts, 1))
+    base_early_ed = rng.uniform(40, 70, size=(n_tracts, 1))
+
+    median_income = (base_income * (1 + rng.uniform(-0.02, 0.05, shape) * i)
+                     + rng.integers(-2000, 2000, shape))
+    broadband = np.minimum(100, base_broadband + rng.uniform(-2, 5, shape) * i
+                           + rng.uniform(-3, 3, shape))
+    minority_biz = base_minority_biz + rng.uniform(-1, 2, shape) * i
+    housing_burden = base_housing_burden + rng.uniform(-2, 2, shape) * i
+    early_ed = base_early_ed + rng.uniform(-3, 4, shape) * i
+
+    def score(signal):
+        return np.clip(signal + rng.normal(0, 5, shape), 0, 100)
+
+    place = score(20 + 0.5 * broadband - 0.6 * housing_burden + 0.2 * early_ed)
+    economy = score(10 + 0.0006 * median_income + 1.2 * minority_biz - 0.3 * housing_burden)
+    community = score(30 + 0.5 * early_ed + 0.1 * broadband - 0.2 * housing_burden)
+
+    return pd.DataFrame({
+        'tract': np.repeat(tracts, n_years),
+        'year': np.tile(start_year + np.arange(n_years), n_tracts),
+        'median_income': median_income.ravel(),
+        'broadband_access_pct': broadband.ravel(),
+        'minority_owned_businesses_pct': minority_biz.ravel(),
+        'housing_cost_burden_pct': housing_burden.ravel(),
+        'early_education_enrollment_pct': early_ed.ravel(),
+        'place_score': place.ravel(),
+        'economy_score': economy.ravel(),
+        'community_score': community.ravel(),
+        'igs_score': ((place + economy + community) / 3).ravel(),
+    })
+
+
 def main():
     """
     Main execution function to clean IGS data and create trend features.
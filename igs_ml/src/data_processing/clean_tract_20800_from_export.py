@@ -1,7 +1,9 @@
 import pandas as pd
+from pathlib import Path
 
-# Use the exact absolute path for the CSV file
-src = '/Users/cyrilkups/Desktop/DataDrive Project/Data Drive Datasets/Inclusive Growth Score™ /Inclusive_Growth_Score_Data_Export_21-11-2025_035947 - Compared to Urban-Rural.csv'
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+src = (PROJECT_ROOT / 'Data Drive Datasets' / 'Inclusive Growth Score™ ' /
+       'Inclusive_Growth_Score_Data_Export_21-11-2025_035947 - Compared to Urban-Rural.csv')
 
 # Load the new export CSV, skipping first 3 rows and using the fourth as header
 df = pd.read_csv(src, skiprows=3)
@@ -25,5 +27,5 @@ out = pd.DataFrame({
 
 # Save cleaned output
 out = out.sort_values('year').reset_index(drop=True)
-out.to_csv('tract_20800_cleaned.csv', index=False)
+out.to_csv(PROJECT_ROOT / 'data_cleaned' / 'tract_20800_cleaned.csv', index=False)
 print('✓ tract_20800_cleaned.csv updated with new export data.')
@@ -0,0 +1,119 @@
+"""
+Tract-Year Index
+
+Maps (census tract, year) to a row offset in a panel, built once when the
+panel is loaded. Tract IDs are normalized to the canonical 11-character
+GEOID (state + county + tract, zero-padded), so '5085020800',
+'05085020800', 5085020800 and '05085-020800' all resolve to the same row.
+
+Keys are packed into one int64 (GEOID * 10000 + year) and held in a hash
+index, so a single lookup is O(1) and batch lookups are one vectorized
+get_indexer call instead of a string comparison over the whole table.
+"""
+
+import re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+GEOID_LENGTH = 11
+YEAR_FACTOR = 10_000
+
+# IDs read from CSV as floats ('5085020800.0')
+_FLOAT_SUFFIX = re.compile(r'\.0+$')
+
+
+def normalize_geoid(tracts) -> pd.Series:
+    """
+    Canonical 11-character GEOIDs for tract IDs given as str, int or float.
+
+    Parameters:
+    -----------
+    tracts : scalar or array-like
+        Tract IDs (leading zeros optional, '-' separators allowed)
+
+    Returns:
+    --------
+    pd.Series
+        Zero-padded GEOID strings; None where an ID is not numeric
+    """
+    # Panels repeat each tract once per year: normalize the distinct IDs only
+    codes, uniques = pd.factorize(np.atleast_1d(np.asarray(tracts, dtype=object)))
+    ids = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    ids = ids.str.replace('-', '', regex=False).str.replace(_FLOAT_SUFFIX, '', regex=True)
+    valid = ids.str.fullmatch(r'\d{1,%d}' % GEOID_LENGTH)
+    normalized = ids.str.zfill(GEOID_LENGTH).where(valid, None).to_numpy(dtype=object)
+    return pd.Series(np.where(codes >= 0, normalized[codes], None), dtype=object)
+
+
+def _scalar_key(tract, year) -> Optional[int]:
+    tract = _FLOAT_SUFFIX.sub('', str(tract).strip().replace('-', ''))
+    if not tract.isdigit() or len(tract) > GEOID_LENGTH:
+        return None
+    return int(tract) * YEAR_FACTOR + int(year)
+
+
+def _keys(geoids: pd.Series, years) -> np.ndarray:
+    years = np.broadcast_to(np.asarray(years, dtype=np.int64), (len(geoids),))
+    codes, uniques = pd.factorize(geoids)
+    numeric = np.array([int(g) for g in uniques], dtype=np.int64)
+    keys = np.full(len(geoids), -1, dtype=np.int64)
+    ok = codes >= 0
+    keys[ok] = numeric[codes[ok]] * YEAR_FACTOR + years[ok]
+    return keys
+
+
+class TractYearIndex:
+    """O(1) (tract, year) -> row offset lookups over a tract-year panel."""
+
+    def __init__(self, tracts, years):
+        """
+        Parameters:
+        -----------
+        tracts : array-like
+            Tract ID column of the panel (any format normalize_geoid accepts)
+        years : array-like
+            Year column of the panel
+        """
+        self.geoids = normalize_geoid(tracts)
+        keys = _keys(self.geoids, years)
+        # First occurrence wins for duplicate (tract, year) rows
+        unique_keys, first_rows = np.unique(keys, return_index=True)
+        keep = unique_keys >= 0
+        self._index = pd.Index(unique_keys[keep])
+        self._rows = first_rows[keep]
+        self.tracts = sorted(self.geoids.dropna().unique())
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, tract, year: int) -> Optional[int]:
+        """Row offset of one tract-year, or None if absent."""
+        key = _scalar_key(tract, year)
+        if key is None or key not in self._index:
+            return None
+        return int(self._rows[self._index.get_loc(key)])
+
+    def lookup_many(self, tracts, years) -> np.ndarray:
+        """
+        Row offsets for many tract-years at once.
+
+        Parameters:
+        -----------
+        tracts : array-like
+            Tract IDs (any format normalize_geoid accepts)
+        years : int or array-like
+            Year per tract (or one year for all)
+
+        Returns:
+        --------
+        np.ndarray
+            int64 row offsets, -1 where a tract-year is not in the panel
+        """
+        keys = _keys(normalize_geoid(tracts), years)
+        positions = self._index.get_indexer(keys)
+        found = positions >= 0
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        rows[found] = self._rows[positions[found]]
+        return rows
@@ -0,0 +1,225 @@
+"""
+Fast-Start Model Artifacts
+
+Process-per-request callers (the dashboard's run_policy_simulation.py) spend
+most of their time importing, not predicting: unpickling a
+RandomForestRegressor imports scikit-learn and SciPy (~1.3 s), while the
+prediction itself takes a few milliseconds. This module saves each forest as
+plain NumPy arrays in `{target}_packed.npz`, and loads them back with NumPy
+alone.
+
+The scaler is folded into the exported forest (PackedForest.fold_scaler):
+its thresholds are in raw feature units, so inference needs no
+scaler.transform. Before writing, the export is checked against
+scale-then-predict on rows at both sides of every split threshold plus
+random rows, and refused if any prediction differs.
+
+- export_fast_models() writes the .npz files next to the joblib artifacts
+  (train_augmented_model.py does this after saving the models)
+- load_fast_models() returns (models, scalers, schemas) usable wherever the
+  joblib ones are: models have .predict, and the scalers are None, which
+  scale_features passes through. Each file records the content hash of the
+  model it came from; a stale, missing, or older-format export returns
+  None so callers can fall back to joblib.
+
+Predictions match model.predict on scaled inputs bit for bit.
+
+Usage:
+    python src/modeling/fast_models.py --models-dir igs_plus_more_data/models_augmented
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import FeatureSchema, TARGETS, scale_features  # noqa: E402
+from modeling.model_artifacts import model_hash  # noqa: E402
+from modeling.packed_forest import PackedForest  # noqa: E402
+
+FAST_SUFFIX = '_packed.npz'
+# Bumped when the file layout changes; older exports are treated as stale
+FAST_FORMAT = 2
+_FOREST_FIELDS = ('left', 'right', 'feature', 'threshold', 'value', 'roots')
+
+
+def fast_path(models_dir, target: str) -> Path:
+    return Path(models_dir) / f'{target}{FAST_SUFFIX}'
+
+
+def fold_model(model, scaler) -> PackedForest:
+    """PackedForest of `model` that takes unscaled inputs."""
+    mean = scaler.mean_ if getattr(scaler, 'with_mean', True) else None
+    scale = scaler.scale_ if getattr(scaler, 'with_std', True) else None
+    return PackedForest.from_estimator(model).fold_scaler(mean, scale)
+
+
+def verify_folded(model, scaler, folded: PackedForest, X: Optional[np.ndarray] = None,
+                  n_random: int = 1000, seed: int = 0) -> int:
+    """
+    Check a folded forest against scale_features + model.predict.
+
+    Rows checked: for every split, the scaler's mean row with the split
+    feature set to the folded threshold and to the next float64 above it
+    (the two sides of the split), random rows around the mean, and `X`.
+
+    Raises:
+    -------
+    ValueError
+        If any prediction differs
+
+    Returns:
+    --------
+    int
+        Number of rows checked
+    """
+    n_features = len(scaler.mean_)
+    center = scaler.mean_ if getattr(scaler, 'with_mean', True) else np.zeros(n_features)
+    spread = scaler.scale_ if getattr(scaler, 'with_std', True) else np.ones(n_features)
+
+    internal = np.flatnonzero(folded.left != np.arange(folded.n_nodes))
+    feature, threshold = folded.feature[internal], folded.threshold[internal]
+    boundary = np.tile(center, (2 * len(internal), 1))
+    boundary[np.arange(len(internal)), feature] = threshold
+    boundary[len(internal) + np.arange(len(internal)), feature] = np.nextafter(threshold, np.inf)
+
+    rng = np.random.default_rng(seed)
+    parts = [boundary, center + spread * rng.normal(0, 2, (n_random, n_features))]
+    if X is not None:
+        parts.append(np.asarray(X, dtype=np.float64))
+    rows = np.vstack(parts)
+
+    expected = model.predict(scale_features(scaler, rows))
+    mismatched = int(np.sum(folded.predict(rows) != expected))
+    if mismatched:
+        raise ValueError(f"Folded forest differs from scale-then-predict on "
+                         f"{mismatched} of {len(rows)} rows")
+    return len(rows)
+
+
+def export_fast_model(models_dir, target: str, model=None, scaler=None) -> Path:
+    """
+    Write {target}_packed.npz from a target's joblib model and scaler.
+
+    Parameters:
+    -----------
+    models_dir : str or Path
+        Directory holding the joblib artifacts (the export is written there)
+    target : str
+        Target name
+    model, scaler : optional
+        Already-loaded artifacts (loaded from models_dir if omitted)
+
+    Raises:
+    -------
+    ValueError
+        If the folded forest fails verify_folded (nothing is written)
+    """
+    if model is None or scaler is None:
+        from modeling.model_artifacts import load_pillar_models
+        models, scalers, _ = load_pillar_models(models_dir, [target])
+        model, scaler = models[target], scalers[target]
+
+    forest = fold_model(model, scaler)
+    verify_folded(model, scaler, forest)
+    arrays = {name: getattr(forest, name) for name in _FOREST_FIELDS}
+    arrays.update(
+        max_depth=np.int64(forest.max_depth),
+        n_features=np.int64(forest.n_features),
+        split_dtype=np.array(forest.split_dtype),
+        format=np.int64(FAST_FORMAT),
+        model_hash=np.array(model_hash(models_dir, target)),
+    )
+
+    path = fast_path(models_dir, target)
+    tmp_path = path.with_name(f'.{path.stem}.{os.getpid()}.tmp.npz')
+    try:
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return path
+
+
+def export_fast_models(models_dir, targets: Optional[Sequence[str]] = None,
+                       models=None, scalers=None) -> List[Path]:
+    """Export every target that has a saved model (see export_fast_model)."""
+    models, scalers = models or {}, scalers or {}
+    if targets is None:
+        targets = [t for t in TARGETS if (Path(models_dir) / f'{t}_model.joblib').exists()]
+    return [export_fast_model(models_dir, target, models.get(target), scalers.get(target))
+            for target in targets]
+
+
+def load_fast_model(models_dir, target: str,
+                    check_hash: bool = True) -> Optional[PackedForest]:
+    """
+    Load one exported forest (it takes unscaled inputs).
+
+    Returns:
+    --------
+    PackedForest or None
+        None if the export is missing, in an older format, or was made from
+        a different model than the one now in models_dir
+    """
+    path = fast_path(models_dir, target)
+    if not path.exists():
+        return None
+    with np.load(path) as data:
+        if 'format' not in data or int(data['format']) != FAST_FORMAT:
+            return None
+        if check_hash:
+            try:
+                current = model_hash(models_dir, target)
+            except FileNotFoundError:
+                # Exported artifacts shipped without the joblib files
+                current = None
+            if current is not None and str(data['model_hash']) != current:
+                return None
+        return PackedForest(
+            **{name: data[name] for name in _FOREST_FIELDS},
+            max_depth=int(data['max_depth']),
+            n_features=int(data['n_features']),
+            split_dtype=str(data['split_dtype']),
+        )
+
+
+def load_fast_models(models_dir, targets: Optional[Sequence[str]] = None,
+                     check_hash: bool = True) -> Optional[Tuple[Dict, Dict, Dict]]:
+    """
+    Load exported forests, scalers, and schemas for several targets.
+
+    Returns:
+    --------
+    tuple of dict or None
+        (models, scalers, schemas) keyed by target, scalers all None, or
+        None if any target's export is missing or stale
+    """
+    targets = TARGETS if targets is None else targets
+    models, scalers, schemas = {}, {}, {}
+    for target in targets:
+        models[target] = load_fast_model(models_dir, target, check_hash)
+        if models[target] is None:
+            return None
+        # Scaling is folded into the thresholds
+        scalers[target] = None
+        schemas[target] = FeatureSchema.load(models_dir, target)
+    return models, scalers, schemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export models as NumPy-only fast-start artifacts')
+    parser.add_argument('--models-dir', type=Path, required=True)
+    parser.add_argument('--targets', nargs='+', default=None)
+    args = parser.parse_args()
+
+    for path in export_fast_models(args.models_dir, args.targets):
+        print(f"✓ Exported {path} ({path.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Feature Schema for IGS Prediction Models
+
+Defines the single source of truth for the feature columns each pillar model
+expects, and converts prediction inputs into the contiguous float64 matrix the
+scaler/model pair consumes.
+
+A schema is saved next to every trained model as ``{target}_schema.json``.
+Older model directories without a schema file fall back to the feature names
+recorded by the fitted scaler.
+
+Use this module instead of redefining feature lists in each script:
+    schema = FeatureSchema.load('output/models', 'igs_score')
+    X = schema.to_array(df)            # validated once, model column order
+    preds = model.predict(scale_features(scaler, X))
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Level indicators (raw tract metrics)
+LEVEL_FEATURES = (
+    'median_income',
+    'broadband_access_pct',
+    'minority_owned_businesses_pct',
+    'housing_cost_burden_pct',
+    'early_education_enrollment_pct',
+)
+
+# Year-over-year trend indicators
+TREND_FEATURES = (
+    'income_growth',
+    'broadband_growth',
+    'minority_business_growth',
+    'housing_burden_change',
+    'early_ed_growth',
+)
+
+# Feature set of the baseline tract models (igs_ml/output/models)
+BASE_FEATURES = LEVEL_FEATURES + TREND_FEATURES
+
+# Level indicator -> year-over-year trend feature derived from it
+TREND_OF = dict(zip(LEVEL_FEATURES, TREND_FEATURES))
+
+# Trend features computed as % change (all others are point differences)
+PCT_CHANGE_TRENDS = ('income_growth',)
+
+# IGS status bands used across reports and the dashboard
+DISTRESSED_THRESHOLD = 45.0
+IMPROVING_THRESHOLD = 55.0
+
+TARGETS = ('place_score', 'economy_score', 'community_score', 'igs_score')
+
+# Lagged scores and score changes used by the augmented models
+LAG_FEATURES = tuple(f'{target}_lag1' for target in
+                     ('igs_score', 'place_score', 'economy_score', 'community_score'))
+CHANGE_FEATURES = tuple(f'{target}_change' for target in
+                        ('igs_score', 'place_score', 'economy_score', 'community_score'))
+
+# Feature set of the augmented models (igs_plus_more_data/models_augmented)
+AUGMENTED_FEATURES = BASE_FEATURES + LAG_FEATURES + CHANGE_FEATURES
+
+
+@dataclass(frozen=True)
+class FeatureSchema:
+    """
+    Ordered feature contract for one trained model.
+
+    Attributes:
+    -----------
+    target : str
+        Target variable the model predicts
+    features : tuple of str
+        Feature names in the exact column order the model was trained on
+    fill_values : dict
+        Per-feature values substituted for missing inputs (optional)
+    """
+
+    target: str
+    features: Tuple[str, ...]
+    fill_values: Dict[str, float] = field(default_factory=dict, hash=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'features', tuple(self.features))
+        if len(set(self.features)) != len(self.features):
+            raise ValueError(f"Duplicate features in schema for {self.target}")
+        unknown = set(self.fill_values) - set(self.features)
+        if unknown:
+            raise ValueError(f"Fill values for unknown features: {unknown}")
+        # Column-aligned fill vector (NaN where no fill value is defined)
+        fill = np.array([self.fill_values.get(f, np.nan) for f in self.features],
+                        dtype=np.float64)
+        object.__setattr__(self, '_fill', fill)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.features)
+
+    def index(self, feature: str) -> int:
+        """Return the column position of a feature."""
+        try:
+            return self.features.index(feature)
+        except ValueError:
+            raise KeyError(f"'{feature}' is not a feature of the "
+                           f"{self.target} schema") from None
+
+    def to_array(self, data, fill_missing: bool = False) -> np.ndarray:
+        """
+        Convert prediction inputs into a validated float64 feature matrix.
+
+        Parameters:
+        -----------
+        data : pd.DataFrame, dict, list of dict, or np.ndarray
+            Input rows. DataFrames and dicts are selected by feature name;
+            arrays must already be in schema column order.
+        fill_missing : bool
+            Replace NaN (and, for dicts, absent keys) with the schema's
+            fill values instead of raising
+
+        Returns:
+        --------
+        np.ndarray
+            C-contiguous array of shape (n_rows, n_features)
+        """
+        if isinstance(data, np.ndarray):
+            X = np.array(data, dtype=np.float64, order='C', ndmin=2)
+            if X.ndim != 2 or X.shape[1] != self.n_features:
+                raise ValueError(
+                    f"Expected {self.n_features} columns for {self.target}, "
+                    f"got array of shape {np.shape(data)}")
+        elif isinstance(data, Mapping) or _is_series(data):
+            X = self._rows_to_array([data], fill_missing)
+        elif hasattr(data, 'columns'):
+            missing_features = set(self.features) - set(data.columns)
+            if missing_features:
+                raise ValueError(
+                    f"Missing required features: {missing_features}")
+            X = np.ascontiguousarray(
+                data[list(self.features)].to_numpy(dtype=np.float64))
+        elif isinstance(data, Sequence):
+            X = self._rows_to_array(data, fill_missing)
+        else:
+            raise TypeError(
+                f"Unsupported input type for feature schema: {type(data).__name__}")
+
+        if fill_missing:
+            nan_mask = np.isnan(X)
+            if nan_mask.any():
+                X = np.where(nan_mask, self._fill, X)
+
+        if np.isnan(X).any():
+            bad = [f for f, col in zip(self.features, np.isnan(X).any(axis=0)) if col]
+            raise ValueError(f"Missing values in features: {bad}")
+
+        return X
+
+    def _rows_to_array(self, rows, fill_missing):
+        """Build a matrix from mapping rows without creating a DataFrame."""
+        X = np.empty((len(rows), self.n_features), dtype=np.float64)
+        for i, row in enumerate(rows):
+            missing_features = [f for f in self.features if f not in row]
+            if missing_features and not fill_missing:
+                raise ValueError(
+                    f"Missing required features: {set(missing_features)}")
+            X[i] = [row.get(f, np.nan) for f in self.features]
+        return X
+
+    def to_dict(self) -> dict:
+        return {
+            'target': self.target,
+            'features': list(self.features),
+            'fill_values': {k: float(v) for k, v in self.fill_values.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> 'FeatureSchema':
+        return cls(target=payload['target'],
+                   features=tuple(payload['features']),
+                   fill_values=payload.get('fill_values', {}))
+
+    def save(self, models_dir) -> Path:
+        """Write the schema next to the model as {target}_schema.json."""
+        output_path = Path(models_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        schema_file = output_path / f'{self.target}_schema.json'
+        # Write-then-rename so a running simulator never reads half a schema
+        tmp_path = schema_file.with_name(f'.{schema_file.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, schema_file)
+        return schema_file
+
+    @classmethod
+    def load(cls, models_dir, target: str, scaler=None) -> 'FeatureSchema':
+        """
+        Load the schema saved for a target.
+
+        Falls back to the feature names recorded by the fitted scaler for
+        model directories trained before schemas were saved.
+        """
+        models_path = Path(models_dir)
+        schema_file = models_path / f'{target}_schema.json'
+        if schema_file.exists():
+            with open(schema_file) as f:
+                return cls.from_dict(json.load(f))
+
+        if scaler is None:
+            import joblib  # deferred: fast-start paths never need it
+            scaler = joblib.load(models_path / f'{target}_scaler.joblib')
+        names = getattr(scaler, 'feature_names_in_', None)
+        if names is None:
+            raise FileNotFoundError(
+                f"No schema for {target} in {models_path} and scaler has no feature names")
+        return cls(target=target, features=tuple(str(n) for n in names))
+
+
+def _is_series(data) -> bool:
+    """True for a single labelled row such as a pandas Series."""
+    return hasattr(data, 'index') and hasattr(data, 'get') and not hasattr(data, 'columns')
+
+
+def scale_features(scaler, X: np.ndarray) -> np.ndarray:
+    """
+    Apply a fitted StandardScaler to a schema-ordered array.
+
+    Equivalent to scaler.transform(X) without sklearn's per-call input
+    validation and feature-name checks. A scaler of None (the model has the
+    scaling folded into its thresholds, see fast_models) returns X as is.
+    """
+    if scaler is None:
+        return X
+    X_scaled = X
+    if getattr(scaler, 'with_mean', True) and scaler.mean_ is not None:
+        X_scaled = X_scaled - scaler.mean_
+    if getattr(scaler, 'with_std', True) and scaler.scale_ is not None:
+        X_scaled = X_scaled / scaler.scale_
+    if X_scaled is X:
+        X_scaled = X.copy()
+    return X_scaled
+
+
+def load_schemas(models_dir, targets: Optional[Sequence[str]] = None,
+                 scalers: Optional[Mapping] = None) -> Dict[str, FeatureSchema]:
+    """Load the schema for each target in a model directory."""
+    targets = TARGETS if targets is None else targets
+    scalers = scalers or {}
+    return {target: FeatureSchema.load(models_dir, target, scalers.get(target))
+            for target in targets}
@@ -0,0 +1,173 @@
+"""
+Model Artifact Helpers
+
+Loads the model/scaler/schema triple saved for each target and computes a
+content hash of those files. The hash identifies a trained model version, so
+precomputed results (sensitivity indices, attributions, scenario runs) can be
+cached against it and invalidated automatically after retraining.
+
+Training writes every artifact atomically (dump_artifact) and finishes with
+a manifest of the hashes it wrote, so a reader can tell a complete set of
+artifacts from one that is still being written (see model_watcher.py).
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import FeatureSchema, TARGETS  # noqa: E402
+
+# (path, mtime_ns, size) -> sha256, so unchanged files are hashed once
+_HASH_CACHE: Dict[tuple, str] = {}
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def artifact_paths(models_dir, target: str) -> Dict[str, Path]:
+    """Paths of the model, scaler, and schema files for a target."""
+    models_path = Path(models_dir)
+    return {
+        'model': models_path / f'{target}_model.joblib',
+        'scaler': models_path / f'{target}_scaler.joblib',
+        'schema': models_path / f'{target}_schema.json',
+    }
+
+
+def _file_hash(path: Path) -> str:
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    if key not in _HASH_CACHE:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        _HASH_CACHE[key] = digest.hexdigest()
+    return _HASH_CACHE[key]
+
+
+def model_hash(models_dir, target: str) -> str:
+    """
+    Content hash of a target's model, scaler, and schema files.
+
+    Returns:
+    --------
+    str
+        16-character hex digest identifying the trained model version
+    """
+    digest = hashlib.sha256()
+    for kind, path in artifact_paths(models_dir, target).items():
+        if path.exists():
+            digest.update(kind.encode())
+            digest.update(_file_hash(path).encode())
+        elif kind != 'schema':
+            raise FileNotFoundError(f"Missing {kind} artifact: {path}")
+    return digest.hexdigest()[:16]
+
+
+def models_version(models_dir, targets: Optional[Sequence[str]] = None) -> str:
+    """
+    Combined hash of several targets' model versions.
+
+    Returns:
+    --------
+    str
+        16-character hex digest that changes when any of the models changes
+    """
+    digest = hashlib.sha256()
+    for target in targets or TARGETS:
+        digest.update(f'{target}={model_hash(models_dir, target)};'.encode())
+    return digest.hexdigest()[:16]
+
+
+def load_pillar_models(models_dir, targets: Optional[Sequence[str]] = None
+                       ) -> Tuple[Dict, Dict, Dict[str, FeatureSchema]]:
+    """
+    Load models, scalers, and feature schemas for several targets.
+
+    Parameters:
+    -----------
+    models_dir : str or Path
+        Directory containing {target}_model.joblib / _scaler.joblib
+    targets : list of str
+        Targets to load (defaults to all four pillar scores)
+
+    Returns:
+    --------
+    tuple of dict
+        (models, scalers, schemas), each keyed by target
+    """
+    # Deferred: unpickling the models imports sklearn (~1 s), which the
+    # fast-start paths (fast_models.py) avoid entirely
+    import joblib
+
+    targets = TARGETS if targets is None else targets
+    models, scalers, schemas = {}, {}, {}
+    for target in targets:
+        paths = artifact_paths(models_dir, target)
+        models[target] = joblib.load(paths['model'])
+        scalers[target] = joblib.load(paths['scaler'])
+        schemas[target] = FeatureSchema.load(models_dir, target, scalers[target])
+    return models, scalers, schemas
+
+
+def dump_artifact(obj, path) -> Path:
+    """
+    joblib.dump to a temporary file, then rename it over `path`.
+
+    Readers of `path` see either the old or the new artifact, never a
+    partially written one.
+    """
+    import joblib
+
+    path = Path(path)
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        joblib.dump(obj, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return path
+
+
+def write_manifest(models_dir, targets: Optional[Sequence[str]] = None) -> Path:
+    """
+    Record the hashes of a finished training run in {models_dir}/manifest.json.
+
+    Parameters:
+    -----------
+    models_dir : str or Path
+        Directory the artifacts were saved to
+    targets : list of str, optional
+        Targets to list (default: every pillar target with a saved model)
+
+    Returns:
+    --------
+    Path
+        Manifest file
+    """
+    models_path = Path(models_dir)
+    if targets is None:
+        targets = [t for t in TARGETS if artifact_paths(models_path, t)['model'].exists()]
+    manifest = {
+        'version': models_version(models_path, targets),
+        'targets': {target: model_hash(models_path, target) for target in targets},
+    }
+    manifest_file = models_path / MANIFEST_FILE
+    tmp_path = manifest_file.with_name(f'.{MANIFEST_FILE}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_file)
+    return manifest_file
+
+
+def read_manifest(models_dir) -> Optional[Dict]:
+    """The manifest of the last finished training run, or None if there is none."""
+    try:
+        with open(Path(models_dir) / MANIFEST_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,274 @@
+"""
+Model Watcher
+
+Hot reload of retrained models in long-running simulators and servers.
+Retraining rewrites `{target}_model.joblib` in place, and a process that
+loaded the models earlier keeps serving the old objects. A ModelWatcher
+polls the models directory and, when the artifacts change:
+1. Waits until the new set is complete: the training run's manifest lists
+   the current file hashes, or (without a manifest) the hashes are the same
+   on two consecutive polls
+2. Loads the new models in its own thread, and checks that the file hashes
+   did not change while loading
+3. Verifies them on a canary input set (finite predictions inside the score
+   range) and logs how far the canary predictions moved
+4. Runs `prepare` so caches built from the models (Monte Carlo forests,
+   TreeSHAP tables) exist before the swap, not on the next request
+5. Swaps the new ModelBundle in with one reference assignment
+
+Readers take `watcher.bundle` (or their own copy of it) once per request,
+so in-flight requests finish on the models they started with and never mix
+two versions. Polling is cheap: file hashes are cached by (mtime, size).
+
+Usage:
+    watcher = ModelWatcher(models_dir, canary=rows, on_swap=install)
+    watcher.start()                 # background thread
+    ...
+    bundle = watcher.bundle         # current models, scalers, schemas
+"""
+
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import TARGETS, scale_features  # noqa: E402
+from modeling.model_artifacts import (  # noqa: E402
+    load_pillar_models, model_hash, models_version, read_manifest)
+
+# All four pillar scores are 0-100 indices
+SCORE_RANGE = (0.0, 100.0)
+DEFAULT_INTERVAL = 5.0
+
+
+class ModelVerificationError(ValueError):
+    """A candidate model set failed its canary check."""
+
+
+@dataclass
+class ModelBundle:
+    """
+    One loaded version of the pillar models.
+
+    `cache` holds objects derived from these models (built by `prepare` or
+    on first use), so they are swapped together with the models.
+    """
+    models: Dict
+    scalers: Dict
+    schemas: Dict
+    version: str
+    hashes: Dict[str, str]
+    loaded_at: float = field(default_factory=time.time)
+    cache: Dict = field(default_factory=dict)
+
+    @property
+    def targets(self):
+        return list(self.models)
+
+    def predict(self, rows) -> Dict[str, np.ndarray]:
+        """Predict every target for some rows (any FeatureSchema.to_array input)."""
+        arrays = {}
+        predictions = {}
+        for target, model in self.models.items():
+            schema = self.schemas[target]
+            if schema.features not in arrays:
+                arrays[schema.features] = schema.to_array(rows)
+            predictions[target] = model.predict(
+                scale_features(self.scalers[target], arrays[schema.features]))
+        return predictions
+
+
+def _hashes(models_dir, targets) -> Dict[str, str]:
+    return {target: model_hash(models_dir, target) for target in targets}
+
+
+def load_bundle(models_dir, targets: Optional[Sequence[str]] = None,
+                retries: int = 3) -> ModelBundle:
+    """
+    Load a consistent set of models, scalers, and schemas.
+
+    The artifact hashes are taken before and after loading; if they differ,
+    a training run wrote files in between and the load is retried.
+
+    Raises:
+    -------
+    RuntimeError
+        If the artifacts kept changing for every attempt
+    """
+    targets = list(TARGETS if targets is None else targets)
+    for _ in range(retries):
+        before = _hashes(models_dir, targets)
+        models, scalers, schemas = load_pillar_models(models_dir, targets)
+        if _hashes(models_dir, targets) == before:
+            return ModelBundle(models, scalers, schemas,
+                               models_version(models_dir, targets), before)
+        time.sleep(0.5)
+    raise RuntimeError(f"Artifacts in {models_dir} changed during every load attempt")
+
+
+def verify_bundle(bundle: ModelBundle, canary, score_range: Tuple[float, float] = SCORE_RANGE
+                  ) -> Dict[str, np.ndarray]:
+    """
+    Predict the canary rows and check the results.
+
+    Raises:
+    -------
+    ModelVerificationError
+        If a target's predictions are missing, non-finite, or out of range
+
+    Returns:
+    --------
+    dict
+        Target -> canary predictions
+    """
+    try:
+        predictions = bundle.predict(canary)
+    except Exception as exc:
+        raise ModelVerificationError(f"canary prediction failed: {exc}") from exc
+    low, high = score_range
+    for target, values in predictions.items():
+        if not np.all(np.isfinite(values)):
+            raise ModelVerificationError(f"{target}: non-finite canary predictions")
+        if values.min() < low or values.max() > high:
+            raise ModelVerificationError(
+                f"{target}: canary predictions {values.min():.2f}..{values.max():.2f} "
+                f"outside {low:g}..{high:g}")
+    return predictions
+
+
+class ModelWatcher:
+    """
+    Poll a models directory and hot-swap verified new model versions.
+
+    Parameters:
+    -----------
+    models_dir : str or Path
+        Directory with {target}_model.joblib / _scaler.joblib / _schema.json
+    targets : list of str, optional
+        Targets to load (default: all four pillar scores)
+    canary : pd.DataFrame, list of dict, or np.ndarray
+        Rows every new version must predict before it is swapped in
+    bundle : ModelBundle, optional
+        Already-loaded current version (loaded now if omitted)
+    interval : float
+        Seconds between polls of the background thread
+    prepare : callable, optional
+        prepare(new_bundle, old_bundle), run in the watcher thread before
+        the swap to fill new_bundle.cache
+    on_swap : callable, optional
+        on_swap(new_bundle, old_bundle), called right after the swap
+    """
+
+    def __init__(self, models_dir, targets: Optional[Sequence[str]] = None, canary=None,
+                 bundle: Optional[ModelBundle] = None, interval: float = DEFAULT_INTERVAL,
+                 prepare: Optional[Callable] = None, on_swap: Optional[Callable] = None,
+                 score_range: Tuple[float, float] = SCORE_RANGE):
+        self.models_dir = Path(models_dir)
+        self.targets = list(TARGETS if targets is None else targets)
+        self.canary = canary
+        self.interval = interval
+        self.prepare = prepare
+        self.on_swap = on_swap
+        self.score_range = score_range
+        self.bundle = bundle if bundle is not None else load_bundle(self.models_dir, self.targets)
+        self.rejected: Dict[str, str] = {}
+        self._seen: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _candidate(self) -> Optional[str]:
+        """Version on disk if it is new, complete, and not already rejected."""
+        try:
+            version = models_version(self.models_dir, self.targets)
+        except FileNotFoundError:
+            # An artifact is being replaced or the directory is incomplete
+            return None
+        if version == self.bundle.version or version in self.rejected:
+            return None
+        manifest = read_manifest(self.models_dir)
+        if manifest is not None:
+            listed = manifest.get('targets', {})
+            complete = all(listed.get(target) == model_hash(self.models_dir, target)
+                           for target in self.targets)
+        else:
+            # No manifest: accept once the files stop changing between polls
+            complete = version == self._seen
+        self._seen = version
+        return version if complete else None
+
+    def poll(self, force: bool = False) -> bool:
+        """
+        Check the directory once; load, verify, and swap in a new version.
+
+        Parameters:
+        -----------
+        force : bool
+            Load now, without waiting for a manifest or stable hashes
+            (e.g. on an operator's reload signal)
+
+        Returns:
+        --------
+        bool
+            True if a new version was swapped in
+        """
+        with self._lock:
+            if not force and self._candidate() is None:
+                return False
+            try:
+                bundle = load_bundle(self.models_dir, self.targets)
+            except Exception as exc:
+                print(f"  ! Model reload failed, keeping {self.bundle.version}: {exc}")
+                return False
+            if bundle.version == self.bundle.version:
+                return False
+
+            if self.canary is not None:
+                try:
+                    new = verify_bundle(bundle, self.canary, self.score_range)
+                except ModelVerificationError as exc:
+                    self.rejected[bundle.version] = str(exc)
+                    print(f"  ! Rejected model version {bundle.version}: {exc}")
+                    return False
+                old = self.bundle.predict(self.canary)
+                drift = max(float(np.max(np.abs(new[t] - old[t])))
+                            for t in new if t in old) if old else 0.0
+                print(f"  ✓ Model version {bundle.version} passed canary "
+                      f"(max change {drift:.2f} points)")
+
+            old_bundle = self.bundle
+            if self.prepare is not None:
+                self.prepare(bundle, old_bundle)
+            self.bundle = bundle
+            print(f"✓ Swapped models {old_bundle.version} -> {bundle.version}")
+            if self.on_swap is not None:
+                self.on_swap(bundle, old_bundle)
+            return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                # A bad poll must not kill the watcher; the old models keep serving
+                traceback.print_exc()
+
+    def start(self) -> 'ModelWatcher':
+        """Poll in a daemon thread every `interval` seconds."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='model-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
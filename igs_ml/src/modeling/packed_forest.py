@@ -0,0 +1,225 @@
+"""
+Packed Random Forest Evaluator
+
+Flattens the trees of a fitted RandomForestRegressor into a single set of
+node arrays so the whole forest can be evaluated with vectorized NumPy
+traversal instead of one Python-level call per tree.
+
+Leaf nodes point to themselves and carry an infinite threshold, so a fixed
+number of traversal steps (the forest's max depth) lands every (row, tree)
+pair on its leaf without per-step branching.
+
+Splits follow scikit-learn's convention: inputs are compared as float32 and
+go left when ``x[feature] <= threshold``, so results match ``model.predict``.
+
+fold_scaler() moves a StandardScaler into the thresholds: the folded forest
+takes raw inputs and compares them in float64 against raw-space thresholds
+chosen so every input takes the same branch as scale-then-predict.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PackedForest:
+    """
+    Flat node arrays for every tree in a forest.
+
+    Attributes:
+    -----------
+    left, right : np.ndarray
+        Global child node ids (leaves point to themselves)
+    feature : np.ndarray
+        Split feature per node (0 for leaves)
+    threshold : np.ndarray
+        Split threshold per node (+inf for leaves)
+    value : np.ndarray
+        Node prediction value
+    roots : np.ndarray
+        Global id of each tree's root node
+    max_depth : int
+        Deepest root-to-leaf path in the forest
+    n_features : int
+        Number of input features
+    split_dtype : str
+        Precision inputs are compared in: 'float32' like scikit-learn, or
+        'float64' for a forest with a folded-in scaler
+    """
+
+    left: np.ndarray
+    right: np.ndarray
+    feature: np.ndarray
+    threshold: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    max_depth: int
+    n_features: int
+    split_dtype: str = 'float32'
+
+    @classmethod
+    def from_estimator(cls, model) -> 'PackedForest':
+        """Pack a fitted RandomForestRegressor (or single regression tree)."""
+        if isinstance(model, cls):
+            # Already packed (e.g. loaded by fast_models.load_fast_models)
+            return model
+        estimators = getattr(model, 'estimators_', [model])
+        lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in estimators:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes)
+            is_leaf = tree.children_left == -1
+
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            values.append(tree.value.reshape(n_nodes, -1)[:, 0])
+            roots.append(offset)
+
+            max_depth = max(max_depth, tree.max_depth)
+            offset += n_nodes
+
+        return cls(
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=int(max_depth),
+            n_features=int(getattr(model, 'n_features_in_', 0)),
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.value)
+
+    def _traverse(self, X: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        """Walk node ids (n_rows, k) down to their leaves."""
+        X = np.asarray(X, dtype=self.split_dtype)
+        rows = np.arange(X.shape[0]).reshape(-1, *([1] * (nodes.ndim - 1)))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def apply(self, X: np.ndarray, chunk_size: int = 4096) -> np.ndarray:
+        """
+        Leaf node id of every row in every tree.
+
+        Returns:
+        --------
+        np.ndarray
+            Global leaf ids of shape (n_rows, n_trees)
+        """
+        X = np.asarray(X)
+        leaves = np.empty((X.shape[0], self.n_trees), dtype=np.intp)
+        for start in range(0, X.shape[0], chunk_size):
+            stop = min(start + chunk_size, X.shape[0])
+            nodes = np.broadcast_to(self.roots, (stop - start, self.n_trees))
+            leaves[start:stop] = self._traverse(X[start:stop], nodes)
+        return leaves
+
+    def predict_trees(self, X: np.ndarray, chunk_size: int = 4096) -> np.ndarray:
+        """Per-tree predictions of shape (n_rows, n_trees)."""
+        return self.value[self.apply(X, chunk_size)]
+
+    def predict(self, X: np.ndarray, chunk_size: int = 4096) -> np.ndarray:
+        """Forest mean prediction (same as model.predict)."""
+        return self.average_trees(self.predict_trees(X, chunk_size))
+
+    @staticmethod
+    def average_trees(per_tree: np.ndarray) -> np.ndarray:
+        """Mean over trees of (n_rows, n_trees) predictions, as model.predict does."""
+        # Sum tree by tree like scikit-learn, so results match to the last bit
+        # (a pairwise .mean(axis=1) differs by ~1e-14)
+        total = np.zeros(per_tree.shape[0])
+        for column in per_tree.T:
+            total += column
+        return total / per_tree.shape[1]
+
+    def predict_sampled(self, X: np.ndarray, tree_idx: np.ndarray) -> np.ndarray:
+        """
+        Predict each row with one chosen tree.
+
+        Parameters:
+        -----------
+        X : np.ndarray
+            Scaled inputs of shape (n_rows, n_features)
+        tree_idx : np.ndarray
+            Tree index per row, shape (n_rows,)
+
+        Returns:
+        --------
+        np.ndarray
+            Prediction of tree ``tree_idx[i]`` for row ``i``
+        """
+        nodes = self.roots[np.asarray(tree_idx, dtype=np.intp)]
+        return self.value[self._traverse(X, nodes)]
+
+    def fold_scaler(self, mean: Optional[np.ndarray] = None,
+                    scale: Optional[np.ndarray] = None) -> 'PackedForest':
+        """
+        Forest that takes raw inputs instead of StandardScaler output.
+
+        Each split's new threshold is the largest float64 x with
+        ``float32((x - mean) / scale) <= threshold``, the test the original
+        forest applies after scale_features. That test is monotone in x, so
+        the largest such x is found by bisecting float64 bit patterns, and
+        raw inputs compared in float64 take exactly the original branches.
+
+        Parameters:
+        -----------
+        mean, scale : np.ndarray, optional
+            Scaler's mean_ and scale_ (None when it does not center/scale)
+        """
+        if self.split_dtype != 'float32':
+            raise ValueError("Forest already takes raw inputs")
+        internal = np.flatnonzero(self.left != np.arange(self.n_nodes))
+        feature = self.feature[internal]
+        m = 0.0 if mean is None else np.asarray(mean, dtype=np.float64)[feature]
+        s = 1.0 if scale is None else np.asarray(scale, dtype=np.float64)[feature]
+        threshold = self.threshold[internal]
+
+        def goes_left(x):
+            with np.errstate(over='ignore'):
+                return ((x - m) / s).astype(np.float32) <= threshold
+
+        # goes_left(lo) holds and goes_left(hi) fails throughout
+        lo = np.full(len(internal), _ordered_bits(-np.inf))
+        hi = np.full(len(internal), _ordered_bits(np.inf))
+        for _ in range(65):
+            mid = (lo >> 1) + (hi >> 1) + (lo & hi & 1)
+            left = goes_left(_from_ordered_bits(mid))
+            lo = np.where(left, mid, lo)
+            hi = np.where(left, hi, mid)
+
+        folded = self.threshold.copy()
+        folded[internal] = _from_ordered_bits(lo)
+        return replace(self, threshold=folded, split_dtype='float64')
+
+
+_SIGN_MASK = np.int64(0x7FFFFFFFFFFFFFFF)
+
+
+def _ordered_bits(x) -> np.ndarray:
+    """float64 -> int64 with the same ordering (negative floats flipped)."""
+    bits = np.asarray(x, dtype=np.float64).view(np.int64)
+    return bits ^ ((bits >> 63) & _SIGN_MASK)
+
+
+def _from_ordered_bits(ordered: np.ndarray) -> np.ndarray:
+    """Inverse of _ordered_bits."""
+    ordered = np.asarray(ordered, dtype=np.int64)
+    return (ordered ^ ((ordered >> 63) & _SIGN_MASK)).view(np.float64)
@@ -0,0 +1,185 @@
+"""
+Permutation Feature Importance for the Pillar Models
+
+Impurity importances (feature_importances_) favor continuous,
+high-cardinality inputs such as median_income. Permutation importance instead
+measures how much holdout R² drops when one feature's values are shuffled,
+breaking its link to the target.
+
+The holdout matrix is scaled once; since StandardScaler is a per-column
+affine map, shuffling a scaled column is the same as scaling a shuffled one.
+All repeats for a feature are stacked into one prediction batch, and features
+are spread across a process pool when n_jobs > 1.
+
+Results are stored next to the impurity importances as
+{target}_permutation_importance.csv, tagged with the model hash so callers
+(e.g. generate_key_findings.py) read cached numbers until the model changes.
+"""
+
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import r2_score
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import scale_features  # noqa: E402
+from modeling.model_artifacts import artifact_paths, load_pillar_models, model_hash  # noqa: E402
+
+# Worker-side state, set once per process by _init_worker
+_WORKER = {}
+
+
+def _init_worker(model_path: str, X_scaled: np.ndarray, y: np.ndarray):
+    model = joblib.load(model_path)
+    if hasattr(model, 'n_jobs'):
+        # Parallelism comes from the pool; avoid oversubscribing cores
+        model.n_jobs = 1
+    _WORKER.update(model=model, X=X_scaled, y=y)
+
+
+def _shuffle_scores(model, X_scaled: np.ndarray, y: np.ndarray, column: int,
+                    n_repeats: int, seed: int) -> np.ndarray:
+    """Holdout R² for each of n_repeats shuffles of one column."""
+    rng = np.random.default_rng(seed)
+    n_rows = X_scaled.shape[0]
+    batch = np.tile(X_scaled, (n_repeats, 1))
+    for r in range(n_repeats):
+        batch[r * n_rows:(r + 1) * n_rows, column] = rng.permutation(X_scaled[:, column])
+    predictions = model.predict(batch).reshape(n_repeats, n_rows)
+    return np.array([r2_score(y, p) for p in predictions])
+
+
+def _worker_scores(args) -> np.ndarray:
+    column, n_repeats, seed = args
+    return _shuffle_scores(_WORKER['model'], _WORKER['X'], _WORKER['y'],
+                           column, n_repeats, seed)
+
+
+def permutation_importance(model, scaler, X: np.ndarray, y: np.ndarray,
+                           feature_names: Sequence[str], n_repeats: int = 20,
+                           seed: int = 42, n_jobs: int = 1,
+                           model_path: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Drop in holdout R² when each feature is shuffled.
+
+    Parameters:
+    -----------
+    model : RandomForestRegressor
+        Trained model
+    scaler : StandardScaler
+        Scaler fitted for the model
+    X : np.ndarray
+        Unscaled holdout features in model column order
+    y : np.ndarray
+        Holdout target values
+    feature_names : list of str
+        Column names of X
+    n_repeats : int
+        Shuffles per feature
+    seed : int
+        Base random seed (feature i uses seed + i)
+    n_jobs : int
+        Worker processes (1 = in-process); requires model_path when > 1
+    model_path : Path
+        Saved model file loaded by each worker
+
+    Returns:
+    --------
+    pd.DataFrame
+        feature, importance (mean R² drop), importance_std, sorted descending
+    """
+    X_scaled = scale_features(scaler, np.asarray(X, dtype=np.float64))
+    y = np.asarray(y, dtype=np.float64)
+    baseline = r2_score(y, model.predict(X_scaled))
+    tasks = [(column, n_repeats, seed + column) for column in range(X_scaled.shape[1])]
+
+    if n_jobs == 1:
+        scores = [_shuffle_scores(model, X_scaled, y, *task) for task in tasks]
+    else:
+        if model_path is None:
+            raise ValueError("model_path is required when n_jobs > 1")
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(str(model_path), X_scaled, y)) as pool:
+            scores = list(pool.map(_worker_scores, tasks))
+
+    drops = baseline - np.vstack(scores)
+    return pd.DataFrame({
+        'feature': list(feature_names),
+        'importance': drops.mean(axis=1),
+        'importance_std': drops.std(axis=1),
+    }).sort_values('importance', ascending=False, ignore_index=True)
+
+
+def holdout_split(df: pd.DataFrame, features: Sequence[str], target: str,
+                  test_size: float = 0.2, random_state: int = 42):
+    """The 20% test split used by train_ml_model.py (same seed and row order)."""
+    _, X_test = train_test_split(df[list(features)], test_size=test_size,
+                                 random_state=random_state)
+    _, y_test = train_test_split(df[target], test_size=test_size,
+                                 random_state=random_state)
+    return X_test.to_numpy(dtype=np.float64), y_test.to_numpy(dtype=np.float64)
+
+
+def importance_path(models_dir, target: str) -> Path:
+    return Path(models_dir) / f'{target}_permutation_importance.csv'
+
+
+def save_permutation_importance(importance_df: pd.DataFrame, models_dir,
+                                target: str) -> Path:
+    """Write results tagged with the current model hash."""
+    output = importance_df.copy()
+    output['model_hash'] = model_hash(models_dir, target)
+    path = importance_path(models_dir, target)
+    output.to_csv(path, index=False)
+    return path
+
+
+def load_permutation_importance(models_dir, target: str, data: Optional[pd.DataFrame] = None,
+                                n_repeats: int = 20, n_jobs: int = 1,
+                                force: bool = False) -> pd.DataFrame:
+    """
+    Cached permutation importance, recomputed only when the model changed.
+
+    Parameters:
+    -----------
+    models_dir : str or Path
+        Directory with the saved model artifacts
+    target : str
+        Target model
+    data : pd.DataFrame
+        Training data to rebuild the holdout split from (only needed when
+        the cache is missing or stale)
+    n_repeats, n_jobs : int
+        Passed to permutation_importance on a cache miss
+    force : bool
+        Recompute even if the cache is valid
+
+    Returns:
+    --------
+    pd.DataFrame
+        feature, importance, importance_std
+    """
+    path = importance_path(models_dir, target)
+    current_hash = model_hash(models_dir, target)
+    if not force and path.exists():
+        cached = pd.read_csv(path)
+        if 'model_hash' in cached and (cached['model_hash'].astype(str) == current_hash).all():
+            return cached.drop(columns='model_hash')
+
+    if data is None:
+        raise FileNotFoundError(f"No current permutation importance for {target} "
+                                f"and no data to compute it from")
+    models, scalers, schemas = load_pillar_models(models_dir, [target])
+    X, y = holdout_split(data, schemas[target].features, target)
+    importance_df = permutation_importance(
+        models[target], scalers[target], X, y, schemas[target].features,
+        n_repeats=n_repeats, n_jobs=n_jobs,
+        model_path=artifact_paths(models_dir, target)['model'])
+    save_permutation_importance(importance_df, models_dir, target)
+    return importance_df
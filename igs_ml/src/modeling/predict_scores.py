@@ -7,17 +7,43 @@ This script demonstrates how to:
 3. Load feature importance for interpretation
 
 Use this script to make predictions after training models with train_ml_model.py
+
+The `score` command streams a whole tract-year panel (CSV or Parquet)
+through all four models in fixed-size chunks:
+    python src/modeling/predict_scores.py score panel.csv -o scores.csv --jobs 4
+    python src/modeling/predict_scores.py score panel.parquet -o scores.parquet --interval 0.9
 """
 
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 import joblib
 from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import FeatureSchema, BASE_FEATURES, TARGETS, scale_features  # noqa: E402
+from modeling.model_artifacts import load_pillar_models  # noqa: E402
+from modeling.fast_models import fold_model  # noqa: E402
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+MODELS_DIR = BASE_DIR / 'output' / 'models'
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+ID_COLUMNS = ('tract', 'year')
+
+# Scoring state, loaded once per process by _init_scorer
+_WORKER: Dict = {}
 
 
 def load_model_artifacts(target_name, models_dir='models'):
     """
-    Load trained model, scaler, and feature importance for a target.
+    Load trained model, scaler, feature schema, and feature importance for a target.
 
     Parameters:
     -----------
@@ -29,7 +55,7 @@ def load_model_artifacts(target_name, models_dir='models'):
     Returns:
     --------
     dict
-        Dictionary containing model, scaler, and feature importance
+        Dictionary containing model, scaler, schema, and feature importance
     """
     models_path = Path(models_dir)
 
@@ -43,6 +69,10 @@ def load_model_artifacts(target_name, models_dir='models'):
     scaler = joblib.load(scaler_file)
     print(f"✓ Loaded scaler: {scaler_file}")
 
+    # Load feature schema (falls back to the scaler's feature names)
+    schema = FeatureSchema.load(models_path, target_name, scaler)
+    print(f"✓ Loaded schema: {schema.n_features} features")
+
     # Load feature importance
     importance_file = models_path / f'{target_name}_feature_importance.csv'
     feature_importance = pd.read_csv(importance_file)
@@ -51,43 +81,32 @@ def load_model_artifacts(target_name, models_dir='models'):
     return {
         'model': model,
         'scaler': scaler,
+        'schema': schema,
         'feature_importance': feature_importance
     }
 
 
-def prepare_prediction_features(df):
+def prepare_prediction_features(df, schema=None):
     """
     Prepare features for prediction (same as training).
 
     Parameters:
     -----------
-    df : pd.DataFrame
-        Input dataframe with required columns
+    df : pd.DataFrame, dict, or np.ndarray
+        Input data with required columns
+    schema : FeatureSchema
+        Feature schema of the model (optional; defaults to the 10 base features)
 
     Returns:
     --------
-    pd.DataFrame
-        Feature matrix ready for prediction
+    np.ndarray
+        Contiguous float64 feature matrix in the model's column order
     """
-    required_features = [
-        'median_income',
-        'broadband_access_pct',
-        'minority_owned_businesses_pct',
-        'housing_cost_burden_pct',
-        'early_education_enrollment_pct',
-        'income_growth',
-        'broadband_growth',
-        'minority_business_growth',
-        'housing_burden_change',
-        'early_ed_growth'
-    ]
+    if schema is None:
+        schema = FeatureSchema(target='igs_score', features=BASE_FEATURES)
 
-    # Check if all required features are present
-    missing_features = set(required_features) - set(df.columns)
-    if missing_features:
-        raise ValueError(f"Missing required features: {missing_features}")
-
-    return df[required_features].copy()
+    # Validates that all required features are present
+    return schema.to_array(df)
 
 
 def predict_score(data, target_name, models_dir='models'):
@@ -96,8 +115,8 @@ def predict_score(data, target_name, models_dir='models'):
 
     Parameters:
     -----------
-    data : pd.DataFrame
-        Input data with required features
+    data : pd.DataFrame or np.ndarray
+        Input data with required features (arrays must be in schema order)
     target_name : str
         Target to predict ('place_score', 'economy_score', 'community_score', 'igs_score')
     models_dir : str
@@ -114,10 +133,10 @@ def predict_score(data, target_name, models_dir='models'):
     scaler = artifacts['scaler']
 
     # Prepare features
-    X = prepare_prediction_features(data)
+    X = prepare_prediction_features(data, artifacts['schema'])
 
     # Scale features
-    X_scaled = scaler.transform(X)
+    X_scaled = scale_features(scaler, X)
 
     # Make predictions
     predictions = model.predict(X_scaled)
@@ -143,7 +162,7 @@ def predict_all_scores(data, models_dir='models'):
     pd.DataFrame
         DataFrame with predictions for all targets
     """
-    targets = ['place_score', 'economy_score', 'community_score', 'igs_score']
+    targets = list(TARGETS)
 
     print("="*60)
     print("PREDICTING ALL IGS SCORES")
@@ -188,6 +207,223 @@ def display_feature_importance(target_name, models_dir='models', top_n=10):
     return feature_importance
 
 
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet input/output requires pyarrow (pip install pyarrow)") from None
+    return pq
+
+
+def _init_scorer(models_dir: str, targets: Sequence[str], interval: Optional[float],
+                 fill_missing: bool):
+    models, scalers, schemas = load_pillar_models(models_dir, targets)
+    for model in models.values():
+        if hasattr(model, 'n_jobs'):
+            # Parallelism comes from the chunk pool; avoid oversubscribing cores
+            model.n_jobs = 1
+    _WORKER.update(models=models, scalers=scalers, schemas=schemas, interval=interval,
+                   fill_missing=fill_missing)
+    if interval:
+        # Scalers folded into the thresholds: the forests take raw features
+        _WORKER['forests'] = {target: fold_model(model, scalers[target])
+                              for target, model in models.items()}
+
+
+def score_chunk(start: int, chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Predict every loaded target for one chunk (run inside a scorer process).
+
+    Parameters:
+    -----------
+    start : int
+        Row offset of the chunk in the input (for error messages)
+    chunk : pd.DataFrame
+        Id columns plus the schema features
+
+    Returns:
+    --------
+    pd.DataFrame
+        Id columns, predicted_{target} and, with an interval,
+        {target}_lower / {target}_upper from the spread of the forest's trees
+    """
+    out = chunk[[c for c in ID_COLUMNS if c in chunk]].reset_index(drop=True)
+    interval = _WORKER['interval']
+    if _WORKER['fill_missing']:
+        # Absent feature columns become NaN, which to_array then fills
+        features = dict.fromkeys(f for schema in _WORKER['schemas'].values()
+                                 for f in schema.features)
+        absent = [f for f in features if f not in chunk]
+        if absent:
+            chunk = chunk.assign(**{f: np.nan for f in absent})
+    for target, model in _WORKER['models'].items():
+        try:
+            X = _WORKER['schemas'][target].to_array(chunk, _WORKER['fill_missing'])
+        except ValueError as error:
+            raise ValueError(f"Rows {start}-{start + len(chunk) - 1}: {error}") from None
+        if interval:
+            per_tree = _WORKER['forests'][target].predict_trees(X)
+            alpha = (1 - interval) / 2
+            out[f'predicted_{target}'] = per_tree.mean(axis=1)
+            out[f'{target}_lower'], out[f'{target}_upper'] = np.quantile(
+                per_tree, [alpha, 1 - alpha], axis=1)
+        else:
+            out[f'predicted_{target}'] = model.predict(
+                scale_features(_WORKER['scalers'][target], X))
+    return out
+
+
+def iter_input_chunks(path, columns: Sequence[str], chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Read only `columns` (those present) from a CSV or Parquet file, chunk by chunk."""
+    path = Path(path)
+    wanted = set(columns)
+    if path.suffix in PARQUET_SUFFIXES:
+        parquet = _require_pyarrow().ParquetFile(path)
+        present = [c for c in parquet.schema_arrow.names if c in wanted]
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=present):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=lambda c: c in wanted,
+                               dtype={'tract': str})
+
+
+def _input_columns(path) -> list:
+    path = Path(path)
+    if path.suffix in PARQUET_SUFFIXES:
+        return list(_require_pyarrow().ParquetFile(path).schema_arrow.names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+class ChunkWriter:
+    """Appends scored chunks to a CSV (or '-' for stdout) or Parquet file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet = None
+        self._header = True
+        if path != '-':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, frame: pd.DataFrame):
+        if self.path != '-' and Path(self.path).suffix in PARQUET_SUFFIXES:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = _require_pyarrow().ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            frame.to_csv(sys.stdout if self.path == '-' else self.path,
+                         mode='w' if self._header else 'a', header=self._header, index=False)
+        self._header = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def score_file(input_path, output_path, models_dir=MODELS_DIR,
+               targets: Optional[Sequence[str]] = None, chunk_size: int = 50_000,
+               jobs: Optional[int] = None, interval: Optional[float] = None,
+               fill_missing: bool = False) -> Dict[str, float]:
+    """
+    Stream a tract-year panel through the pillar models.
+
+    Chunks are scored by a process pool and written in input order. At most
+    2 x jobs chunks are in flight, so memory stays flat however large the
+    input is.
+
+    Parameters:
+    -----------
+    input_path : str or Path
+        CSV or Parquet file with the schema features (plus tract/year)
+    output_path : str or Path
+        CSV or Parquet output ('-' writes CSV to stdout)
+    models_dir : str or Path
+        Directory containing saved models
+    targets : list of str
+        Targets to predict (defaults to all four pillar scores)
+    chunk_size : int
+        Rows per chunk
+    jobs : int
+        Scorer processes (default: CPU count; 1 scores in-process)
+    interval : float
+        Also write {target}_lower/_upper bounds covering this share of the
+        forest's per-tree predictions (e.g. 0.9)
+    fill_missing : bool
+        Fill NaN features, and feature columns absent from the file, with the
+        schema's fill values instead of failing
+
+    Returns:
+    --------
+    dict
+        rows, chunks, seconds, rows_per_second
+    """
+    targets = list(TARGETS if targets is None else targets)
+    if interval is not None and not 0 < interval < 1:
+        raise ValueError("interval must be between 0 and 1")
+    log = (lambda *a: print(*a, file=sys.stderr)) if output_path == '-' else print
+
+    # Validate the header against the schemas before reading any rows
+    schemas = {target: FeatureSchema.load(models_dir, target) for target in targets}
+    features = list(dict.fromkeys(f for schema in schemas.values() for f in schema.features))
+    missing = [f for f in features if f not in set(_input_columns(input_path))]
+    if missing and not fill_missing:
+        raise ValueError(f"{input_path} is missing required features: {missing}")
+    unfillable = [f for f in missing
+                  if any(f in schema.features and f not in schema.fill_values
+                         for schema in schemas.values())]
+    if unfillable:
+        raise ValueError(f"{input_path} is missing features without fill values: {unfillable}")
+    if missing:
+        log(f"  ⚠ Filling absent columns with schema fill values: {missing}")
+
+    jobs = jobs or os.cpu_count() or 1
+    log(f"Scoring {input_path} with {len(targets)} models "
+        f"({chunk_size:,} rows/chunk, {jobs} process{'es' if jobs > 1 else ''})")
+    chunks = iter_input_chunks(input_path, list(ID_COLUMNS) + features, chunk_size)
+    initargs = (str(models_dir), targets, interval, fill_missing)
+    writer = ChunkWriter(output_path)
+    rows = n_chunks = 0
+    start_time = time.perf_counter()
+
+    def record(scored):
+        nonlocal rows, n_chunks
+        writer.write(scored)
+        rows += len(scored)
+        n_chunks += 1
+        if n_chunks % 10 == 0:
+            log(f"  {rows:,} rows ({rows / (time.perf_counter() - start_time):,.0f} rows/s)")
+
+    try:
+        if jobs == 1:
+            _init_scorer(*initargs)
+            offset = 0
+            for chunk in chunks:
+                record(score_chunk(offset, chunk))
+                offset += len(chunk)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_scorer,
+                                     initargs=initargs) as pool:
+                pending, offset = deque(), 0
+                for chunk in chunks:
+                    pending.append(pool.submit(score_chunk, offset, chunk))
+                    offset += len(chunk)
+                    if len(pending) >= 2 * jobs:
+                        record(pending.popleft().result())
+                while pending:
+                    record(pending.popleft().result())
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - start_time
+    stats = {'rows': rows, 'chunks': n_chunks, 'seconds': seconds,
+             'rows_per_second': rows / seconds if seconds else 0.0}
+    log(f"✓ Scored {rows:,} rows in {seconds:.1f}s ({stats['rows_per_second']:,.0f} rows/s) "
+        f"→ {output_path}")
+    return stats
+
+
 def main():
     """
     Example usage of prediction functions.
@@ -202,17 +438,7 @@ def main():
     df = pd.read_csv(data_path)
 
     # Select a few rows for demonstration
-    test_data = df.head(5)[['tract', 'year',
-                            'median_income',
-                            'broadband_access_pct',
-                            'minority_owned_businesses_pct',
-                            'housing_cost_burden_pct',
-                            'early_education_enrollment_pct',
-                            'income_growth',
-                            'broadband_growth',
-                            'minority_business_growth',
-                            'housing_burden_change',
-                            'early_ed_growth']].copy()
+    test_data = df.head(5)[['tract', 'year', *BASE_FEATURES]].copy()
 
     print(f"Selected {len(test_data)} samples for prediction\n")
 
@@ -245,4 +471,27 @@ def main():
 
 
 if __name__ == "__main__":
-    predictions = main()
+    parser = argparse.ArgumentParser(description='IGS model predictions')
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('demo', help='Predict five sample rows (default)')
+    score = commands.add_parser('score', help='Stream a CSV/Parquet panel through all models')
+    score.add_argument('input', help='CSV or Parquet file of tract-years')
+    score.add_argument('-o', '--output', default='-',
+                       help="CSV or Parquet output file (default: CSV to stdout)")
+    score.add_argument('--models-dir', default=str(MODELS_DIR))
+    score.add_argument('--targets', nargs='+', default=list(TARGETS), choices=TARGETS)
+    score.add_argument('--chunk-size', type=int, default=50_000)
+    score.add_argument('--jobs', type=int, default=None,
+                       help='Scorer processes (default: CPU count)')
+    score.add_argument('--interval', type=float, default=None,
+                       help='Add per-tree prediction bounds at this coverage (e.g. 0.9)')
+    score.add_argument('--fill-missing', action='store_true',
+                       help="Fill missing feature values and absent feature columns "
+                            "with the schema's fill values")
+    args = parser.parse_args()
+
+    if args.command == 'score':
+        score_file(args.input, args.output, args.models_dir, args.targets, args.chunk_size,
+                   args.jobs, args.interval, args.fill_missing)
+    else:
+        predictions = main()
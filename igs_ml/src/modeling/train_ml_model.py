@@ -10,10 +10,12 @@ This script trains Random Forest models to predict:
 Uses level indicators and trend features with proper scaling and model persistence.
 """
 
+import argparse
+import json
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
-import joblib
 
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.preprocessing import StandardScaler
@@ -22,6 +24,17 @@ from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import FeatureSchema, LEVEL_FEATURES, TREND_FEATURES, TARGETS  # noqa: E402
+from modeling.model_artifacts import dump_artifact, write_manifest  # noqa: E402
+from modeling.permutation_importance import (  # noqa: E402
+    permutation_importance, save_permutation_importance)
+from profiling.instrumentation import stage, steps  # noqa: E402
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_PATH = BASE_DIR / 'data' / 'igs_trends_features.csv'
+MODELS_DIR = BASE_DIR / 'output' / 'models'
+
 
 def load_cleaned_data(file_path):
     """Load the cleaned IGS data with trend features."""
@@ -51,22 +64,9 @@ def prepare_features(df):
     """
     print("\nPreparing features...")
 
-    # Define feature sets
-    level_features = [
-        'median_income',
-        'broadband_access_pct',
-        'minority_owned_businesses_pct',
-        'housing_cost_burden_pct',
-        'early_education_enrollment_pct'
-    ]
-
-    trend_features = [
-        'income_growth',
-        'broadband_growth',
-        'minority_business_growth',
-        'housing_burden_change',
-        'early_ed_growth'
-    ]
+    # Define feature sets (shared with every prediction path via FeatureSchema)
+    level_features = list(LEVEL_FEATURES)
+    trend_features = list(TREND_FEATURES)
 
     # Combine all features
     all_features = level_features + trend_features
@@ -133,7 +133,8 @@ def train_model_for_target(X_train, X_test, y_train, y_test, target_name,
     # Train model
     print(f"Training with parameters: {model_params}")
     model = RandomForestRegressor(**model_params)
-    model.fit(X_train_scaled, y_train)
+    with stage('fit', target=target_name, rows=len(X_train)):
+        model.fit(X_train_scaled, y_train)
 
     # Make predictions
     y_train_pred = model.predict(X_train_scaled)
@@ -149,14 +150,15 @@ def train_model_for_target(X_train, X_test, y_train, y_test, target_name,
 
     # Cross-validation (on training data)
     print("Running 5-fold cross-validation...")
-    cv_scores = cross_val_score(
-        RandomForestRegressor(**model_params),
-        X_train_scaled,
-        y_train,
-        cv=min(5, len(X_train)),  # Use fewer folds if dataset is small
-        scoring='r2',
-        n_jobs=-1
-    )
+    with stage('cross_validation', target=target_name):
+        cv_scores = cross_val_score(
+            RandomForestRegressor(**model_params),
+            X_train_scaled,
+            y_train,
+            cv=min(5, len(X_train)),  # Use fewer folds if dataset is small
+            scoring='r2',
+            n_jobs=-1
+        )
     cv_mean = cv_scores.mean()
     cv_std = cv_scores.std()
 
@@ -199,9 +201,10 @@ def train_model_for_target(X_train, X_test, y_train, y_test, target_name,
     }
 
 
-def save_model_artifacts(model, scaler, feature_importance_df, target_name, output_dir='models'):
+def save_model_artifacts(model, scaler, feature_importance_df, target_name, output_dir='models',
+                         feature_names=None, fill_values=None):
     """
-    Save model, scaler, and feature importance to disk.
+    Save model, scaler, feature schema, and feature importance to disk.
 
     Parameters:
     -----------
@@ -215,26 +218,77 @@ def save_model_artifacts(model, scaler, feature_importance_df, target_name, outp
         Name of target variable
     output_dir : str
         Directory to save artifacts
+    feature_names : list
+        Feature column order the model was trained on (optional; defaults
+        to the names recorded by the fitted scaler)
+    fill_values : dict
+        Feature -> value used for missing inputs (the training medians)
     """
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
     # Save model
     model_file = output_path / f'{target_name}_model.joblib'
-    joblib.dump(model, model_file)
+    dump_artifact(model, model_file)
     print(f"  ✓ Model saved: {model_file}")
 
     # Save scaler
     scaler_file = output_path / f'{target_name}_scaler.joblib'
-    joblib.dump(scaler, scaler_file)
+    dump_artifact(scaler, scaler_file)
     print(f"  ✓ Scaler saved: {scaler_file}")
 
+    # Save feature schema
+    if feature_names is None:
+        feature_names = getattr(scaler, 'feature_names_in_', None)
+    if feature_names is None:
+        raise ValueError(f"Feature order unknown for {target_name}; pass feature_names")
+    schema = FeatureSchema(target=target_name, features=tuple(feature_names),
+                           fill_values=fill_values or {})
+    schema_file = schema.save(output_path)
+    print(f"  ✓ Feature schema saved: {schema_file}")
+
     # Save feature importance
     importance_file = output_path / f'{target_name}_feature_importance.csv'
     feature_importance_df.to_csv(importance_file, index=False)
     print(f"  ✓ Feature importance saved: {importance_file}")
 
 
+def save_training_metrics(results, target_name, output_dir='models'):
+    """
+    Save a target's evaluation metrics so the summary report can be built
+    after targets are trained in separate processes.
+
+    Parameters:
+    -----------
+    results : dict
+        Output of train_model_for_target
+    target_name : str
+        Name of target variable
+    output_dir : str
+        Directory to save the metrics JSON
+    """
+    metrics = {key: float(results[key]) for key in
+               ('train_r2', 'test_r2', 'train_mae', 'test_mae',
+                'train_rmse', 'test_rmse', 'cv_r2_mean', 'cv_r2_std')}
+    metrics['feature_importance'] = results['feature_importance'].to_dict(orient='records')
+    metrics_file = Path(output_dir) / f'{target_name}_metrics.json'
+    with open(metrics_file, 'w') as f:
+        json.dump(metrics, f, indent=2)
+    print(f"  ✓ Metrics saved: {metrics_file}")
+    return metrics_file
+
+
+def load_training_metrics(targets, output_dir='models'):
+    """Load saved metrics in the shape create_summary_report expects."""
+    all_results = {}
+    for target_name in targets:
+        with open(Path(output_dir) / f'{target_name}_metrics.json') as f:
+            metrics = json.load(f)
+        metrics['feature_importance'] = pd.DataFrame(metrics['feature_importance'])
+        all_results[target_name] = metrics
+    return all_results
+
+
 def create_summary_report(all_results, output_dir='models'):
     """
     Create a summary report comparing all models.
@@ -317,28 +371,48 @@ def create_summary_report(all_results, output_dir='models'):
     return comparison_df
 
 
-def main():
+def main(targets=None, write_report=True, report_only=False):
     """
     Main execution function for multi-target ML model training.
+
+    Parameters:
+    -----------
+    targets : list of str
+        Targets to train (defaults to all four); subsets let the pipeline
+        runner train targets in parallel processes
+    write_report : bool
+        Build the comparison report and the manifest after training; the
+        pipeline's parallel per-target runs leave both to the report stage
+    report_only : bool
+        Skip training and build the report and manifest from saved artifacts
     """
+    targets = list(targets or TARGETS)
+    if report_only:
+        all_results = load_training_metrics(targets, MODELS_DIR)
+        comparison_df = create_summary_report(all_results, MODELS_DIR)
+        print(f"\n✓ Manifest saved: {write_manifest(MODELS_DIR)}")
+        return all_results, comparison_df
+
     print("="*60)
     print("IGS MULTI-TARGET PREDICTION - ML MODEL TRAINING")
     print("="*60 + "\n")
 
+    step = steps('train_ml_model')
+
     # Step 1: Load cleaned data
-    data_path = "igs_trends_features.csv"
+    step('load_data')
+    data_path = DATA_PATH
     df = load_cleaned_data(data_path)
 
     # Step 2: Prepare features
+    step('prepare_features')
     X, feature_names = prepare_features(df)
 
-    # Define target variables
-    targets = ['place_score', 'economy_score', 'community_score', 'igs_score']
-
     print(f"\nTarget variables to predict: {targets}")
 
     # Step 3: Split data (same split for all targets)
     print(f"\nSplitting data (80% train, 20% test)...")
+    step('split_and_scale')
     X_train, X_test = train_test_split(X, test_size=0.2, random_state=42)
 
     print(f"  Training samples: {len(X_train)}")
@@ -350,6 +424,9 @@ def main():
     scaler.fit(X_train)
     print(f"  ✓ Scaler fitted")
 
+    # Training medians double as fill values for missing inputs
+    fill_values = X_train.median().to_dict()
+
     # Step 5: Train models for each target
     all_results = {}
 
@@ -358,6 +435,7 @@ def main():
         y_train, y_test = train_test_split(y, test_size=0.2, random_state=42)
 
         # Train model
+        step(f'train_{target_name}')
         results = train_model_for_target(
             X_train, X_test, y_train, y_test,
             target_name, scaler, feature_names
@@ -367,24 +445,49 @@ def main():
 
         # Step 7: Save model artifacts
         print(f"\nSaving artifacts for {target_name}...")
+        step(f'save_{target_name}')
         save_model_artifacts(
             results['model'],
             scaler,
             results['feature_importance'],
-            target_name
+            target_name,
+            output_dir=MODELS_DIR,
+            feature_names=feature_names,
+            fill_values=fill_values
         )
+        save_training_metrics(results, target_name, MODELS_DIR)
+
+        # Permutation importance on the holdout, cached against the saved model
+        step(f'permutation_importance_{target_name}')
+        perm_df = permutation_importance(
+            results['model'], scaler, X_test.to_numpy(), y_test.to_numpy(), feature_names)
+        perm_file = save_permutation_importance(perm_df, MODELS_DIR, target_name)
+        print(f"  ✓ Permutation importance saved: {perm_file}")
+
+    # Written last: tells model watchers this set of artifacts is complete.
+    # Per-target runs (--skip-report) leave it to the report stage, which
+    # runs once every target is trained
+    if targets and write_report:
+        print(f"\n✓ Manifest saved: {write_manifest(MODELS_DIR)}")
 
     # Step 8: Create summary report
-    comparison_df = create_summary_report(all_results)
+    comparison_df = None
+    if write_report:
+        step('summary_report')
+        comparison_df = create_summary_report(all_results, MODELS_DIR)
+    step.done()
 
     print("\n" + "="*60)
     print("TRAINING COMPLETE!")
     print("="*60)
-    print(f"\n✓ All models saved to 'models/' directory")
+    print(f"\n✓ All models saved to {MODELS_DIR}")
     print(f"✓ Each model includes:")
     print(f"  - Trained Random Forest model (.joblib)")
     print(f"  - Feature scaler (.joblib)")
+    print(f"  - Feature schema (.json)")
     print(f"  - Feature importance (.csv)")
+    print(f"  - Evaluation metrics (.json)")
+    print(f"  - Permutation importance (.csv)")
     print(f"\n✓ Summary reports generated:")
     print(f"  - model_comparison_summary.csv")
     print(f"  - training_report.txt")
@@ -393,4 +496,13 @@ def main():
 
 
 if __name__ == "__main__":
-    all_results, comparison_df = main()
+    parser = argparse.ArgumentParser(description='Train the IGS pillar models')
+    parser.add_argument('--targets', nargs='+', choices=TARGETS,
+                        help='Targets to train (default: all)')
+    parser.add_argument('--skip-report', action='store_true',
+                        help='Do not write the comparison report or the manifest')
+    parser.add_argument('--report-only', action='store_true',
+                        help='Build the report and manifest from saved artifacts without training')
+    args = parser.parse_args()
+    all_results, comparison_df = main(args.targets, write_report=not args.skip_report,
+                                      report_only=args.report_only)
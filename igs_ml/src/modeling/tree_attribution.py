@@ -0,0 +1,281 @@
+"""
+Path-Dependent Tree Attributions (TreeSHAP)
+
+Explains individual forest predictions as per-feature contributions that sum
+to the prediction minus the forest's expected value, using the
+path-dependent TreeSHAP algorithm (Lundberg et al. 2020) on the fitted tree
+arrays, without the external shap package.
+
+Every root-to-leaf path is preprocessed once into its unique split features:
+- zero fraction z: share of training cover that follows the path for that
+  feature (product of child/parent cover ratios)
+- the interval (lo, hi] of feature values that satisfies all of that
+  feature's splits on the path (one fraction o = 1 inside, 0 outside)
+
+For a row, each leaf contributes v * (o_i - z_i) * sum_s w(s, d) * c_s to
+feature i, where c_s are the coefficients of prod_{j != i} (z_j + o_j t) and
+w(s, d) = s! (d - s - 1)! / d!. The polynomial is built and unwound for all
+leaves and rows at once, so a batch costs a few dozen array operations.
+
+Attributions are cached per (model hash, row hash) so repeated explanations
+of the same scenario rows are free.
+"""
+
+import hashlib
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from math import factorial
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import scale_features  # noqa: E402
+
+# (model hash, row hash) -> attribution vector, shared by all explainers
+_ATTRIBUTION_CACHE: 'OrderedDict[tuple, np.ndarray]' = OrderedDict()
+ATTRIBUTION_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class TreeAttributor:
+    """
+    Leaf path tables for every tree in a forest.
+
+    Attributes:
+    -----------
+    feature : np.ndarray
+        Unique split features per leaf path, shape (n_leaves, depth), -1 padded
+    lower, upper : np.ndarray
+        Interval (lower, upper] satisfying each feature's splits on the path
+    zero_fraction : np.ndarray
+        Cover share following the path per feature (1 for padding)
+    leaf_value : np.ndarray
+        Leaf prediction divided by the number of trees
+    weights : np.ndarray
+        Shapley weights w(s, d) per leaf, shape (n_leaves, depth)
+    expected_value : float
+        Cover-weighted mean prediction of the forest
+    n_features : int
+        Number of input features
+    model_hash : str
+        Identifier of the explained model, used as the cache key
+    """
+
+    feature: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    zero_fraction: np.ndarray
+    leaf_value: np.ndarray
+    weights: np.ndarray
+    expected_value: float
+    n_features: int
+    model_hash: str
+
+    @classmethod
+    def from_estimator(cls, model, model_hash: Optional[str] = None) -> 'TreeAttributor':
+        """
+        Build path tables from a fitted RandomForestRegressor or regression tree.
+
+        Parameters:
+        -----------
+        model : estimator
+            Fitted forest or single tree
+        model_hash : str
+            Cache identifier (defaults to a hash of the tree arrays)
+        """
+        estimators = getattr(model, 'estimators_', [model])
+        n_trees = len(estimators)
+        paths, values = [], []
+        digest = hashlib.sha256()
+
+        for estimator in estimators:
+            tree = estimator.tree_
+            cover = tree.weighted_n_node_samples
+            value = tree.value.reshape(tree.node_count, -1)[:, 0]
+            if model_hash is None:
+                for array in (tree.children_left, tree.feature, tree.threshold, value):
+                    digest.update(np.ascontiguousarray(array).tobytes())
+
+            # Depth-first walk carrying feature -> [lower, upper, zero_fraction]
+            stack = [(0, {})]
+            while stack:
+                node, conditions = stack.pop()
+                left, right = tree.children_left[node], tree.children_right[node]
+                if left == -1:
+                    paths.append(conditions)
+                    values.append(value[node] / n_trees)
+                    continue
+                f, thr = int(tree.feature[node]), float(tree.threshold[node])
+                for child, go_left in ((left, True), (right, False)):
+                    lo, hi, z = conditions.get(f, (-np.inf, np.inf, 1.0))
+                    if go_left:
+                        hi = min(hi, thr)
+                    else:
+                        lo = max(lo, thr)
+                    child_conditions = dict(conditions)
+                    child_conditions[f] = (lo, hi, z * cover[child] / cover[node])
+                    stack.append((child, child_conditions))
+
+        n_leaves = len(paths)
+        depth = max(1, max(len(p) for p in paths))
+        feature = np.full((n_leaves, depth), -1, dtype=np.intp)
+        lower = np.full((n_leaves, depth), -np.inf)
+        upper = np.full((n_leaves, depth), np.inf)
+        zero_fraction = np.ones((n_leaves, depth))
+        weights = np.zeros((n_leaves, depth))
+
+        for leaf, conditions in enumerate(paths):
+            d = len(conditions)
+            for k, (f, (lo, hi, z)) in enumerate(conditions.items()):
+                feature[leaf, k] = f
+                lower[leaf, k], upper[leaf, k], zero_fraction[leaf, k] = lo, hi, z
+            for s in range(d):
+                weights[leaf, s] = factorial(s) * factorial(d - s - 1) / factorial(d)
+
+        leaf_value = np.asarray(values, dtype=np.float64)
+        expected_value = float(np.sum(leaf_value * zero_fraction.prod(axis=1)))
+
+        return cls(
+            feature=feature, lower=lower, upper=upper, zero_fraction=zero_fraction,
+            leaf_value=leaf_value, weights=weights, expected_value=expected_value,
+            n_features=int(getattr(model, 'n_features_in_', feature.max() + 1)),
+            model_hash=model_hash or digest.hexdigest()[:16],
+        )
+
+    @property
+    def n_leaves(self) -> int:
+        return len(self.leaf_value)
+
+    @property
+    def depth(self) -> int:
+        return self.feature.shape[1]
+
+    def _shap_batch(self, X: np.ndarray) -> np.ndarray:
+        """Attributions for a batch of rows, shape (n_rows, n_features)."""
+        L, D = self.feature.shape
+        X32 = np.asarray(X, dtype=np.float32)
+        padded = self.feature < 0
+
+        # One fraction per (row, leaf, path feature), compared like sklearn
+        x = X32[:, np.where(padded, 0, self.feature)]
+        one = ((x > self.lower) & (x <= self.upper) & ~padded).astype(np.float64)
+        zero = self.zero_fraction
+
+        # Coefficients of prod_j (z_j + o_j t), shape (rows, leaves, D + 1)
+        poly = np.zeros(one.shape[:2] + (D + 1,))
+        poly[..., 0] = 1.0
+        for k in range(D):
+            shifted = np.zeros_like(poly)
+            shifted[..., 1:] = poly[..., :-1] * one[..., k:k + 1]
+            poly = poly * zero[:, k:k + 1] + shifted
+
+        contrib = np.zeros(one.shape)
+        for i in range(D):
+            z_i, o_i = zero[:, i:i + 1], one[..., i:i + 1]
+            # Divide out (z_i + o_i t): o_i = 1 unwinds from the top,
+            # o_i = 0 is a plain division by z_i
+            unwound = np.empty(poly.shape[:2] + (D,))
+            unwound[..., D - 1] = poly[..., D]
+            for k in range(D - 1, 0, -1):
+                unwound[..., k - 1] = poly[..., k] - zero[:, i] * unwound[..., k]
+            unwound = np.where(o_i > 0, unwound, poly[..., :D] / z_i)
+            total = np.sum(unwound * self.weights, axis=-1)
+            contrib[..., i] = total * (one[..., i] - zero[:, i])
+
+        contrib *= self.leaf_value[:, None] * ~padded
+        # Scatter (leaf, slot) contributions onto their features
+        columns = np.where(padded, self.n_features, self.feature).reshape(-1)
+        result = np.zeros((X32.shape[0], self.n_features + 1))
+        np.add.at(result.T, columns, contrib.reshape(X32.shape[0], -1).T)
+        return result[:, :self.n_features]
+
+    def shap_values(self, X: np.ndarray, max_elements: int = 2_000_000) -> np.ndarray:
+        """
+        Per-row, per-feature contributions (uncached).
+
+        Parameters:
+        -----------
+        X : np.ndarray
+            Model inputs (already scaled) of shape (n_rows, n_features)
+        max_elements : int
+            Bound on rows * leaves * depth^2 per batch, to cap memory
+
+        Returns:
+        --------
+        np.ndarray
+            Contributions of shape (n_rows, n_features); each row sums to
+            the prediction minus expected_value
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        rows_per_batch = max(1, max_elements // (self.n_leaves * self.depth ** 2))
+        return np.vstack([self._shap_batch(X[start:start + rows_per_batch])
+                          for start in range(0, len(X), rows_per_batch)]
+                         or [np.zeros((0, self.n_features))])
+
+    def explain(self, X: np.ndarray) -> np.ndarray:
+        """
+        Same as shap_values, reusing cached rows for this model.
+
+        Parameters:
+        -----------
+        X : np.ndarray
+            Model inputs (already scaled) of shape (n_rows, n_features)
+
+        Returns:
+        --------
+        np.ndarray
+            Contributions of shape (n_rows, n_features)
+        """
+        X = np.atleast_2d(np.ascontiguousarray(X, dtype=np.float64))
+        keys = [(self.model_hash, hashlib.sha1(row.tobytes()).hexdigest()) for row in X]
+        result = np.empty((len(X), self.n_features))
+        missing = []
+        for i, key in enumerate(keys):
+            if key in _ATTRIBUTION_CACHE:
+                _ATTRIBUTION_CACHE.move_to_end(key)
+                result[i] = _ATTRIBUTION_CACHE[key]
+            else:
+                missing.append(i)
+
+        if missing:
+            result[missing] = self.shap_values(X[missing])
+            for i in missing:
+                _ATTRIBUTION_CACHE[keys[i]] = result[i].copy()
+            while len(_ATTRIBUTION_CACHE) > ATTRIBUTION_CACHE_SIZE:
+                _ATTRIBUTION_CACHE.popitem(last=False)
+        return result
+
+
+def explain_change(attributor: TreeAttributor, schema, scaler,
+                   baseline, intervention) -> Dict:
+    """
+    Attribute the predicted change between a baseline and intervention row.
+
+    Parameters:
+    -----------
+    attributor : TreeAttributor
+        Explainer for the target model
+    schema : FeatureSchema
+        Feature layout of the target model
+    scaler : StandardScaler
+        Scaler fitted for the target model
+    baseline, intervention : pd.DataFrame, dict, or np.ndarray
+        Single feature rows accepted by FeatureSchema.to_array
+
+    Returns:
+    --------
+    dict
+        expected_value plus feature -> contribution maps for 'baseline',
+        'intervention', and 'delta' (delta values sum to the score change)
+    """
+    X = np.vstack([schema.to_array(baseline), schema.to_array(intervention)])
+    phi = attributor.explain(scale_features(scaler, X))
+    return {
+        'expected_value': attributor.expected_value,
+        'baseline': dict(zip(schema.features, phi[0].tolist())),
+        'intervention': dict(zip(schema.features, phi[1].tolist())),
+        'delta': dict(zip(schema.features, (phi[1] - phi[0]).tolist())),
+    }
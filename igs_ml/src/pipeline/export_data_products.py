@@ -0,0 +1,273 @@
+"""
+Dashboard Data-Product Export
+
+Builds the JSON payloads served by the Next.js dashboard API routes, so the
+routes no longer embed sample data or parse CSVs on every request:
+
+- igs_trends.json         pillar scores per tract and county average
+- indicator_trends.json   level indicators per tract and county average
+- forecasts.json          IGS trajectories to 2030 per tract and scenario
+- importances.json        impurity, permutation and Sobol importances
+- report_data.json        the report slice for the focus tract
+
+Each payload is written with sorted keys and no whitespace. manifest.json
+records a content ETag, the size and the source-file digests for each
+product. A product file is only rewritten when its bytes change, so ETags
+(and mtimes) stay stable across re-runs.
+
+Usage:
+    python src/pipeline/export_data_products.py
+    python src/pipeline/export_data_products.py --output-dir /tmp/products
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import DISTRESSED_THRESHOLD, LEVEL_FEATURES, TARGETS  # noqa: E402
+from modeling.model_artifacts import load_pillar_models, model_hash  # noqa: E402
+from analysis.forecast_engine import ForecastEngine, ForecastScenario, latest_rows  # noqa: E402
+
+# Paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_PATH = BASE_DIR / 'data' / 'igs_trends_features.csv'
+MODELS_DIR = BASE_DIR / 'output' / 'models'
+OUTPUT_DIR = BASE_DIR.parent / 'nextjs-dashboard' / 'data' / 'products'
+
+# Bump when a payload's shape changes; part of every ETag
+SCHEMA_VERSION = 1
+
+FOCUS_TRACT = '05085020800'
+FORECAST_END_YEAR = 2030
+
+# Dashboard scenario keys -> level-feature changes phased in over 3 years
+DASHBOARD_SCENARIOS = {
+    'housing': ('Reduce housing cost burden by 10 points',
+                {'housing_cost_burden_pct': -10}),
+    'education': ('Increase early education enrollment by 15 points',
+                  {'early_education_enrollment_pct': 15}),
+    'business': ('Increase minority-owned businesses by 5 points',
+                 {'minority_owned_businesses_pct': 5}),
+}
+DASHBOARD_SCENARIOS['combined'] = (
+    'All three interventions together',
+    {feature: delta for _, deltas in DASHBOARD_SCENARIOS.values()
+     for feature, delta in deltas.items()})
+
+# report_data intervention_impacts keys for each dashboard scenario
+REPORT_IMPACT_KEYS = {'housing': 'housing_affordability', 'education': 'early_education',
+                      'business': 'small_business', 'combined': 'combined'}
+
+SCORE_KEYS = {'igs_score': 'igs', 'place_score': 'place',
+              'economy_score': 'economy', 'community_score': 'community'}
+
+
+def _file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def _records(frame: pd.DataFrame, decimals: int = 2):
+    """Rounded row records with NaN as null."""
+    frame = frame.round(decimals).astype(object).where(frame.notna(), None)
+    return frame.to_dict('records')
+
+
+def load_panel(data_path=DATA_PATH) -> pd.DataFrame:
+    df = pd.read_csv(data_path, dtype={'tract': str})
+    df['tract'] = df['tract'].str.zfill(11)
+    df['county'] = df['tract'].str[:5]
+    return df.sort_values(['tract', 'year']).reset_index(drop=True)
+
+
+def _by_tract_and_county(df: pd.DataFrame, columns: Dict[str, str]) -> Dict:
+    """Year series per tract plus the tract average (and tract count) per county."""
+    renamed = df[['tract', 'county', 'year'] + list(columns)].rename(columns=columns)
+    values = list(columns.values())
+    grouped = renamed.groupby(['county', 'year'])
+    county_means = grouped[values].mean().assign(tracts=grouped.size()).reset_index()
+    return {
+        'tracts': {tract: _records(group.drop(columns=['tract', 'county']))
+                   for tract, group in renamed.groupby('tract', sort=True)},
+        'counties': {county: _records(group.drop(columns=['county']))
+                     for county, group in county_means.groupby('county', sort=True)},
+    }
+
+
+def build_trends(df: pd.DataFrame) -> Dict:
+    return _by_tract_and_county(df, SCORE_KEYS)
+
+
+def build_indicator_trends(df: pd.DataFrame) -> Dict:
+    return _by_tract_and_county(df, {feature: feature for feature in LEVEL_FEATURES})
+
+
+def build_forecasts(df: pd.DataFrame, models_dir=MODELS_DIR) -> Dict:
+    """IGS trajectory per tract from its latest year to FORECAST_END_YEAR."""
+    models, scalers, schemas = load_pillar_models(models_dir, ['igs_score'])
+    engine = ForecastEngine(models, scalers, schemas)
+    scenarios = [ForecastScenario(name, deltas, ramp_years=3)
+                 for name, (_, deltas) in DASHBOARD_SCENARIOS.items()]
+
+    tracts = {}
+    starts = latest_rows(df.drop(columns=['county']))
+    # Tracts end in different years; forecast each start year in one batch
+    for start_year, frame in starts.groupby('year'):
+        paths = engine.forecast(frame.reset_index(drop=True), scenarios,
+                                horizon=FORECAST_END_YEAR - int(start_year),
+                                start_year=int(start_year), anchor_to_observed=True)
+        wide = paths.pivot_table(index=['tract', 'year'], columns='scenario',
+                                 values='igs_score').reset_index()
+        for tract, group in wide.groupby('tract', sort=True):
+            tracts[str(tract).zfill(11)] = _records(group.drop(columns=['tract'])[
+                ['year', 'baseline'] + list(DASHBOARD_SCENARIOS)])
+    return {
+        'target': 'igs_score',
+        'model_hash': model_hash(models_dir, 'igs_score'),
+        'threshold': DISTRESSED_THRESHOLD,
+        'scenarios': {name: description
+                      for name, (description, _) in DASHBOARD_SCENARIOS.items()},
+        'tracts': dict(sorted(tracts.items())),
+    }
+
+
+def build_importances(models_dir=MODELS_DIR) -> Dict:
+    models_dir = Path(models_dir)
+    products = {}
+    for target in TARGETS:
+        entry = {'model_hash': model_hash(models_dir, target)}
+        for method, suffix in (('impurity', 'feature_importance'),
+                               ('permutation', 'permutation_importance'),
+                               ('sobol', 'sensitivity')):
+            path = models_dir / f'{target}_{suffix}.csv'
+            if path.exists():
+                entry[method] = _records(pd.read_csv(path)[['feature', 'importance']], 4)
+        products[target] = entry
+    return products
+
+
+def build_report_data(df: pd.DataFrame, forecasts: Dict, importances: Dict,
+                      models_dir=MODELS_DIR) -> Dict:
+    """Data-driven parts of /api/report-data for FOCUS_TRACT."""
+    tract = df[df['tract'] == FOCUS_TRACT]
+    latest, previous = tract.iloc[-1], tract.iloc[-2]
+
+    def change_pct(col):
+        return round(float((latest[col] - previous[col]) / previous[col] * 100), 1)
+
+    trajectory = forecasts['tracts'][FOCUS_TRACT]
+    summary_path = Path(models_dir) / 'model_comparison_summary.csv'
+    accuracy = None
+    if summary_path.exists():
+        summary = pd.read_csv(summary_path).set_index('Target')
+        accuracy = round(float(summary.loc['igs_score', 'Test R²']), 2)
+
+    return {
+        'metadata': {
+            'tract': FOCUS_TRACT[-5:],
+            'tracts': int(df.loc[df['county'] == FOCUS_TRACT[:5], 'tract'].nunique()),
+            'years_covered': f"{int(tract['year'].min())}-{int(tract['year'].max())}",
+            'total_observations': int((df['county'] == FOCUS_TRACT[:5]).sum()),
+        },
+        'executive_summary': {
+            'current_igs': round(float(latest['igs_score']), 2),
+            'previous_igs': round(float(previous['igs_score']), 2),
+            'igs_change_pct': change_pct('igs_score'),
+            'status': 'Declining' if latest['igs_score'] < previous['igs_score'] else 'Improving',
+            **{f'current_{key}': round(float(latest[col]), 2)
+               for col, key in SCORE_KEYS.items() if key != 'igs'},
+            **{f'{key}_change_pct': change_pct(col)
+               for col, key in SCORE_KEYS.items() if key != 'igs'},
+        },
+        'historical_data': _records(tract[['year'] + list(SCORE_KEYS)]),
+        'indicator_trends': _records(tract[['year'] + list(LEVEL_FEATURES)]),
+        'ml_forecasts': trajectory,
+        'intervention_impacts': {
+            REPORT_IMPACT_KEYS[name]: {
+                'description': description,
+                'igs_impact': round(trajectory[-1][name] - trajectory[-1]['baseline'], 2),
+            } for name, description in forecasts['scenarios'].items()},
+        'threshold': forecasts['threshold'],
+        'model_accuracy': accuracy,
+        'top_features': importances['igs_score'].get('impurity', [])[:10],
+    }
+
+
+def write_products(products: Dict[str, Dict], sources: Dict[str, Dict[str, str]],
+                   output_dir=OUTPUT_DIR) -> Dict:
+    """
+    Write each product and the manifest, skipping files whose bytes are unchanged.
+
+    Returns:
+    --------
+    dict
+        The manifest (product name -> file, etag, bytes, sources)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {'schema_version': SCHEMA_VERSION, 'products': {}}
+    for name, payload in products.items():
+        body = json.dumps({'schema_version': SCHEMA_VERSION, **payload},
+                          sort_keys=True, separators=(',', ':')).encode()
+        path = output_dir / f'{name}.json'
+        unchanged = path.exists() and path.read_bytes() == body
+        if not unchanged:
+            path.write_bytes(body)
+        manifest['products'][name] = {
+            'file': path.name,
+            'etag': f'"{hashlib.sha256(body).hexdigest()[:20]}"',
+            'bytes': len(body),
+            'sources': sources[name],
+        }
+        print(f"  {'-' if unchanged else '✓'} {path.name}: {len(body):,} bytes"
+              f"{' (unchanged)' if unchanged else ''}")
+    (output_dir / 'manifest.json').write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    return manifest
+
+
+def main(output_dir=OUTPUT_DIR):
+    print("="*70)
+    print("EXPORTING DASHBOARD DATA PRODUCTS")
+    print("="*70)
+
+    df = load_panel()
+    print(f"\nLoaded {len(df)} rows ({df['tract'].nunique()} tracts)")
+
+    data_source = {str(DATA_PATH.relative_to(BASE_DIR)): _file_digest(DATA_PATH)}
+    model_sources = {f'{target}_model': model_hash(MODELS_DIR, target) for target in TARGETS}
+
+    forecasts = build_forecasts(df)
+    importances = build_importances()
+    products = {
+        'igs_trends': build_trends(df),
+        'indicator_trends': build_indicator_trends(df),
+        'forecasts': forecasts,
+        'importances': importances,
+        'report_data': build_report_data(df, forecasts, importances),
+    }
+    sources = {
+        'igs_trends': data_source,
+        'indicator_trends': data_source,
+        'forecasts': {**data_source, 'igs_score_model': model_sources['igs_score_model']},
+        'importances': model_sources,
+        'report_data': {**data_source, **model_sources},
+    }
+
+    print(f"\nWriting to {output_dir}:")
+    manifest = write_products(products, sources, output_dir)
+    total = sum(entry['bytes'] for entry in manifest['products'].values())
+    print(f"\n✓ {len(products)} products, {total:,} bytes total")
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export dashboard JSON data products')
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR,
+                        help='Directory for the product files and manifest.json')
+    args = parser.parse_args()
+    main(args.output_dir)
@@ -0,0 +1,505 @@
+"""
+End-to-End Pipeline Runner
+
+Declares every script of the project as a stage with explicit inputs and
+outputs and runs them as a DAG:
+1. A stage depends on the earlier-declared stages that produce its inputs
+   (declaration order is the topological order, which also keeps in-place
+   stages such as filter_tract_20800 after the stage that wrote the file)
+2. Each stage is fingerprinted from its script, the project modules the
+   script imports, its arguments and input content hashes; a stage whose
+   fingerprint matches the last successful run and whose outputs exist is
+   skipped
+3. Independent stages (per-target training, sensitivity analysis, the figure
+   scripts) run in parallel subprocesses
+
+Stages whose source inputs are not available (the raw "Data Drive Datasets"
+exports are not shipped with the repo) are reported as unavailable; their
+committed outputs are then used as sources by downstream stages.
+
+State is kept in output/pipeline/state.json and per-stage logs in
+output/pipeline/logs/.
+
+Usage:
+    python src/pipeline/run_pipeline.py                   # refresh what changed
+    python src/pipeline/run_pipeline.py --dry-run         # show the plan
+    python src/pipeline/run_pipeline.py generate_key_findings --jobs 4
+    python src/pipeline/run_pipeline.py --force train_igs_score
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.feature_schema import TARGETS  # noqa: E402
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+PROJECT_ROOT = BASE_DIR.parent
+SRC_DIR = BASE_DIR / 'src'
+PIPELINE_DIR = BASE_DIR / 'output' / 'pipeline'
+STATE_PATH = PIPELINE_DIR / 'state.json'
+LOG_DIR = PIPELINE_DIR / 'logs'
+
+IGS_DATA = 'igs_ml/data/igs_trends_features.csv'
+MODELS = 'igs_ml/output/models'
+RAW_DATA = 'Data Drive Datasets'
+IGS_EXPORTS = f'{RAW_DATA}/Inclusive Growth Score™ '
+DATA_CLEANED = ('data_cleaned/broadband_cleaned.csv', 'data_cleaned/housing_cleaned.csv',
+                'data_cleaned/labor_cleaned.csv', 'data_cleaned/business_cleaned.csv')
+STORE = 'igs_ml/data/igs_store.sqlite'
+
+
+@dataclass
+class Stage:
+    """
+    One script invocation in the pipeline.
+
+    Paths are relative to the project root; directories are hashed
+    recursively. `cwd` is where the script runs (several scripts read and
+    write relative to their working directory).
+    """
+    name: str
+    script: str
+    inputs: tuple = ()
+    outputs: tuple = ()
+    args: tuple = ()
+    cwd: str = '.'
+    deps: set = field(default_factory=set)
+
+
+def _model_files(target):
+    return tuple(f'{MODELS}/{target}_{suffix}' for suffix in
+                 ('model.joblib', 'scaler.joblib', 'schema.json'))
+
+
+def build_stages():
+    """The project's scripts in run order."""
+    stages = [
+        # --- Raw data cleaning ---
+        Stage('clean_all_data', 'scripts/data_cleaning/clean_all_data.py',
+              inputs=(f'{RAW_DATA}/Data That Back IGS (Problem)',),
+              outputs=DATA_CLEANED),
+        Stage('parse_personal_income', 'scripts/data_cleaning/parse_personal_income.py',
+              inputs=(f'{RAW_DATA}/Data That Back IGS (Problem)/Community Pillar/Personal Income',),
+              outputs=('data_cleaned/personal_income_parsed.csv',)),
+        Stage('integrate_solutions_data', 'igs_plus_more_data/integrate_solutions_data.py',
+              inputs=(f'{RAW_DATA}/Data That Back Solution',),
+              outputs=('igs_plus_more_data/integrated_county_solutions.csv',)),
+
+        # --- Tract 20800 ---
+        Stage('clean_tract_20800_from_export',
+              'igs_ml/src/data_processing/clean_tract_20800_from_export.py',
+              inputs=(f'{IGS_EXPORTS}/Inclusive_Growth_Score_Data_Export_21-11-2025_035947'
+                      ' - Compared to Urban-Rural.csv',),
+              outputs=('data_cleaned/tract_20800_cleaned.csv',)),
+        Stage('clean_tract_20800', 'scripts/data_cleaning/clean_tract_20800.py',
+              inputs=('data_cleaned/tract_20800_cleaned.csv', 'igs_ml/igs_trends_features.csv'),
+              outputs=('data_cleaned/tract_20800_cleaned.csv',)),
+        Stage('compute_tract_20800_trends', 'scripts/data_cleaning/compute_tract_20800_trends.py',
+              inputs=('data_cleaned/tract_20800_cleaned.csv',),
+              outputs=('data_cleaned/tract_20800_features.csv',)),
+        Stage('filter_tract_20800', 'scripts/data_cleaning/filter_tract_20800.py',
+              inputs=('data_cleaned/tract_20800_features.csv',),
+              outputs=('data_cleaned/tract_20800_features.csv',)),
+        Stage('validate_tract_20800', 'scripts/data_cleaning/validate_tract_20800.py',
+              inputs=('data_cleaned/tract_20800_features.csv',)),
+        Stage('append_tract_20800', 'scripts/data_cleaning/append_tract_20800.py',
+              inputs=('igs_ml/igs_trends_features.csv', 'data_cleaned/tract_20800_cleaned.csv'),
+              outputs=('igs_ml/igs_trends_features.csv',)),
+
+        # --- Analytical store over the cleaned data ---
+        Stage('build_analytical_store', 'igs_ml/src/data_processing/analytical_store.py',
+              inputs=(IGS_DATA, 'data_cleaned/personal_income_cleaned.csv',
+                      'data_cleaned/tract_20800_cleaned.csv') + DATA_CLEANED,
+              outputs=(STORE,)),
+    ]
+
+    # --- Models (one process per target) ---
+    for target in TARGETS:
+        stages.append(Stage(
+            f'train_{target}', 'igs_ml/src/modeling/train_ml_model.py',
+            inputs=(IGS_DATA,),
+            outputs=_model_files(target) + tuple(
+                f'{MODELS}/{target}_{suffix}' for suffix in
+                ('feature_importance.csv', 'permutation_importance.csv', 'metrics.json')),
+            args=('--targets', target, '--skip-report')))
+    # The report stage also writes manifest.json, once every target is trained
+    stages.append(Stage(
+        'model_report', 'igs_ml/src/modeling/train_ml_model.py',
+        inputs=tuple(f'{MODELS}/{target}_metrics.json' for target in TARGETS) + sum(
+            (_model_files(target) for target in TARGETS), ()),
+        outputs=(f'{MODELS}/model_comparison_summary.csv', f'{MODELS}/training_report.txt',
+                 f'{MODELS}/manifest.json'),
+        args=('--report-only',)))
+    stages.append(Stage(
+        'train_augmented_model', 'igs_plus_more_data/train_augmented_model.py',
+        inputs=(IGS_DATA, 'igs_plus_more_data/integrated_county_solutions.csv'),
+        outputs=('igs_plus_more_data/models_augmented',),
+        cwd='igs_plus_more_data'))
+    for target in TARGETS:
+        stages.append(Stage(
+            f'sensitivity_{target}', 'igs_ml/src/analysis/sensitivity_analysis.py',
+            inputs=(IGS_DATA,) + _model_files(target),
+            outputs=(f'{MODELS}/{target}_sensitivity.json', f'{MODELS}/{target}_sensitivity.csv'),
+            args=('--targets', target, '--jobs', '1')))
+
+    # --- Analysis products ---
+    all_models = sum((_model_files(target) for target in TARGETS), ())
+    # The figure stages run side by side on the runner's pool, so each
+    # renders in-process instead of starting a CPU-count pool of its own
+    render_args = ('--jobs', '1')
+    stages += [
+        Stage('generate_sample_submission', 'igs_ml/src/analysis/generate_sample_submission.py',
+              inputs=(IGS_DATA,) + all_models,
+              outputs=('igs_ml/output/Sample_submission.csv',)),
+        Stage('predict_intervention_outcomes',
+              'igs_ml/src/analysis/predict_intervention_outcomes.py',
+              inputs=(IGS_DATA,) + _model_files('igs_score'),
+              outputs=('igs_ml/Slide_5_Predicted_Outcomes',)),
+        Stage('generate_key_findings', 'igs_ml/src/analysis/generate_key_findings.py',
+              inputs=(STORE,) + all_models + tuple(
+                  f'{MODELS}/{target}_permutation_importance.csv' for target in TARGETS),
+              outputs=('igs_ml/Slide_6_Key_Findings',), args=render_args),
+        Stage('export_data_products', 'igs_ml/src/pipeline/export_data_products.py',
+              inputs=(IGS_DATA, f'{MODELS}/model_comparison_summary.csv') + all_models + tuple(
+                  f'{MODELS}/{target}_{suffix}.csv' for target in TARGETS
+                  for suffix in ('feature_importance', 'permutation_importance', 'sensitivity')),
+              outputs=('nextjs-dashboard/data/products',)),
+    ]
+
+    # --- Figures (write relative to igs_ml/output) ---
+    importance_csvs = tuple(f'{MODELS}/{target}_feature_importance.csv' for target in TARGETS)
+    figure_dir = 'igs_ml/output/figures'
+    stages += [
+        Stage('plot_feature_importance', 'igs_ml/src/visualization/plot_feature_importance.py',
+              inputs=importance_csvs, outputs=(f'{figure_dir}/feature_importance',),
+              cwd='igs_ml/output'),
+        Stage('plot_correlation_heatmap', 'igs_ml/src/visualization/plot_correlation_heatmap.py',
+              inputs=(IGS_DATA,), outputs=(f'{figure_dir}/correlation_heatmap.png',),
+              cwd='igs_ml/output'),
+        Stage('plot_scatter_plots', 'igs_ml/src/visualization/plot_scatter_plots.py',
+              inputs=(IGS_DATA,), outputs=tuple(
+                  f'{figure_dir}/scatter_{name}.png' for name in
+                  ('median_income_vs_community_score', 'housing_cost_burden_vs_igs_score',
+                   'broadband_access_vs_economy_score')),
+              args=render_args, cwd='igs_ml/output'),
+        Stage('visualize_results', 'igs_ml/src/visualization/visualize_results.py',
+              inputs=(IGS_DATA, f'{MODELS}/intervention_comparison.csv') + importance_csvs,
+              outputs=(figure_dir,), args=render_args, cwd='igs_ml/output'),
+        Stage('visualize_tract_20800', 'igs_ml/src/visualization/visualize_tract_20800.py',
+              inputs=(IGS_DATA,), outputs=('igs_ml/output/figures_tract_20800',),
+              args=render_args, cwd='igs_ml/output'),
+        Stage('plot_indicator_trends_20800',
+              'igs_ml/src/visualization/plot_indicator_trends_20800.py',
+              inputs=(IGS_DATA,), outputs=('igs_ml/output/figures_tract_20800/indicator_trends',),
+              cwd='igs_ml/output'),
+        Stage('plot_igs_benchmark_trends', 'igs_ml/src/visualization/plot_igs_benchmark_trends.py',
+              inputs=(f'{IGS_EXPORTS}/Inclusive_Growth_Score_Data_Export_21-11-2025_055105'
+                      ' - Compared to State.csv',
+                      f'{IGS_EXPORTS}/Inclusive_Growth_Score_Data_Export_21-11-2025_055105'
+                      ' - Compared to USA.csv',
+                      'data_cleaned/tract_20800_cleaned.csv'),
+              outputs=('igs_ml/Slide_4_Benchmark/igs_benchmark_trends_2020_2024.png',),
+              args=render_args),
+    ]
+    return resolve_dependencies(stages)
+
+
+def _overlaps(a, b):
+    """True if two root-relative paths are equal or one contains the other."""
+    a, b = Path(a), Path(b)
+    return a == b or a in b.parents or b in a.parents
+
+
+def resolve_dependencies(stages):
+    """Link each input to the most recent earlier stage that writes it."""
+    for i, stage in enumerate(stages):
+        for path in stage.inputs:
+            for producer in reversed(stages[:i]):
+                if any(_overlaps(path, out) for out in producer.outputs):
+                    stage.deps.add(producer.name)
+                    break
+    return {stage.name: stage for stage in stages}
+
+
+def _module_file(name, search):
+    for base in search:
+        path = base.joinpath(*name.split('.'))
+        for candidate in (path.with_suffix('.py'), path / '__init__.py'):
+            if candidate.is_file():
+                return candidate
+    return None
+
+
+@lru_cache(maxsize=None)
+def source_imports(script):
+    """
+    Project modules a script imports, directly or through other project
+    modules, as sorted root-relative paths.
+
+    Names resolve against the script's directory and igs_ml/src (what the
+    scripts put on sys.path); stdlib and third-party imports resolve to
+    nothing and are ignored. The imports are parsed with ast because the
+    src directories are namespace packages, which modulefinder cannot load.
+    """
+    script = PROJECT_ROOT / script
+    if not script.is_file():
+        return ()
+    search = (script.parent, SRC_DIR)
+    found, pending = set(), [script]
+    while pending:
+        path = pending.pop()
+        for node in ast.walk(ast.parse(path.read_bytes(), str(path))):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                # `from package import module` names the module in the fromlist
+                names = [node.module] + [f'{node.module}.{alias.name}' for alias in node.names]
+            else:
+                continue
+            for name in names:
+                module = _module_file(name, search)
+                if module and module != script and module not in found:
+                    found.add(module)
+                    pending.append(module)
+    return tuple(sorted(str(path.relative_to(PROJECT_ROOT)) for path in found))
+
+
+class ContentHasher:
+    """sha256 of files and directories, reusing digests of unchanged files."""
+
+    def __init__(self, cache=None):
+        # path -> [size, mtime_ns, digest]
+        self.cache = cache if cache is not None else {}
+
+    def file_digest(self, path):
+        stat = path.stat()
+        key = str(path.relative_to(PROJECT_ROOT))
+        cached = self.cache.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self.cache[key] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def digest(self, relpath):
+        """Content hash of a file or directory tree; None if missing."""
+        path = PROJECT_ROOT / relpath
+        if path.is_file():
+            return self.file_digest(path)
+        if not path.is_dir():
+            return None
+        digest = hashlib.sha256()
+        for child in sorted(path.rglob('*')):
+            if child.is_file() and '__pycache__' not in child.parts:
+                digest.update(str(child.relative_to(path)).encode())
+                digest.update(self.file_digest(child).encode())
+        return digest.hexdigest()
+
+
+class PipelineRunner:
+    """
+    Run the stage DAG, skipping up-to-date stages.
+
+    Parameters:
+    -----------
+    stages : dict
+        name -> Stage, in declaration order
+    jobs : int
+        Maximum stages running at once
+    force : set of str
+        Stage names to run even if up to date
+    dry_run : bool
+        Report the plan without running anything
+    """
+
+    def __init__(self, stages, jobs=os.cpu_count() or 1, force=(), dry_run=False):
+        self.stages = stages
+        self.jobs = jobs
+        self.force = set(force)
+        self.dry_run = dry_run
+        self.state = json.loads(STATE_PATH.read_text()) if STATE_PATH.exists() else {}
+        self.hasher = ContentHasher(self.state.setdefault('files', {}))
+        self.state.setdefault('stages', {})
+        self.status = {}
+
+    def fingerprint(self, stage):
+        """Hash of everything that determines a stage's outputs."""
+        payload = {
+            'script': self.hasher.digest(stage.script),
+            'imports': {path: self.hasher.digest(path) for path in source_imports(stage.script)},
+            'args': list(stage.args),
+            'inputs': {path: self.hasher.digest(path) for path in stage.inputs},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def outputs_exist(self, stage):
+        return all((PROJECT_ROOT / path).exists() for path in stage.outputs)
+
+    def plan(self, stage):
+        """
+        Decide what to do with a stage whose dependencies have finished.
+
+        Returns:
+        --------
+        str
+            'run', 'skip', 'unavailable' or 'blocked'
+        """
+        dep_status = [self.status[dep] for dep in stage.deps]
+        if any(status in ('failed', 'blocked', 'missing') for status in dep_status):
+            return 'blocked'
+        upstream_ran = any(status == 'ran' for status in dep_status)
+        if self.dry_run and upstream_ran:
+            # Inputs may not exist yet; the upstream run would create them
+            return 'run'
+        if any(not (PROJECT_ROOT / path).exists() for path in stage.inputs):
+            return 'unavailable'
+        previous = self.state['stages'].get(stage.name, {})
+        if (stage.name not in self.force and self.outputs_exist(stage)
+                and previous.get('fingerprint') == self.fingerprint(stage)):
+            return 'skip'
+        return 'run'
+
+    def execute(self, stage):
+        """Run one stage's script in a subprocess; return (ok, seconds)."""
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        env = dict(os.environ, MPLBACKEND='Agg', PYTHONUNBUFFERED='1')
+        command = [sys.executable, str(PROJECT_ROOT / stage.script), *stage.args]
+        start = time.perf_counter()
+        with open(LOG_DIR / f'{stage.name}.log', 'w') as log:
+            returncode = subprocess.run(command, cwd=PROJECT_ROOT / stage.cwd, env=env,
+                                        stdout=log, stderr=subprocess.STDOUT).returncode
+        return returncode == 0, time.perf_counter() - start
+
+    def finish(self, stage, ok, seconds):
+        if ok and self.outputs_exist(stage):
+            # Fingerprint after the run so in-place stages see their own output
+            self.state['stages'][stage.name] = {
+                'fingerprint': self.fingerprint(stage),
+                'finished': datetime.now().isoformat(timespec='seconds'),
+                'seconds': round(seconds, 3),
+            }
+            self.status[stage.name] = 'ran'
+            print(f"  ✓ {stage.name:<36} ran in {seconds:.1f}s")
+        else:
+            reason = 'exit status' if not ok else 'missing outputs'
+            self.status[stage.name] = 'failed'
+            print(f"  ✗ {stage.name:<36} failed ({reason}; see {LOG_DIR / stage.name}.log)")
+
+    def resolve(self, stage, action):
+        """Record a stage that does not need a subprocess."""
+        if action == 'skip':
+            self.status[stage.name] = 'skipped'
+            print(f"  - {stage.name:<36} up to date")
+        elif action == 'unavailable':
+            # Missing source data: committed outputs stand in for the stage
+            self.status[stage.name] = 'unavailable' if self.outputs_exist(stage) else 'missing'
+            print(f"  ? {stage.name:<36} inputs unavailable"
+                  + ("" if self.outputs_exist(stage) else " and no outputs"))
+        elif action == 'blocked':
+            self.status[stage.name] = 'blocked'
+            print(f"  ✗ {stage.name:<36} blocked by upstream failure")
+        else:
+            self.status[stage.name] = 'ran'
+            print(f"  • {stage.name:<36} would run")
+
+    def run(self, selected):
+        pending = [name for name in self.stages if name in selected]
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while pending or running:
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if not all(dep in self.status for dep in stage.deps & selected):
+                        continue
+                    if len(running) >= self.jobs:
+                        break
+                    pending.remove(name)
+                    action = self.plan(stage)
+                    if action == 'run' and not self.dry_run:
+                        running[pool.submit(self.execute, stage)] = stage
+                    else:
+                        self.resolve(stage, action)
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.finish(running.pop(future), *future.result())
+                    self.save()
+        return self.status
+
+    def save(self):
+        if self.dry_run:
+            return
+        PIPELINE_DIR.mkdir(parents=True, exist_ok=True)
+        STATE_PATH.write_text(json.dumps(self.state, indent=2, sort_keys=True))
+
+
+def with_upstream(stages, names):
+    """Selected stages plus everything they depend on."""
+    selected, queue = set(), list(names)
+    while queue:
+        name = queue.pop()
+        if name not in selected:
+            selected.add(name)
+            queue.extend(stages[name].deps)
+    return selected
+
+
+def main():
+    stages = build_stages()
+    parser = argparse.ArgumentParser(description='Run the IGS pipeline, redoing only what changed')
+    parser.add_argument('stages', nargs='*', metavar='stage',
+                        help='Stages to bring up to date (default: all)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--force', nargs='*', metavar='stage',
+                        help='Re-run these stages (all selected stages if none given)')
+    parser.add_argument('--dry-run', action='store_true', help='Show the plan only')
+    parser.add_argument('--list', action='store_true', help='List stages and dependencies')
+    args = parser.parse_args()
+
+    unknown = set(args.stages + (args.force or [])) - set(stages)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))} (see --list)")
+
+    if args.list:
+        for stage in stages.values():
+            deps = ', '.join(sorted(stage.deps)) or '-'
+            print(f"{stage.name:<36} <- {deps}")
+        return
+
+    selected = with_upstream(stages, args.stages) if args.stages else set(stages)
+    force = selected if args.force == [] else set(args.force or ())
+
+    print("=" * 70)
+    print("IGS PIPELINE" + (" (dry run)" if args.dry_run else ""))
+    print("=" * 70)
+    start = time.perf_counter()
+    status = PipelineRunner(stages, jobs=args.jobs, force=force, dry_run=args.dry_run).run(selected)
+
+    counts = {}
+    for value in status.values():
+        label = 'would run' if args.dry_run and value == 'ran' else value
+        counts[label] = counts.get(label, 0) + 1
+    print(f"\n✓ {len(status)} stages in {time.perf_counter() - start:.1f}s: "
+          + ', '.join(f"{n} {label}" for label, n in sorted(counts.items())))
+    if any(value in ('failed', 'blocked') for value in status.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,408 @@
+"""
+Stage-Level Timing and Profiling Instrumentation
+
+Lightweight timers for the pipeline scripts that record, per stage:
+- wall and CPU time
+- resident memory at start/end and the peak sampled during the stage
+- optionally a cProfile capture (saved as .prof plus the top functions)
+
+Stages are opened with the ``stage`` context manager, the ``timed``
+decorator, or ``steps`` for flat scripts that run section after section.
+Nothing is recorded unless tracing is switched on, so the calls can stay in
+the scripts permanently:
+
+    IGS_TRACE=1 python src/modeling/train_ml_model.py          # default path
+    IGS_TRACE=trace.json IGS_PROFILE=1 python ...               # + cProfile
+
+Traces are written as JSON when the process exits (default location
+output/traces/<script>_<timestamp>_<pid>.json).
+
+Any script can also be traced without touching its code by running it through
+this module, which additionally hooks common hot spots (CSV/Excel reads and
+writes, savefig, forest fits, cross-validation, joblib load/dump):
+
+    python src/profiling/instrumentation.py [--profile] [-o trace.json] script.py [args...]
+"""
+
+import argparse
+import atexit
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import re
+import runpy
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TRACE_ENV = 'IGS_TRACE'
+PROFILE_ENV = 'IGS_PROFILE'
+RSS_INTERVAL_ENV = 'IGS_RSS_INTERVAL'
+DEFAULT_TRACE_DIR = Path(__file__).resolve().parents[2] / 'output' / 'traces'
+PROFILE_TOP_N = 15
+
+try:
+    import psutil
+except ImportError:  # psutil is optional; fall back to /proc or getrusage
+    psutil = None
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (best available source)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1e6
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KB on Linux, bytes on macOS
+        return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+class Tracer:
+    """Collects stage events and writes them as a JSON trace."""
+
+    def __init__(self, name: str, output: Optional[Path] = None, enabled: bool = True,
+                 profile: bool = False, rss_interval: float = 0.05):
+        """
+        Parameters:
+        -----------
+        name : str
+            Trace name (usually the script name)
+        output : Path
+            JSON trace path (defaults to output/traces/<name>_<timestamp>_<pid>.json)
+        enabled : bool
+            When False, stages cost one attribute check and record nothing
+        profile : bool
+            Capture a cProfile per top-level profiled stage
+        rss_interval : float
+            Seconds between memory samples while stages are open
+        """
+        self.name = name
+        self.enabled = enabled
+        self.profile = profile
+        self.rss_interval = rss_interval
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # The pid keeps parallel runs started in the same second apart
+        self.output = (Path(output) if output
+                       else DEFAULT_TRACE_DIR / f'{name}_{stamp}_{os.getpid()}.json')
+        self.events: List[Dict] = []
+        self._open: List[Dict] = []
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop = threading.Event()
+        self._profiling = False
+        self._t0 = time.perf_counter()
+        self._started = datetime.now().isoformat(timespec='seconds')
+        self._written = False
+
+    # -- memory sampling -------------------------------------------------
+    def _sample(self):
+        while not self._stop.wait(self.rss_interval):
+            rss = current_rss_mb()
+            with self._lock:
+                for event in self._open:
+                    event['rss_peak_mb'] = max(event['rss_peak_mb'], rss)
+
+    def _ensure_sampler(self):
+        if self._sampler is None and self.rss_interval > 0:
+            self._sampler = threading.Thread(target=self._sample, daemon=True)
+            self._sampler.start()
+
+    # -- stages ----------------------------------------------------------
+    @contextlib.contextmanager
+    def stage(self, name: str, **meta):
+        """Time a block; nested stages record their parent path."""
+        if not self.enabled:
+            yield
+            return
+
+        self._ensure_sampler()
+        rss = current_rss_mb()
+        parent = self._open[-1] if self._open else None
+        event = {
+            'id': len(self.events),
+            'name': name,
+            'path': f"{parent['path']}/{name}" if parent else name,
+            'parent': parent['id'] if parent else None,
+            'start_s': time.perf_counter() - self._t0,
+            'rss_start_mb': rss,
+            'rss_peak_mb': rss,
+            'meta': {k: v if isinstance(v, (int, float, str, bool, type(None))) else str(v)
+                     for k, v in meta.items()},
+        }
+        with self._lock:
+            self.events.append(event)
+            self._open.append(event)
+
+        profiler = None
+        if self.profile and not self._profiling:
+            # Only one profiler can be active; nested stages share the outer one
+            profiler = cProfile.Profile()
+            self._profiling = True
+            profiler.enable()
+
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        except BaseException as exc:
+            event['error'] = type(exc).__name__
+            raise
+        finally:
+            event['wall_s'] = time.perf_counter() - wall0
+            event['cpu_s'] = time.process_time() - cpu0
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+                self._save_profile(event, profiler)
+            rss = current_rss_mb()
+            with self._lock:
+                event['rss_end_mb'] = rss
+                event['rss_peak_mb'] = max(event['rss_peak_mb'], rss)
+                self._open.remove(event)
+
+    def _save_profile(self, event: Dict, profiler: cProfile.Profile):
+        safe = re.sub(r'[^A-Za-z0-9_.-]+', '_', event['path'])[:80]
+        prof_path = self.output.with_name(f"{self.output.stem}_{event['id']:03d}_{safe}.prof")
+        prof_path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(prof_path)
+        stats = pstats.Stats(profiler, stream=io.StringIO()).sort_stats('cumulative')
+        top = []
+        for (filename, line, func), (_, ncalls, tottime, cumtime, _) in list(
+                sorted(stats.stats.items(), key=lambda item: -item[1][3]))[:PROFILE_TOP_N]:
+            top.append({'function': f'{Path(filename).name}:{line}({func})',
+                        'ncalls': ncalls, 'tottime_s': tottime, 'cumtime_s': cumtime})
+        event['profile_file'] = str(prof_path)
+        event['profile_top'] = top
+
+    def timed(self, name: Optional[str] = None):
+        """Decorator form of stage (defaults to the function's qualified name)."""
+        def decorator(func):
+            stage_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def steps(self, prefix: Optional[str] = None) -> 'StageSequence':
+        """Sequential stages for flat scripts (each call closes the previous one)."""
+        return StageSequence(self, prefix)
+
+    # -- output ----------------------------------------------------------
+    def summary(self) -> Dict:
+        total = time.perf_counter() - self._t0
+        return {
+            'name': self.name,
+            'argv': sys.argv,
+            'started': self._started,
+            'total_wall_s': total,
+            'peak_rss_mb': max([e['rss_peak_mb'] for e in self.events] + [current_rss_mb()]),
+            'events': self.events,
+        }
+
+    def write(self) -> Optional[Path]:
+        """Write the JSON trace (once); returns its path."""
+        if not self.enabled or self._written:
+            return None
+        self._stop.set()
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.output.with_name(f'{self.output.name}.{os.getpid()}.tmp')
+        try:
+            tmp_path.write_text(json.dumps(self.summary(), indent=2))
+            os.replace(tmp_path, self.output)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self._written = True
+        print(f"✓ Trace written: {self.output}", file=sys.stderr)
+        return self.output
+
+
+class StageSequence:
+    """Opens one stage per call and closes the previous stage."""
+
+    def __init__(self, tracer: Tracer, prefix: Optional[str] = None):
+        self.tracer = tracer
+        self.prefix = prefix
+        self._outer = None
+        self._current = None
+
+    def __call__(self, name: str, **meta):
+        self._close_current()
+        if self.prefix and self._outer is None:
+            self._outer = self.tracer.stage(self.prefix)
+            self._outer.__enter__()
+        self._current = self.tracer.stage(name, **meta)
+        self._current.__enter__()
+
+    def _close_current(self):
+        if self._current is not None:
+            self._current.__exit__(None, None, None)
+            self._current = None
+
+    def done(self):
+        """Close the last step (and the prefix stage)."""
+        self._close_current()
+        if self._outer is not None:
+            self._outer.__exit__(None, None, None)
+            self._outer = None
+
+
+_TRACER: Optional[Tracer] = None
+
+
+def configure(name: Optional[str] = None, output=None, profile: Optional[bool] = None,
+              hooks: bool = False) -> Tracer:
+    """
+    Create the process-wide tracer (enabled tracing, written at exit).
+
+    Parameters:
+    -----------
+    name : str
+        Trace name (defaults to the running script's name)
+    output : str or Path
+        Trace path (defaults to the IGS_TRACE value or output/traces/)
+    profile : bool
+        Capture cProfile per stage (defaults to IGS_PROFILE)
+    hooks : bool
+        Also time library hot spots (see install_hooks)
+    """
+    global _TRACER
+    env_trace = os.environ.get(TRACE_ENV, '')
+    if output is None and env_trace not in ('', '0', '1', 'true'):
+        output = env_trace
+    if profile is None:
+        profile = os.environ.get(PROFILE_ENV, '') not in ('', '0')
+    _TRACER = Tracer(name or Path(sys.argv[0] or 'python').stem, output=output,
+                     enabled=True, profile=profile,
+                     rss_interval=float(os.environ.get(RSS_INTERVAL_ENV, 0.05)))
+    atexit.register(_TRACER.write)
+    if hooks:
+        install_hooks(_TRACER)
+    return _TRACER
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer; enabled only when IGS_TRACE is set."""
+    global _TRACER
+    if _TRACER is None:
+        if os.environ.get(TRACE_ENV, '') not in ('', '0'):
+            configure(hooks=True)
+        else:
+            _TRACER = Tracer('disabled', enabled=False)
+    return _TRACER
+
+
+def stage(name: str, **meta):
+    """Time a block with the process-wide tracer."""
+    return get_tracer().stage(name, **meta)
+
+
+def timed(name: Optional[str] = None):
+    """Decorator that times a function with the process-wide tracer."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().stage(name or func.__qualname__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def steps(prefix: Optional[str] = None) -> StageSequence:
+    """Sequential stages with the process-wide tracer."""
+    return get_tracer().steps(prefix)
+
+
+def _wrap(owner, attr: str, stage_name: str, describe=None):
+    """Replace owner.attr with a version that runs inside a stage."""
+    original = getattr(owner, attr)
+    if getattr(original, '_igs_traced', False):
+        return
+
+    @functools.wraps(original)
+    def wrapper(*args, **kwargs):
+        meta = describe(*args, **kwargs) if describe else {}
+        with get_tracer().stage(stage_name, **meta):
+            return original(*args, **kwargs)
+
+    wrapper._igs_traced = True
+    setattr(owner, attr, wrapper)
+
+
+def install_hooks(tracer: Tracer):
+    """
+    Time common library hot spots as stages.
+
+    Covers pandas read_csv/read_excel/to_csv, matplotlib savefig (with dpi),
+    RandomForestRegressor.fit, sklearn cross_val_score, and joblib load/dump.
+    Patches module attributes, so code that binds a function by name must
+    import it after this runs (the command-line runner guarantees that).
+    """
+    def first_arg(*args, **kwargs):
+        return {'target': str(args[0]) if args else ''}
+
+    with contextlib.suppress(ImportError):
+        import pandas as pd
+        _wrap(pd, 'read_csv', 'io:read_csv', first_arg)
+        _wrap(pd, 'read_excel', 'io:read_excel', first_arg)
+        _wrap(pd.DataFrame, 'to_csv', 'io:to_csv',
+              lambda self, *a, **k: {'target': str(a[0]) if a else '', 'rows': len(self)})
+
+    with contextlib.suppress(ImportError):
+        import matplotlib.figure
+        import matplotlib.pyplot as plt
+
+        def savefig_meta(*args, **kwargs):
+            names = [a for a in args if isinstance(a, (str, os.PathLike))]
+            return {'target': str(names[0]) if names else '', 'dpi': kwargs.get('dpi', 'figure')}
+        _wrap(matplotlib.figure.Figure, 'savefig', 'plot:savefig', savefig_meta)
+        _wrap(plt, 'savefig', 'plot:savefig', savefig_meta)
+
+    with contextlib.suppress(ImportError):
+        import sklearn.ensemble
+        import sklearn.model_selection
+        from sklearn.model_selection import _validation
+        _wrap(sklearn.ensemble.RandomForestRegressor, 'fit', 'sklearn:forest_fit',
+              lambda self, X, *a, **k: {'rows': len(X), 'trees': self.n_estimators})
+        for owner in (sklearn.model_selection, _validation):
+            _wrap(owner, 'cross_val_score', 'sklearn:cross_val_score',
+                  lambda est, X, *a, **k: {'rows': len(X), 'cv': str(k.get('cv', 5))})
+
+    with contextlib.suppress(ImportError):
+        import joblib
+        _wrap(joblib, 'load', 'io:joblib_load', first_arg)
+        _wrap(joblib, 'dump', 'io:joblib_dump',
+              lambda value, filename, *a, **k: {'target': str(filename)})
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run a pipeline script with stage timing and JSON tracing')
+    parser.add_argument('-o', '--output', help='Trace JSON path')
+    parser.add_argument('--profile', action='store_true', help='Capture cProfile per stage')
+    parser.add_argument('script', help='Python script to run')
+    parser.add_argument('args', nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    script = Path(args.script).resolve()
+    tracer = configure(script.stem, output=args.output, profile=args.profile, hooks=True)
+    sys.argv = [str(script)] + args.args
+    sys.path.insert(0, str(script.parent))
+    with tracer.stage(script.stem):
+        runpy.run_path(str(script), run_name='__main__')
+
+
+if __name__ == '__main__':
+    main()
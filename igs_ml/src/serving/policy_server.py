@@ -0,0 +1,294 @@
+"""
+Policy Simulation Server
+
+Long-running asyncio HTTP service for the dashboard's policy simulation.
+Unlike run_policy_simulation.py, which loads the models for every request,
+the server loads the augmented pillar models once. Every request's
+baseline + intervention rows go through a MicroBatchDispatcher, so
+concurrent requests arriving within the batching window share one
+scaler.transform + model.predict call per model.
+
+Endpoints:
+    POST /simulate  {"housing_reduction": 10, "education_increase": 5, "business_increase": 3}
+                    -> baseline, intervention and impacts per pillar score
+    GET  /health    -> dispatcher batch statistics
+
+SIGTERM / SIGINT stop the server gracefully: it stops accepting, answers
+the requests already received, closes idle keep-alive connections, and
+flushes the dispatcher. For a multi-core deployment run it under
+worker_pool.py, which forks several of these servers over shared models.
+
+With --watch, a ModelWatcher picks up retrained models: they are loaded and
+checked on canary slider settings in a background thread, then swapped into
+the dispatcher between batches.
+
+Usage:
+    python src/serving/policy_server.py --port 8765
+    python src/serving/policy_server.py --window-ms 5 --max-batch 2048
+    python src/serving/policy_server.py --watch 5
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import signal
+import traceback
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.model_watcher import ModelWatcher, load_bundle  # noqa: E402
+from analysis.policy_scenario import canary_rows, policy_rows  # noqa: E402
+from serving.dispatcher import DEFAULT_MAX_BATCH, DEFAULT_WINDOW, MicroBatchDispatcher  # noqa: E402
+
+# Paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+PROJECT_ROOT = BASE_DIR.parent
+MODELS_DIR = PROJECT_ROOT / 'igs_plus_more_data' / 'models_augmented'
+
+SLIDERS = ('housing_reduction', 'education_increase', 'business_increase')
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+# Largest request body accepted (the simulate payload is ~100 bytes)
+MAX_BODY_BYTES = 64 * 1024
+
+# Seconds a stopping server waits for in-flight requests
+DRAIN_TIMEOUT = 10.0
+
+
+class PolicyServer:
+    """
+    HTTP front end over a MicroBatchDispatcher.
+
+    Parameters:
+    -----------
+    dispatcher : MicroBatchDispatcher
+        Batching predictor over the pillar models
+    info : dict, optional
+        Extra fields reported by /health (e.g. worker pid, model version)
+    """
+
+    def __init__(self, dispatcher: MicroBatchDispatcher, info: Optional[Dict] = None):
+        self.dispatcher = dispatcher
+        self.info = dict(info or {})
+        self.watcher: Optional[ModelWatcher] = None
+        # writer -> True while a request on that connection is being answered
+        self._connections: Dict[asyncio.StreamWriter, bool] = {}
+        self._stopping: Optional[asyncio.Event] = None
+
+    @classmethod
+    def from_models_dir(cls, models_dir=MODELS_DIR, window: float = DEFAULT_WINDOW,
+                        max_batch: int = DEFAULT_MAX_BATCH,
+                        watch: Optional[float] = None) -> 'PolicyServer':
+        """
+        Load the models from a directory.
+
+        Parameters:
+        -----------
+        watch : float, optional
+            Check models_dir for retrained models every `watch` seconds and
+            hot-swap them in (default: load once)
+        """
+        bundle = load_bundle(models_dir)
+        server = cls(MicroBatchDispatcher(bundle.models, bundle.scalers, bundle.schemas,
+                                          window, max_batch),
+                     info={'model_version': bundle.version})
+        if watch:
+            server.watcher = ModelWatcher(models_dir, canary=canary_rows(), bundle=bundle,
+                                          interval=watch, on_swap=server._install)
+        return server
+
+    def _install(self, bundle, previous):
+        self.dispatcher.swap(bundle.models, bundle.scalers, bundle.schemas)
+        self.info['model_version'] = bundle.version
+
+    async def simulate(self, params: Dict) -> Tuple[int, Dict]:
+        """Score one slider setting; returns (HTTP status, payload)."""
+        try:
+            values = [float(params.get(name, 0)) for name in SLIDERS]
+        except (TypeError, ValueError):
+            return 400, {'error': f"{', '.join(SLIDERS)} must be numbers"}
+        if not all(math.isfinite(value) for value in values):
+            return 400, {'error': f"{', '.join(SLIDERS)} must be finite numbers"}
+        if any(value < 0 for value in values):
+            return 400, {'error': 'All intervention values must be non-negative'}
+
+        baseline, intervention = policy_rows(*values)
+        scores = await self.dispatcher.predict([baseline, intervention])
+        baseline_pred = {target: float(pred[0]) for target, pred in scores.items()}
+        intervention_pred = {target: float(pred[1]) for target, pred in scores.items()}
+        return 200, {
+            'baseline': baseline_pred,
+            'intervention': intervention_pred,
+            'impacts': {target: intervention_pred[target] - baseline_pred[target]
+                        for target in scores},
+            'scenario': {
+                'housing_burden': intervention['housing_cost_burden_pct'],
+                'early_education': intervention['early_education_enrollment_pct'],
+                'minority_business': intervention['minority_owned_businesses_pct'],
+            },
+        }
+
+    async def route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict]:
+        path = path.split('?', 1)[0]
+        if path == '/health':
+            return 200, {'status': 'ok', **self.info, **self.dispatcher.stats}
+        if path != '/simulate':
+            return 404, {'error': f'Unknown path {path}'}
+        if method != 'POST':
+            return 405, {'error': 'Use POST'}
+        try:
+            params = json.loads(body or b'{}')
+        except json.JSONDecodeError:
+            return 400, {'error': 'Body must be JSON'}
+        if not isinstance(params, dict):
+            return 400, {'error': 'Body must be a JSON object'}
+        return await self.simulate(params)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve HTTP/1.1 requests on one connection (keep-alive aware)."""
+        self._connections[writer] = False
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                self._connections[writer] = True
+                headers = {}
+                try:
+                    method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                    while True:
+                        line = await reader.readline()
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError(f'negative Content-Length {length}')
+                except ValueError as exc:
+                    # The rest of the stream cannot be framed: answer, then close
+                    await self._respond(writer, 400, {'error': f'Malformed request: {exc}'}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': 'Request body too large'}, False)
+                    break
+                body = await reader.readexactly(length)
+
+                try:
+                    status, payload = await self.route(method, path, body)
+                except ValueError as exc:
+                    status, payload = 400, {'error': str(exc)}
+                except Exception as exc:
+                    traceback.print_exc()
+                    status, payload = 500, {'error': f'{type(exc).__name__}: {exc}'}
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and not self.stopping)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+                self._connections[writer] = False
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # Client went away mid-request
+            pass
+        finally:
+            del self._connections[writer]
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Dict,
+                       keep_alive: bool):
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            .encode() + data)
+        await writer.drain()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stopping is not None and self._stopping.is_set()
+
+    def stop(self):
+        """Ask a running serve() to drain and return."""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8765, sock=None,
+                    on_start=None):
+        """
+        Serve until SIGTERM / SIGINT or stop(), then drain.
+
+        Parameters:
+        -----------
+        host, port : str, int
+            Address to bind (ignored when `sock` is given)
+        sock : socket.socket, optional
+            Already-listening socket, e.g. one inherited from a pre-fork master
+        on_start : callable, optional
+            Called once the server is accepting connections
+        """
+        loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, self.stop)
+
+        if sock is None:
+            server = await asyncio.start_server(self.handle, host, port)
+            print(f"✓ Serving policy simulations on http://{host}:{port} "
+                  f"(window {self.dispatcher.window * 1000:.1f} ms, "
+                  f"max batch {self.dispatcher.max_batch} rows)")
+        else:
+            server = await asyncio.start_server(self.handle, sock=sock)
+        if self.watcher is not None:
+            self.watcher.start()
+        if on_start is not None:
+            on_start()
+        try:
+            await self._stopping.wait()
+        finally:
+            if self.watcher is not None:
+                self.watcher.stop()
+            await self._drain(server)
+
+    async def _drain(self, server: asyncio.AbstractServer):
+        # Stop accepting; idle keep-alive connections are closed now, busy
+        # ones after their response (handle sends Connection: close)
+        server.close()
+        for writer, busy in list(self._connections.items()):
+            if not busy:
+                writer.close()
+        deadline = asyncio.get_running_loop().time() + DRAIN_TIMEOUT
+        while self._connections and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.05)
+        await self.dispatcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve batched policy simulations over HTTP')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--models-dir', type=Path, default=MODELS_DIR)
+    parser.add_argument('--window-ms', type=float, default=DEFAULT_WINDOW * 1000,
+                        help='Batching window after the first request of a batch')
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                        help='Rows that flush a batch immediately')
+    parser.add_argument('--watch', type=float, default=None, metavar='SECONDS',
+                        help='Hot-reload retrained models, checking this often')
+    args = parser.parse_args()
+
+    server = PolicyServer.from_models_dir(args.models_dir, args.window_ms / 1000,
+                                          args.max_batch, args.watch)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+Pre-fork Policy Simulation Workers
+
+Multi-process serving mode for the policy simulation server. One Python
+process scores on one core at a time (the GIL), so the master:
+1. Loads the augmented pillar models once and freezes them out of the
+   garbage collector (gc.freeze), so no process writes to their pages
+2. Binds the listening socket
+3. Forks N workers; each runs a PolicyServer + MicroBatchDispatcher on the
+   inherited socket and the kernel spreads connections across them
+
+The forest node arrays are shared copy-on-write with the master: prediction
+only reads them, so N workers cost about one copy of the models plus a small
+private heap each (see `private_mb` in each worker's /health).
+
+Health checks:
+- Every worker stamps a heartbeat into a shared mmap from its event loop.
+  The master restarts workers that exit or miss heartbeats for
+  HEARTBEAT_TIMEOUT seconds.
+- GET /health on any worker reports its pid, generation, model version,
+  memory, and batch statistics.
+
+Signals (to the master):
+    SIGHUP          graceful reload: load the models from disk again, check
+                    them on the canary slider settings, start a new
+                    generation of workers, then drain the old one once
+                    every new worker is serving. A failed load or canary
+                    check keeps the running workers.
+    SIGTERM/SIGINT  drain every worker and exit
+
+With --watch the master also polls the models directory (ModelWatcher) and
+reloads by itself once a retraining run has finished writing its manifest.
+
+Usage:
+    python src/serving/worker_pool.py --workers 4 --port 8765
+    python src/serving/worker_pool.py --workers 4 --watch 5
+    kill -HUP <master pid>     # after retraining
+"""
+
+import argparse
+import asyncio
+import gc
+import mmap
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from modeling.model_watcher import ModelBundle, ModelWatcher, load_bundle  # noqa: E402
+from analysis.policy_scenario import canary_rows  # noqa: E402
+from serving.dispatcher import DEFAULT_MAX_BATCH, DEFAULT_WINDOW, MicroBatchDispatcher  # noqa: E402
+from serving.policy_server import DRAIN_TIMEOUT, MODELS_DIR, PolicyServer  # noqa: E402
+
+HEARTBEAT_INTERVAL = 1.0
+HEARTBEAT_TIMEOUT = 10.0
+# Seconds a new worker may take to start serving
+STARTUP_TIMEOUT = 30.0
+# Minimum seconds between two starts of the same slot (crash-loop damping)
+RESPAWN_DELAY = 1.0
+
+
+def memory_mb(pid='self') -> Dict[str, float]:
+    """Resident, proportional, and private memory of a process in MB (Linux)."""
+    fields = {'Rss': 'rss_mb', 'Pss': 'pss_mb', 'Private_Clean': 'private_mb',
+              'Private_Dirty': 'private_mb'}
+    usage = dict.fromkeys(fields.values(), 0.0)
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                if name in fields:
+                    usage[fields[name]] += int(value.split()[0]) / 1024
+    except OSError:
+        return {}
+    return {key: round(value, 1) for key, value in usage.items()}
+
+
+class _Worker:
+    __slots__ = ('pid', 'slot', 'generation', 'started')
+
+    def __init__(self, pid, slot, generation, started):
+        self.pid = pid
+        self.slot = slot
+        self.generation = generation
+        self.started = started
+
+
+class PreforkServer:
+    """
+    Master process of the pre-fork policy server.
+
+    Parameters:
+    -----------
+    models_dir : str or Path
+        Directory with the augmented pillar models
+    workers : int
+        Number of worker processes (default: one per core)
+    host, port : str, int
+        Address every worker serves on
+    window, max_batch : float, int
+        Batching settings of each worker's dispatcher
+    watch : float, optional
+        Poll the models directory this often and reload retrained models
+    """
+
+    def __init__(self, models_dir=MODELS_DIR, workers: Optional[int] = None,
+                 host: str = '127.0.0.1', port: int = 8765,
+                 window: float = DEFAULT_WINDOW, max_batch: int = DEFAULT_MAX_BATCH,
+                 watch: Optional[float] = None):
+        self.models_dir = Path(models_dir)
+        self.n_workers = workers or os.cpu_count() or 1
+        self.host = host
+        self.port = port
+        self.window = window
+        self.max_batch = max_batch
+        self.watch = watch
+
+        self.generation = 0
+        self.bundle: Optional[ModelBundle] = None
+        self.watcher: Optional[ModelWatcher] = None
+        self._last_poll = 0.0
+        self.workers: Dict[int, _Worker] = {}
+        self._slot_started: Dict[int, float] = {}
+        self._sock: Optional[socket.socket] = None
+        # Two slots per worker: old and new generation overlap during a reload
+        self._heartbeat_map = mmap.mmap(-1, 2 * self.n_workers * 8)
+        self._heartbeats = np.frombuffer(self._heartbeat_map, dtype=np.float64)
+        self._reload_requested = False
+        self._stop_requested = False
+        self._pending_generation: Optional[int] = None
+
+    # ------------------------------------------------------------------ master
+
+    def load(self):
+        """Load the models into the master so forked workers share them."""
+        self._install(load_bundle(self.models_dir))
+        # Reloads (SIGHUP or --watch) go through the watcher's canary check
+        self.watcher = ModelWatcher(self.models_dir, canary=canary_rows(), bundle=self.bundle,
+                                    on_swap=self._on_swap)
+
+    def _install(self, bundle: ModelBundle):
+        # Workers are the parallelism; threads inside predict would oversubscribe
+        threads = max(1, (os.cpu_count() or 1) // self.n_workers)
+        for model in bundle.models.values():
+            if hasattr(model, 'n_jobs'):
+                model.n_jobs = threads
+
+        # Drop the previous generation's models before freezing the new ones
+        self.bundle = None
+        gc.unfreeze()
+        gc.collect()
+        self.bundle = bundle
+        # Move everything loaded so far to the permanent generation, so the
+        # collector never touches (and un-shares) the model objects' pages
+        gc.freeze()
+
+    def bind(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((self.host, self.port))
+        self._sock.listen(1024)
+        self._sock.setblocking(False)
+
+    def _free_slot(self) -> int:
+        used = {worker.slot for worker in self.workers.values()}
+        return next(slot for slot in range(len(self._heartbeats)) if slot not in used)
+
+    def _spawn(self, generation: int, slot: Optional[int] = None):
+        slot = self._free_slot() if slot is None else slot
+        self._heartbeats[slot] = 0.0
+        self._slot_started[slot] = time.monotonic()
+        pid = os.fork()
+        if pid == 0:
+            self._worker_main(slot, generation)
+        self.workers[pid] = _Worker(pid, slot, generation, time.monotonic())
+
+    def _signal(self, pids, signum):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _reap(self):
+        """Collect exited workers and replace those of the serving generation."""
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            worker = self.workers.pop(pid, None)
+            if worker is None:
+                continue
+            serving = worker.generation in (self.generation, self._pending_generation)
+            if serving and not self._stop_requested:
+                code = os.waitstatus_to_exitcode(status)
+                print(f"  ! worker {pid} exited ({code}), restarting")
+                wait = self._slot_started[worker.slot] + RESPAWN_DELAY - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                self._spawn(worker.generation, worker.slot)
+
+    def _check_heartbeats(self):
+        now = time.monotonic()
+        for worker in list(self.workers.values()):
+            beat = self._heartbeats[worker.slot]
+            if beat == 0.0:
+                # Not serving yet
+                late = now - worker.started > STARTUP_TIMEOUT
+            else:
+                late = now - beat > HEARTBEAT_TIMEOUT
+            if late and worker.generation in (self.generation, self._pending_generation):
+                print(f"  ! worker {worker.pid} missed its heartbeat, killing it")
+                # _reap restarts it
+                self._signal([worker.pid], signal.SIGKILL)
+
+    def _poll_models(self, force: bool = False):
+        if self._pending_generation is not None:
+            if force:
+                print("  - reload already in progress")
+            return
+        self._last_poll = time.monotonic()
+        # Runs in the master's own loop: the master must not start threads
+        # it would then fork
+        if not self.watcher.poll(force=force) and force:
+            print(f"  - model version {self.bundle.version} is current, nothing to reload")
+
+    def _on_swap(self, bundle: ModelBundle, previous: ModelBundle):
+        self._install(bundle)
+        self._pending_generation = self.generation + 1
+        print(f"Reloading: model version {previous.version} -> {bundle.version}")
+        for _ in range(self.n_workers):
+            self._spawn(self._pending_generation)
+
+    def _finish_reload(self):
+        """Retire the old generation once every new worker is serving."""
+        new = [w for w in self.workers.values() if w.generation == self._pending_generation]
+        if len(new) < self.n_workers or any(self._heartbeats[w.slot] == 0.0 for w in new):
+            return
+        old = [w.pid for w in self.workers.values() if w.generation != self._pending_generation]
+        self.generation, self._pending_generation = self._pending_generation, None
+        self._signal(old, signal.SIGTERM)
+        print(f"✓ Generation {self.generation} serving, draining {len(old)} old workers")
+
+    def _request_reload(self, signum, frame):
+        self._reload_requested = True
+
+    def _request_stop(self, signum, frame):
+        self._stop_requested = True
+
+    def run(self):
+        """Load, bind, fork the workers, and supervise them until stopped."""
+        if not hasattr(os, 'fork'):
+            raise RuntimeError("Pre-fork serving needs os.fork; run policy_server.py instead")
+        print("="*70)
+        print("PRE-FORK POLICY SIMULATION SERVER")
+        print("="*70)
+        self.load()
+        self.bind()
+        for _ in range(self.n_workers):
+            self._spawn(self.generation)
+        print(f"✓ Master {os.getpid()}: {self.n_workers} workers on "
+              f"http://{self.host}:{self.port} (model version {self.bundle.version})")
+
+        signal.signal(signal.SIGHUP, self._request_reload)
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        try:
+            while not self._stop_requested:
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self._poll_models(force=True)
+                elif self.watch and time.monotonic() - self._last_poll >= self.watch:
+                    self._poll_models()
+                self._reap()
+                self._check_heartbeats()
+                if self._pending_generation is not None:
+                    self._finish_reload()
+                time.sleep(HEARTBEAT_INTERVAL / 4)
+        finally:
+            self._shutdown()
+
+    def _shutdown(self):
+        print("Stopping workers...")
+        self._stop_requested = True
+        self._signal(list(self.workers), signal.SIGTERM)
+        deadline = time.monotonic() + DRAIN_TIMEOUT + 5
+        while self.workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+        self._signal(list(self.workers), signal.SIGKILL)
+        for pid in list(self.workers):
+            os.waitpid(pid, 0)
+            del self.workers[pid]
+        self._sock.close()
+        print("✓ Stopped")
+
+    # ------------------------------------------------------------------ worker
+
+    def _worker_main(self, slot: int, generation: int):
+        # Never returns: a forked child must not fall back into the master loop
+        code = 0
+        try:
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            asyncio.run(self._serve_worker(slot, generation))
+        except Exception:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            os._exit(code)
+
+    async def _serve_worker(self, slot: int, generation: int):
+        loop = asyncio.get_running_loop()
+        bundle = self.bundle
+        dispatcher = MicroBatchDispatcher(bundle.models, bundle.scalers, bundle.schemas,
+                                          self.window, self.max_batch)
+        server = PolicyServer(dispatcher, info={
+            'pid': os.getpid(), 'generation': generation, 'model_version': bundle.version})
+
+        def beat():
+            if server.stopping:
+                return
+            self._heartbeats[slot] = time.monotonic()
+            server.info.update(memory_mb())
+            loop.call_later(HEARTBEAT_INTERVAL, beat)
+
+        await server.serve(sock=self._sock, on_start=beat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve policy simulations from pre-forked workers')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: one per core)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--models-dir', type=Path, default=MODELS_DIR)
+    parser.add_argument('--window-ms', type=float, default=DEFAULT_WINDOW * 1000,
+                        help='Batching window of each worker')
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                        help='Rows that flush a batch immediately')
+    parser.add_argument('--watch', type=float, default=None, metavar='SECONDS',
+                        help='Reload retrained models automatically, checking this often')
+    args = parser.parse_args()
+
+    PreforkServer(args.models_dir, args.workers, args.host, args.port,
+                  args.window_ms / 1000, args.max_batch, args.watch).run()
+
+
+if __name__ == "__main__":
+    main()
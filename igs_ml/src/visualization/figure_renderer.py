@@ -0,0 +1,275 @@
+"""
+Figure Rendering Service
+
+The report scripts describe each figure as a FigureSpec: an output path, a
+module-level draw function that returns a matplotlib Figure, the names of
+the datasets it reads and any extra parameters. render_figures() then:
+1. Hashes every spec from its datasets, parameters, dpi and the source file
+   of its draw function
+2. Skips figures whose hash matches the render manifest and whose file
+   exists
+3. Renders the rest with the Agg backend across a process pool; datasets
+   are loaded once by the caller and shared with forked workers
+
+Each figure is drawn once and saved in every requested format: the 300-dpi
+PNG for print, SVG for vector output, compact WebP, and optionally a
+dashboard-size WebP thumbnail under thumbnails/ next to the figure.
+
+The manifest lives in the render root, next to the figures it describes.
+Scripts that share a root (igs_ml/output) each keep their own
+(.figure_manifest.<script>.json), so stages rendering in parallel never
+rewrite each other's entries; it is replaced atomically after each render.
+"""
+
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+MANIFEST_NAME = '.figure_manifest.json'
+FORMATS = ('png', 'svg', 'webp')
+THUMBNAIL_DIR = 'thumbnails'
+DASHBOARD_WIDTH = 640  # px; thumbnail width when only --thumbnails is given
+WEBP_QUALITY = 80
+
+# Worker-side datasets, set once per process by _init_worker
+_WORKER = {}
+
+
+@dataclass(frozen=True)
+class FigureSpec:
+    """
+    One figure to render.
+
+    Parameters:
+    -----------
+    output : str
+        Path relative to the render root (e.g. 'figures/trend_igs_score.png')
+    draw : callable
+        Module-level function draw(data, **params) -> Figure; `data` holds
+        only the datasets named in `data`
+    data : tuple of str
+        Dataset names the figure depends on
+    params : dict
+        Extra keyword arguments for draw (must be JSON-serializable)
+    dpi : int
+        Resolution for raster outputs
+    """
+    output: str
+    draw: Callable
+    data: tuple = ()
+    params: dict = field(default_factory=dict)
+    dpi: int = 300
+
+
+def _dataset_digest(value) -> str:
+    digest = hashlib.sha256()
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr((list(value.columns), [str(t) for t in value.dtypes])).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(pickle.dumps(value))
+    return digest.hexdigest()
+
+
+_SOURCE_DIGESTS = {}
+
+
+def _source_digest(func) -> str:
+    """Hash of the file defining func, so any drawing-code edit re-renders."""
+    path = inspect.getsourcefile(func)
+    if path not in _SOURCE_DIGESTS:
+        _SOURCE_DIGESTS[path] = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    return _SOURCE_DIGESTS[path]
+
+
+def artifact_paths(spec: FigureSpec, formats=('png',), thumbnail_width=None):
+    """Root-relative files written for spec: one per format, plus the thumbnail."""
+    output = Path(spec.output)
+    paths = [str(output.with_suffix(f'.{fmt}')) for fmt in formats]
+    if thumbnail_width:
+        paths.append(str(output.parent / THUMBNAIL_DIR / f'{output.stem}.webp'))
+    return paths
+
+
+def spec_hash(spec: FigureSpec, data_digests: Dict[str, str]) -> str:
+    payload = {
+        'draw': f'{spec.draw.__module__}.{spec.draw.__qualname__}',
+        'source': _source_digest(spec.draw),
+        'data': {name: data_digests[name] for name in spec.data},
+        'params': spec.params,
+        'dpi': spec.dpi,
+        'matplotlib': matplotlib.__version__,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _init_worker(datasets):
+    _WORKER['datasets'] = datasets
+
+
+def _save(fig, path: Path, dpi):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    options = {'pil_kwargs': {'quality': WEBP_QUALITY}} if path.suffix == '.webp' else {}
+    fig.savefig(path, dpi=dpi, bbox_inches='tight', **options)
+
+
+def _render(spec: FigureSpec, root: str, datasets=None, formats=('png',),
+            thumbnail_width=None) -> float:
+    """Draw one figure, save every artifact; return seconds taken."""
+    start = time.perf_counter()
+    datasets = _WORKER['datasets'] if datasets is None else datasets
+    fig = spec.draw({name: datasets[name] for name in spec.data}, **spec.params)
+    paths = [Path(root) / path for path in artifact_paths(spec, formats, thumbnail_width)]
+    for path in paths[:len(formats)]:
+        _save(fig, path, spec.dpi)
+    if thumbnail_width:
+        # Width is set before the tight bbox trims margins, so it is approximate
+        _save(fig, paths[-1], thumbnail_width / fig.get_figwidth())
+    plt.close(fig)
+    return time.perf_counter() - start
+
+
+def _pool_context():
+    # Forked workers inherit the datasets, rcParams/styles and __main__'s
+    # draw functions without re-importing the calling script
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+
+def render_figures(specs: Sequence[FigureSpec], datasets: Dict[str, object], root,
+                   jobs: Optional[int] = None, force: bool = False, formats=('png',),
+                   thumbnail_width: Optional[int] = None,
+                   manifest_name: Optional[str] = None) -> Dict[str, str]:
+    """
+    Render the figures whose inputs changed since the last render.
+
+    Parameters:
+    -----------
+    specs : list of FigureSpec
+        Figures to render
+    datasets : dict
+        name -> DataFrame (or other picklable object) referenced by specs
+    root : str or Path
+        Directory that spec outputs are relative to
+    jobs : int
+        Worker processes (default: CPU count; 1 renders in-process)
+    force : bool
+        Re-render every figure regardless of the manifest
+    formats : tuple of str
+        Any of 'png', 'svg', 'webp'; the spec's output suffix is replaced
+    thumbnail_width : int
+        Also write a WebP of about this many pixels wide to thumbnails/
+    manifest_name : str
+        Manifest owner, usually the calling script's name; the manifest is
+        root/.figure_manifest.<manifest_name>.json (default: .figure_manifest.json)
+
+    Returns:
+    --------
+    dict
+        output -> 'rendered', 'up to date' or 'failed'
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest_path = root / (f'.figure_manifest.{manifest_name}.json' if manifest_name
+                           else MANIFEST_NAME)
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    needed = {name for spec in specs for name in spec.data}
+    data_digests = {name: _dataset_digest(datasets[name]) for name in needed}
+    # Manifest entries are per artifact, so switching between print and
+    # dashboard output does not invalidate the other; thumbnails also
+    # record their width
+    expected = {}
+    for spec in specs:
+        digest = spec_hash(spec, data_digests)
+        paths = artifact_paths(spec, formats, thumbnail_width)
+        expected[spec.output] = {path: digest for path in paths[:len(formats)]}
+        if thumbnail_width:
+            expected[spec.output][paths[-1]] = f'{digest}@{thumbnail_width}'
+
+    status, stale = {}, []
+    for spec in specs:
+        if not force and all(manifest.get(path) == digest and (root / path).exists()
+                             for path, digest in expected[spec.output].items()):
+            status[spec.output] = 'up to date'
+            print(f"  - Up to date: {spec.output}")
+        else:
+            stale.append(spec)
+
+    def finished(spec, seconds=None, error=None):
+        if error is None:
+            manifest.update(expected[spec.output])
+            status[spec.output] = 'rendered'
+            print(f"  ✓ Saved: {spec.output} ({seconds:.1f}s)")
+        else:
+            for path in expected[spec.output]:
+                manifest.pop(path, None)
+            status[spec.output] = 'failed'
+            print(f"  ✗ Failed: {spec.output}: {error}")
+
+    jobs = min(jobs or os.cpu_count() or 1, len(stale)) or 1
+    if jobs == 1:
+        for spec in stale:
+            try:
+                finished(spec, _render(spec, str(root), datasets, formats, thumbnail_width))
+            except Exception as error:
+                finished(spec, error=error)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=_pool_context(),
+                                 initializer=_init_worker, initargs=(datasets,)) as pool:
+            futures = {pool.submit(_render, spec, str(root), None, formats, thumbnail_width): spec
+                       for spec in stale}
+            for future in as_completed(futures):
+                try:
+                    finished(futures[future], future.result())
+                except Exception as error:
+                    finished(futures[future], error=error)
+
+    tmp_path = manifest_path.with_name(f'{manifest_path.name}.{os.getpid()}.tmp')
+    try:
+        tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        os.replace(tmp_path, manifest_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return status
+
+
+def add_render_arguments(parser):
+    """Rendering flags shared by the figure scripts."""
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Render processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render figures even if their inputs are unchanged')
+    parser.add_argument('--format', dest='formats', action='append', choices=FORMATS,
+                        help='Output format; repeat for several (default: png)')
+    parser.add_argument('--thumbnails', nargs='?', type=int, const=DASHBOARD_WIDTH,
+                        metavar='WIDTH', help='Also write dashboard-size WebP thumbnails '
+                        f'(default width {DASHBOARD_WIDTH}px)')
+    parser.add_argument('--dashboard', action='store_true',
+                        help='Write only the thumbnails, skipping print-quality output')
+    return parser
+
+
+def render_options(args):
+    """Keyword arguments for render_figures from add_render_arguments flags."""
+    thumbnail_width = args.thumbnails or (DASHBOARD_WIDTH if args.dashboard else None)
+    formats = () if args.dashboard else tuple(args.formats or ('png',))
+    return {'jobs': args.jobs, 'force': args.force, 'formats': formats,
+            'thumbnail_width': thumbnail_width}
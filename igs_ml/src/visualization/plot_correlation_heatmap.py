@@ -16,6 +16,10 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from pathlib import Path
+
+# Paths (the script writes figures relative to the working directory, igs_ml/output)
+DATA_PATH = Path(__file__).resolve().parents[2] / 'data' / 'igs_trends_features.csv'
 
 # Set style
 sns.set_style("white")
@@ -30,7 +34,7 @@ print("GENERATING CORRELATION HEATMAP")
 print("="*70)
 
 # Load the full dataset
-csv_file = 'igs_trends_features.csv'
+csv_file = DATA_PATH
 print(f"\nLoading data from {csv_file}...")
 df = pd.read_csv(csv_file)
 print(f"Loaded {len(df)} rows, {len(df.columns)} columns")
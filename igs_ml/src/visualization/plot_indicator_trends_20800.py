@@ -16,12 +16,16 @@ import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import os
+from pathlib import Path
+
+# Paths (the script writes figures relative to the working directory, igs_ml/output)
+DATA_PATH = Path(__file__).resolve().parents[2] / 'data' / 'igs_trends_features.csv'
 
 # Load tract 20800 data
 # If igs_20800_only.csv does not exist, fallback to igs_trends_features.csv filtered for tract 20800
 csv_path = "igs_20800_only.csv"
 if not os.path.exists(csv_path):
-    df = pd.read_csv("igs_trends_features.csv")
+    df = pd.read_csv(DATA_PATH)
     df['tract'] = df['tract'].astype(str).str.zfill(11)
     df = df[df['tract'] == '05085020800'].sort_values(
         'year').reset_index(drop=True)
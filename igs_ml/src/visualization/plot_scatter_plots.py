@@ -14,38 +14,35 @@ Instructions:
     scatter_median_income_vs_community_score.png
     scatter_housing_cost_burden_vs_igs_score.png
     scatter_broadband_access_vs_economy_score.png
+
+Figures are rendered by visualization.figure_renderer and skipped when
+their data and drawing code are unchanged.
 """
 
+import argparse
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-import os
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from visualization.figure_renderer import (  # noqa: E402
+    FigureSpec, add_render_arguments, render_figures, render_options)
+
+# Paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_PATH = BASE_DIR / 'data' / 'igs_trends_features.csv'
+OUTPUT_DIR = BASE_DIR / 'output'
 
 # Set style
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (10, 6)
 plt.rcParams['font.size'] = 11
 
-# Create output directory
-os.makedirs("figures", exist_ok=True)
-
 # Purple color
 purple = '#8e44ad'
 
-print("="*70)
-print("GENERATING SCATTER PLOTS")
-print("="*70)
-
-# Load the full dataset
-csv_file = 'igs_trends_features.csv'
-print(f"\nLoading data from {csv_file}...")
-df = pd.read_csv(csv_file)
-print(f"Loaded {len(df)} rows, {len(df.columns)} columns")
-
-# Remove rows with missing values
-df_clean = df.dropna()
-print(f"After removing missing values: {len(df_clean)} rows")
-
 # Define scatter plots to generate
 scatter_plots = [
     {
@@ -74,39 +71,62 @@ scatter_plots = [
     }
 ]
 
-# Generate each scatter plot
-for i, plot_config in enumerate(scatter_plots, 1):
-    print(f"\n{i}. Generating {plot_config['title']}...")
 
+def draw_scatter(data, x, y, x_label, y_label, title):
     # Create figure
     fig, ax = plt.subplots(figsize=(10, 6))
 
     # Create scatter plot with regression line
-    sns.regplot(data=df_clean,
-                x=plot_config['x'],
-                y=plot_config['y'],
+    sns.regplot(data=data['clean'], x=x, y=y,
                 scatter_kws={'color': purple, 'alpha': 0.6, 's': 80},
                 line_kws={'color': purple, 'linewidth': 2},
                 ax=ax)
 
     # Set labels and title
-    ax.set_xlabel(plot_config['x_label'], fontsize=13, fontweight='bold')
-    ax.set_ylabel(plot_config['y_label'], fontsize=13, fontweight='bold')
-    ax.set_title(plot_config['title'], fontsize=15, fontweight='bold', pad=20)
+    ax.set_xlabel(x_label, fontsize=13, fontweight='bold')
+    ax.set_ylabel(y_label, fontsize=13, fontweight='bold')
+    ax.set_title(title, fontsize=15, fontweight='bold', pad=20)
     ax.grid(True, alpha=0.3)
 
-    plt.tight_layout()
-
-    # Save figure
-    output_file = f"figures/{plot_config['filename']}"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    plt.close()
-
-    print(f"  ✓ Saved: {output_file}")
-
-print("\n" + "="*70)
-print("SCATTER PLOTS COMPLETE!")
-print("="*70)
-print(f"\nAll figures saved to: figures/")
-print(f"Total: {len(scatter_plots)} high-resolution PNG files (300 DPI)")
-print("="*70)
+    fig.tight_layout()
+    return fig
+
+
+def main(jobs=None, force=False, formats=('png',), thumbnail_width=None):
+    print("="*70)
+    print("GENERATING SCATTER PLOTS")
+    print("="*70)
+
+    # Load the full dataset
+    print(f"\nLoading data from {DATA_PATH}...")
+    df = pd.read_csv(DATA_PATH)
+    print(f"Loaded {len(df)} rows, {len(df.columns)} columns")
+
+    # Remove rows with missing values
+    df_clean = df.dropna()
+    print(f"After removing missing values: {len(df_clean)} rows\n")
+
+    specs = [FigureSpec(f"figures/{config['filename']}", draw_scatter, ('clean',),
+                        {key: value for key, value in config.items() if key != 'filename'})
+             for config in scatter_plots]
+    status = render_figures(specs, {'clean': df_clean}, OUTPUT_DIR, jobs=jobs, force=force,
+                            formats=formats, thumbnail_width=thumbnail_width,
+                            manifest_name=Path(__file__).stem)
+
+    print("\n" + "="*70)
+    print("SCATTER PLOTS COMPLETE!")
+    print("="*70)
+    print(f"\nAll figures saved to: {OUTPUT_DIR / 'figures'}")
+    print(f"Total: {len(scatter_plots)} high-resolution PNG files (300 DPI)")
+    print("="*70)
+    return status
+
+
+if __name__ == "__main__":
+    parser = add_render_arguments(argparse.ArgumentParser(description='Generate scatter plots'))
+    args = parser.parse_args()
+    status = main(**render_options(args))
+    # Failed figures are kept out of the manifest; a non-zero exit keeps the
+    # pipeline from recording the stage as done
+    if 'failed' in status.values():
+        sys.exit(1)
@@ -7,37 +7,41 @@ Generates comprehensive visualizations for:
 - Feature correlations
 - Model feature importance
 - Intervention impact analysis
+
+Figures are rendered in parallel by visualization.figure_renderer and
+skipped when their data and drawing code are unchanged.
 """
 
+import argparse
+import sys
 import pandas as pd
 import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
-import os
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.lines import Line2D
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from visualization.figure_renderer import (  # noqa: E402
+    FigureSpec, add_render_arguments, render_figures, render_options)
+
+# Paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_PATH = BASE_DIR / 'data' / 'igs_trends_features.csv'
+OUTPUT_DIR = BASE_DIR / 'output'
+MODELS_DIR = OUTPUT_DIR / 'models'
+
 # Set style
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (12, 6)
 plt.rcParams['font.size'] = 10
 
-# Create output directory
-os.makedirs("figures", exist_ok=True)
+# Per-tract figures label (and mark) each tract only up to this many tracts
+MAX_LABELLED_TRACTS = 20
 
-# Load main dataset
-print("Loading igs_trends_features.csv...")
-df = pd.read_csv("igs_trends_features.csv")
-df = df.sort_values(["tract", "year"])
-print(f"Loaded {len(df)} rows, {len(df.columns)} columns")
-print(f"Years: {sorted(df['year'].unique())}")
-print(f"Tracts: {sorted(df['tract'].unique())}\n")
-
-# ============================================================================
-# 1. TREND LINE CHARTS - Key Indicators (2020-2023)
-# ============================================================================
-print("Creating indicator trend charts...")
-
-indicators = [
+INDICATORS = [
     ('median_income', 'Median Income ($)', 'viridis'),
     ('broadband_access_pct', 'Broadband Access (%)', 'Blues'),
     ('minority_owned_businesses_pct', 'Minority-Owned Businesses (%)', 'Greens'),
@@ -45,294 +49,342 @@ indicators = [
     ('early_education_enrollment_pct', 'Early Education Enrollment (%)', 'Purples')
 ]
 
-for col, title, palette in indicators:
-    fig, ax = plt.subplots(figsize=(10, 6))
+PILLAR_SCORES = [
+    ('place_score', 'Place Score', '#e74c3c'),
+    ('economy_score', 'Economy Score', '#3498db'),
+    ('community_score', 'Community Score', '#2ecc71'),
+    ('igs_score', 'Overall IGS Score', '#9b59b6')
+]
 
-    for tract in sorted(df['tract'].unique()):
-        tract_data = df[df['tract'] == tract]
-        ax.plot(tract_data['year'], tract_data[col],
-                marker='o', label=f'Tract {tract}', linewidth=2)
+SCATTERPLOTS = [
+    ('broadband_access_pct', 'economy_score', 'Broadband Access vs Economy Score'),
+    ('median_income', 'community_score', 'Median Income vs Community Score'),
+    ('housing_cost_burden_pct', 'igs_score', 'Housing Cost Burden vs IGS Score')
+]
 
-    ax.set_xlabel('Year', fontsize=12, fontweight='bold')
-    ax.set_ylabel(title, fontsize=12, fontweight='bold')
-    ax.set_title(f'{title} Trends by Tract (2020-2023)',
-                 fontsize=14, fontweight='bold', pad=20)
-    ax.legend(title='Census Tract', bbox_to_anchor=(1.05, 1), loc='upper left')
-    ax.grid(True, alpha=0.3)
+IMPORTANCE_MODELS = [
+    ('place_score', 'Place Score Model', '#e74c3c'),
+    ('economy_score', 'Economy Score Model', '#3498db'),
+    ('community_score', 'Community Score Model', '#2ecc71'),
+    ('igs_score', 'IGS Score Model', '#9b59b6')
+]
 
-    plt.tight_layout()
-    plt.savefig(f'figures/trend_{col}.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    print(f"  ✓ Saved: figures/trend_{col}.png")
 
 # ============================================================================
-# 2. PILLAR SCORES TRENDS
+# 1. TREND LINE CHARTS - Key Indicators and Pillar Scores (2020-2023)
 # ============================================================================
-print("\nCreating pillar score trend charts...")
-
-pillar_scores = [
-    ('place_score', 'Place Score', '#e74c3c'),
-    ('economy_score', 'Economy Score', '#3498db'),
-    ('community_score', 'Community Score', '#2ecc71'),
-    ('igs_score', 'Overall IGS Score', '#9b59b6')
-]
 
-# Individual pillar charts
-for col, title, color in pillar_scores:
+def partition_tracts(df):
+    """
+    Split the panel by tract once, for every per-tract figure.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Panel sorted by tract and year
+
+    Returns:
+    --------
+    dict
+        tract -> positional row indices (in year order)
+    """
+    return {tract: rows for tract, rows in df.groupby('tract', sort=True).indices.items()}
+
+
+def _tract_colors(n_tracts):
+    cycle = to_rgba_array(plt.rcParams['axes.prop_cycle'].by_key()['color'])
+    return cycle[np.arange(n_tracts) % len(cycle)]
+
+
+def _tract_legend(ax, tracts, colors, extra=(), **handle_kws):
+    # One proxy handle per tract; beyond MAX_LABELLED_TRACTS a legend is unreadable
+    if len(tracts) > MAX_LABELLED_TRACTS:
+        ax.text(0.99, 0.01, f'{len(tracts):,} tracts', transform=ax.transAxes,
+                ha='right', va='bottom', fontsize=9, color='gray')
+        if extra:
+            ax.legend(handles=list(extra), loc='upper left')
+        return
+    handles = [Line2D([], [], color=color, label=f'Tract {tract}', **handle_kws)
+               for tract, color in zip(tracts, colors)]
+    ax.legend(handles=handles + list(extra), title='Census Tract', bbox_to_anchor=(1.05, 1),
+              loc='upper left')
+
+
+def draw_tract_trend(data, col, title, heading, linewidth=2):
+    df, groups = data['trends'], data['tract_groups']
+    tracts = list(groups)
+    colors = _tract_colors(len(tracts))
+    years = df['year'].to_numpy(dtype=float)
+    values = df[col].to_numpy(dtype=float)
+
+    # One LineCollection for every tract instead of one plot() call each
+    segments = [np.column_stack((years[rows], values[rows])) for rows in groups.values()]
+    labelled = len(tracts) <= MAX_LABELLED_TRACTS
     fig, ax = plt.subplots(figsize=(10, 6))
-
-    for tract in sorted(df['tract'].unique()):
-        tract_data = df[df['tract'] == tract]
-        ax.plot(tract_data['year'], tract_data[col],
-                marker='o', label=f'Tract {tract}', linewidth=2.5)
+    ax.add_collection(LineCollection(segments, colors=colors,
+                                     linewidths=linewidth if labelled else 0.5,
+                                     alpha=1.0 if labelled else 0.3))
+    if labelled:
+        point_colors = np.repeat(colors, [len(rows) for rows in groups.values()], axis=0)
+        order = np.concatenate(list(groups.values()))
+        ax.scatter(years[order], values[order], c=point_colors, s=36, zorder=3)
+    ax.autoscale_view()
 
     ax.set_xlabel('Year', fontsize=12, fontweight='bold')
     ax.set_ylabel(title, fontsize=12, fontweight='bold')
-    ax.set_title(f'{title} Evolution by Tract (2020-2023)',
+    ax.set_title(heading, fontsize=14, fontweight='bold', pad=20)
+    _tract_legend(ax, tracts, colors, marker='o', linewidth=linewidth)
+    ax.grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+def draw_pillar_scores_combined(data):
+    df = data['trends']
+    fig, ax = plt.subplots(figsize=(12, 7))
+    avg_scores = df.groupby('year')[['place_score', 'economy_score',
+                                     'community_score', 'igs_score']].mean()
+
+    ax.plot(avg_scores.index, avg_scores['place_score'],
+            marker='o', label='Place Score', linewidth=3, color='#e74c3c')
+    ax.plot(avg_scores.index, avg_scores['economy_score'],
+            marker='s', label='Economy Score', linewidth=3, color='#3498db')
+    ax.plot(avg_scores.index, avg_scores['community_score'],
+            marker='^', label='Community Score', linewidth=3, color='#2ecc71')
+    ax.plot(avg_scores.index, avg_scores['igs_score'],
+            marker='D', label='Overall IGS Score', linewidth=3, color='#9b59b6')
+
+    ax.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Score', fontsize=12, fontweight='bold')
+    ax.set_title('Average Pillar Scores Across All Tracts (2020-2023)',
                  fontsize=14, fontweight='bold', pad=20)
-    ax.legend(title='Census Tract', bbox_to_anchor=(1.05, 1), loc='upper left')
+    ax.legend(fontsize=11, loc='best')
     ax.grid(True, alpha=0.3)
 
-    plt.tight_layout()
-    plt.savefig(f'figures/trend_{col}.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    print(f"  ✓ Saved: figures/trend_{col}.png")
-
-# Combined pillar scores chart
-fig, ax = plt.subplots(figsize=(12, 7))
-avg_scores = df.groupby('year')[['place_score', 'economy_score',
-                                 'community_score', 'igs_score']].mean()
-
-ax.plot(avg_scores.index, avg_scores['place_score'],
-        marker='o', label='Place Score', linewidth=3, color='#e74c3c')
-ax.plot(avg_scores.index, avg_scores['economy_score'],
-        marker='s', label='Economy Score', linewidth=3, color='#3498db')
-ax.plot(avg_scores.index, avg_scores['community_score'],
-        marker='^', label='Community Score', linewidth=3, color='#2ecc71')
-ax.plot(avg_scores.index, avg_scores['igs_score'],
-        marker='D', label='Overall IGS Score', linewidth=3, color='#9b59b6')
-
-ax.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax.set_ylabel('Score', fontsize=12, fontweight='bold')
-ax.set_title('Average Pillar Scores Across All Tracts (2020-2023)',
-             fontsize=14, fontweight='bold', pad=20)
-ax.legend(fontsize=11, loc='best')
-ax.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('figures/pillar_scores_combined.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"  ✓ Saved: figures/pillar_scores_combined.png")
+    fig.tight_layout()
+    return fig
+
 
 # ============================================================================
-# 3. CORRELATION HEATMAP
+# 2. CORRELATION HEATMAP
 # ============================================================================
-print("\nCreating correlation heatmap...")
 
-# Select numerical columns (exclude tract and year)
-numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns
-numeric_cols = [col for col in numeric_cols if col not in ['tract', 'year']]
+def draw_correlation_heatmap(data):
+    df = data['trends']
+    # Select numerical columns (exclude tract and year)
+    numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns
+    numeric_cols = [col for col in numeric_cols if col not in ['tract', 'year']]
 
-correlation_matrix = df[numeric_cols].corr()
+    correlation_matrix = df[numeric_cols].corr()
 
-fig, ax = plt.subplots(figsize=(14, 12))
-sns.heatmap(correlation_matrix, annot=True, fmt='.2f', cmap='coolwarm',
-            center=0, square=True, linewidths=0.5, cbar_kws={"shrink": 0.8},
-            ax=ax)
-ax.set_title('Feature Correlation Heatmap',
-             fontsize=16, fontweight='bold', pad=20)
+    fig, ax = plt.subplots(figsize=(14, 12))
+    sns.heatmap(correlation_matrix, annot=True, fmt='.2f', cmap='coolwarm',
+                center=0, square=True, linewidths=0.5, cbar_kws={"shrink": 0.8},
+                ax=ax)
+    ax.set_title('Feature Correlation Heatmap',
+                 fontsize=16, fontweight='bold', pad=20)
+
+    fig.tight_layout()
+    return fig
 
-plt.tight_layout()
-plt.savefig('figures/correlation_heatmap.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"  ✓ Saved: figures/correlation_heatmap.png")
 
 # ============================================================================
-# 4. SCATTERPLOTS - Key Relationships
+# 3. SCATTERPLOTS - Key Relationships
 # ============================================================================
-print("\nCreating scatterplots...")
-
-scatterplots = [
-    ('broadband_access_pct', 'economy_score', 'Broadband Access vs Economy Score'),
-    ('median_income', 'community_score', 'Median Income vs Community Score'),
-    ('housing_cost_burden_pct', 'igs_score', 'Housing Cost Burden vs IGS Score')
-]
 
-for x_col, y_col, title in scatterplots:
+def draw_scatter(data, x_col, y_col, title):
+    df, groups = data['trends'], data['tract_groups']
+    tracts = list(groups)
+    colors = _tract_colors(len(tracts))
     fig, ax = plt.subplots(figsize=(10, 6))
 
-    # Color by tract
-    for tract in sorted(df['tract'].unique()):
-        tract_data = df[df['tract'] == tract]
-        ax.scatter(tract_data[x_col], tract_data[y_col],
-                   label=f'Tract {tract}', s=100, alpha=0.7)
+    # Color by tract with a single scatter call
+    order = np.concatenate(list(groups.values()))
+    point_colors = np.repeat(colors, [len(rows) for rows in groups.values()], axis=0)
+    labelled = len(tracts) <= MAX_LABELLED_TRACTS
+    ax.scatter(df[x_col].to_numpy()[order], df[y_col].to_numpy()[order], c=point_colors,
+               s=100 if labelled else 12, alpha=0.7 if labelled else 0.4)
 
     # Add regression line
-    z = np.polyfit(df[x_col].dropna(), df[y_col].dropna(), 1)
+    pairs = df[[x_col, y_col]].dropna().sort_values(x_col)
+    z = np.polyfit(pairs[x_col], pairs[y_col], 1)
     p = np.poly1d(z)
-    ax.plot(df[x_col].sort_values(), p(df[x_col].sort_values()),
-            "r--", alpha=0.8, linewidth=2, label='Trend Line')
+    trend_line, = ax.plot(pairs[x_col], p(pairs[x_col]),
+                          "r--", alpha=0.8, linewidth=2, label='Trend Line')
 
     ax.set_xlabel(x_col.replace('_', ' ').title(),
                   fontsize=12, fontweight='bold')
     ax.set_ylabel(y_col.replace('_', ' ').title(),
                   fontsize=12, fontweight='bold')
     ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
-    ax.legend(title='Census Tract', bbox_to_anchor=(1.05, 1), loc='upper left')
+    _tract_legend(ax, tracts, colors, extra=(trend_line,),
+                  marker='o', linestyle='', markersize=10, alpha=0.7)
     ax.grid(True, alpha=0.3)
 
-    plt.tight_layout()
-    safe_title = title.lower().replace(' ', '_').replace('vs', 'vs')
-    plt.savefig(f'figures/scatter_{safe_title}.png',
-                dpi=300, bbox_inches='tight')
-    plt.close()
-    print(f"  ✓ Saved: figures/scatter_{safe_title}.png")
+    fig.tight_layout()
+    return fig
 
-# ============================================================================
-# 5. FEATURE IMPORTANCE BAR CHARTS
-# ============================================================================
-print("\nCreating feature importance charts...")
-
-models_dir = Path("models")
-if models_dir.exists():
-    importance_files = [
-        ('place_score_feature_importance.csv', 'Place Score Model', '#e74c3c'),
-        ('economy_score_feature_importance.csv', 'Economy Score Model', '#3498db'),
-        ('community_score_feature_importance.csv',
-         'Community Score Model', '#2ecc71'),
-        ('igs_score_feature_importance.csv', 'IGS Score Model', '#9b59b6')
-    ]
-
-    for filename, title, color in importance_files:
-        filepath = models_dir / filename
-        if filepath.exists():
-            importance_df = pd.read_csv(filepath)
-
-            # Plot top 10 features
-            top_features = importance_df.head(10)
-
-            fig, ax = plt.subplots(figsize=(10, 6))
-            bars = ax.barh(range(len(top_features)), top_features['importance'],
-                           color=color, alpha=0.8)
-            ax.set_yticks(range(len(top_features)))
-            ax.set_yticklabels(top_features['feature'])
-            ax.set_xlabel('Importance Score', fontsize=12, fontweight='bold')
-            ax.set_title(f'Top 10 Features - {title}',
-                         fontsize=14, fontweight='bold', pad=20)
-            ax.invert_yaxis()
-            ax.grid(True, alpha=0.3, axis='x')
-
-            # Add value labels
-            for i, (bar, val) in enumerate(zip(bars, top_features['importance'])):
-                ax.text(val, i, f' {val:.4f}', va='center', fontsize=9)
-
-            plt.tight_layout()
-            safe_name = filename.replace('.csv', '')
-            plt.savefig(f'figures/{safe_name}.png',
-                        dpi=300, bbox_inches='tight')
-            plt.close()
-            print(f"  ✓ Saved: figures/{safe_name}.png")
-        else:
-            print(f"  ⚠ Not found: {filepath}")
-else:
-    print("  ⚠ models/ directory not found")
 
 # ============================================================================
-# 6. INTERVENTION COMPARISON
+# 4. FEATURE IMPORTANCE BAR CHARTS
 # ============================================================================
-print("\nCreating intervention comparison chart...")
 
-intervention_file = models_dir / "intervention_comparison.csv"
-if intervention_file.exists():
-    intervention_df = pd.read_csv(intervention_file)
+def draw_feature_importance(data, target, title, color):
+    # Plot top 10 features
+    top_features = data[f'importance_{target}'].head(10)
 
-    # Create comparison chart for different intervention scenarios
-    fig, ax = plt.subplots(figsize=(14, 7))
+    fig, ax = plt.subplots(figsize=(10, 6))
+    bars = ax.barh(range(len(top_features)), top_features['importance'],
+                   color=color, alpha=0.8)
+    ax.set_yticks(range(len(top_features)))
+    ax.set_yticklabels(top_features['feature'])
+    ax.set_xlabel('Importance Score', fontsize=12, fontweight='bold')
+    ax.set_title(f'Top 10 Features - {title}',
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.invert_yaxis()
+    ax.grid(True, alpha=0.3, axis='x')
+
+    # Add value labels
+    for i, (bar, val) in enumerate(zip(bars, top_features['importance'])):
+        ax.text(val, i, f' {val:.4f}', va='center', fontsize=9)
 
-    scenarios = intervention_df['Scenario']
-    x = range(len(scenarios))
+    fig.tight_layout()
+    return fig
+
+
+# ============================================================================
+# 5. INTERVENTION COMPARISON
+# ============================================================================
+
+def _grouped_score_bars(ax, frame, suffix='', label_suffix=''):
+    x = range(len(frame))
     width = 0.2
+    for offset, (col, title, color) in zip((-1.5, -0.5, 0.5, 1.5), PILLAR_SCORES):
+        label = title.replace('Overall ', '')
+        ax.bar([i + offset * width for i in x], frame[col + suffix],
+               width, label=label + label_suffix, color=color, alpha=0.8)
+    ax.set_xticks(x)
+    ax.set_xticklabels(frame['Scenario'], rotation=15, ha='right')
+
 
-    # Plot all four scores as grouped bars
-    bars1 = ax.bar([i - 1.5*width for i in x], intervention_df['place_score'],
-                   width, label='Place Score', color='#e74c3c', alpha=0.8)
-    bars2 = ax.bar([i - 0.5*width for i in x], intervention_df['economy_score'],
-                   width, label='Economy Score', color='#3498db', alpha=0.8)
-    bars3 = ax.bar([i + 0.5*width for i in x], intervention_df['community_score'],
-                   width, label='Community Score', color='#2ecc71', alpha=0.8)
-    bars4 = ax.bar([i + 1.5*width for i in x], intervention_df['igs_score'],
-                   width, label='IGS Score', color='#9b59b6', alpha=0.8)
+def draw_intervention_comparison(data):
+    # Grouped bars of all four scores per intervention scenario
+    fig, ax = plt.subplots(figsize=(14, 7))
+    _grouped_score_bars(ax, data['interventions'])
 
     ax.set_xlabel('Intervention Scenario', fontsize=12, fontweight='bold')
     ax.set_ylabel('Score', fontsize=12, fontweight='bold')
     ax.set_title('Impact of Different Intervention Strategies on Pillar Scores',
                  fontsize=14, fontweight='bold', pad=20)
-    ax.set_xticks(x)
-    ax.set_xticklabels(scenarios, rotation=15, ha='right')
     ax.legend(fontsize=11, loc='lower left')
     ax.grid(True, alpha=0.3, axis='y')
 
-    plt.tight_layout()
-    plt.savefig('figures/intervention_comparison.png',
-                dpi=300, bbox_inches='tight')
-    plt.close()
-    print(f"  ✓ Saved: figures/intervention_comparison.png")
+    fig.tight_layout()
+    return fig
 
-    # Create delta comparison chart
-    fig, ax = plt.subplots(figsize=(14, 7))
-
-    # Plot score changes (deltas) - exclude baseline row
-    delta_df = intervention_df.iloc[1:]  # Skip baseline
-    scenarios_delta = delta_df['Scenario']
-    x_delta = range(len(scenarios_delta))
 
-    bars1 = ax.bar([i - 1.5*width for i in x_delta], delta_df['place_score_delta'],
-                   width, label='Place Score Δ', color='#e74c3c', alpha=0.8)
-    bars2 = ax.bar([i - 0.5*width for i in x_delta], delta_df['economy_score_delta'],
-                   width, label='Economy Score Δ', color='#3498db', alpha=0.8)
-    bars3 = ax.bar([i + 0.5*width for i in x_delta], delta_df['community_score_delta'],
-                   width, label='Community Score Δ', color='#2ecc71', alpha=0.8)
-    bars4 = ax.bar([i + 1.5*width for i in x_delta], delta_df['igs_score_delta'],
-                   width, label='IGS Score Δ', color='#9b59b6', alpha=0.8)
+def draw_intervention_deltas(data):
+    # Score changes (deltas) - exclude baseline row
+    fig, ax = plt.subplots(figsize=(14, 7))
+    _grouped_score_bars(ax, data['interventions'].iloc[1:], '_delta', ' Δ')
 
     ax.axhline(y=0, color='black', linestyle='--', linewidth=1, alpha=0.5)
     ax.set_xlabel('Intervention Scenario', fontsize=12, fontweight='bold')
     ax.set_ylabel('Change in Score (Δ)', fontsize=12, fontweight='bold')
     ax.set_title('Score Changes from Baseline by Intervention Strategy',
                  fontsize=14, fontweight='bold', pad=20)
-    ax.set_xticks(x_delta)
-    ax.set_xticklabels(scenarios_delta, rotation=15, ha='right')
     ax.legend(fontsize=11, loc='best')
     ax.grid(True, alpha=0.3, axis='y')
 
-    plt.tight_layout()
-    plt.savefig('figures/intervention_delta_comparison.png',
-                dpi=300, bbox_inches='tight')
-    plt.close()
-    print(f"  ✓ Saved: figures/intervention_delta_comparison.png")
+    fig.tight_layout()
+    return fig
 
-    plt.tight_layout()
-    plt.savefig('figures/intervention_comparison.png',
-                dpi=300, bbox_inches='tight')
-    plt.close()
-    print(f"  ✓ Saved: figures/intervention_comparison.png")
-else:
-    print(f"  ⚠ Not found: {intervention_file}")
 
-# ============================================================================
-# SUMMARY
-# ============================================================================
-print("\n" + "="*70)
-print("VISUALIZATION COMPLETE!")
-print("="*70)
-print(f"\nAll figures saved to: figures/")
-print(f"\nGenerated visualizations:")
-print(f"  - 5 indicator trend charts")
-print(f"  - 4 pillar score trend charts")
-print(f"  - 1 combined pillar scores chart")
-print(f"  - 1 correlation heatmap")
-print(f"  - 3 scatterplots")
-print(f"  - 4 feature importance charts")
-print(f"  - 1 intervention comparison chart")
-print(f"\nTotal: ~19 high-resolution PNG files (300 DPI)")
-print("="*70)
+def load_datasets():
+    """Read every input once; missing model outputs are reported and skipped."""
+    print("Loading igs_trends_features.csv...")
+    df = pd.read_csv(DATA_PATH)
+    df = df.sort_values(["tract", "year"])
+    print(f"Loaded {len(df)} rows, {len(df.columns)} columns")
+    print(f"Years: {sorted(df['year'].unique())}")
+    print(f"Tracts: {df['tract'].nunique()}\n")
+
+    datasets = {'trends': df.reset_index(drop=True)}
+    datasets['tract_groups'] = partition_tracts(datasets['trends'])
+    for target, _, _ in IMPORTANCE_MODELS:
+        filepath = MODELS_DIR / f'{target}_feature_importance.csv'
+        if filepath.exists():
+            datasets[f'importance_{target}'] = pd.read_csv(filepath)
+        else:
+            print(f"  ⚠ Not found: {filepath}")
+    intervention_file = MODELS_DIR / "intervention_comparison.csv"
+    if intervention_file.exists():
+        datasets['interventions'] = pd.read_csv(intervention_file)
+    else:
+        print(f"  ⚠ Not found: {intervention_file}")
+    return datasets
+
+
+def build_specs(datasets):
+    specs = []
+    for col, title, _ in INDICATORS:
+        specs.append(FigureSpec(f'figures/trend_{col}.png', draw_tract_trend,
+                                ('trends', 'tract_groups'),
+                                {'col': col, 'title': title, 'linewidth': 2,
+                                 'heading': f'{title} Trends by Tract (2020-2023)'}))
+    for col, title, _ in PILLAR_SCORES:
+        specs.append(FigureSpec(f'figures/trend_{col}.png', draw_tract_trend,
+                                ('trends', 'tract_groups'),
+                                {'col': col, 'title': title, 'linewidth': 2.5,
+                                 'heading': f'{title} Evolution by Tract (2020-2023)'}))
+    specs.append(FigureSpec('figures/pillar_scores_combined.png',
+                            draw_pillar_scores_combined, ('trends',)))
+    specs.append(FigureSpec('figures/correlation_heatmap.png',
+                            draw_correlation_heatmap, ('trends',)))
+    for x_col, y_col, title in SCATTERPLOTS:
+        safe_title = title.lower().replace(' ', '_')
+        specs.append(FigureSpec(f'figures/scatter_{safe_title}.png', draw_scatter,
+                                ('trends', 'tract_groups'),
+                                {'x_col': x_col, 'y_col': y_col, 'title': title}))
+    for target, title, color in IMPORTANCE_MODELS:
+        if f'importance_{target}' in datasets:
+            specs.append(FigureSpec(f'figures/{target}_feature_importance.png',
+                                    draw_feature_importance, (f'importance_{target}',),
+                                    {'target': target, 'title': title, 'color': color}))
+    if 'interventions' in datasets:
+        specs.append(FigureSpec('figures/intervention_comparison.png',
+                                draw_intervention_comparison, ('interventions',)))
+        specs.append(FigureSpec('figures/intervention_delta_comparison.png',
+                                draw_intervention_deltas, ('interventions',)))
+    return specs
+
+
+def main(jobs=None, force=False, formats=('png',), thumbnail_width=None):
+    datasets = load_datasets()
+    specs = build_specs(datasets)
+
+    print(f"Rendering {len(specs)} figures...")
+    status = render_figures(specs, datasets, OUTPUT_DIR, jobs=jobs, force=force,
+                            formats=formats, thumbnail_width=thumbnail_width,
+                            manifest_name=Path(__file__).stem)
+
+    print("\n" + "="*70)
+    print("VISUALIZATION COMPLETE!")
+    print("="*70)
+    print(f"\nAll figures saved to: {OUTPUT_DIR / 'figures'}")
+    rendered = sum(s == 'rendered' for s in status.values())
+    print(f"Rendered {rendered}, up to date {sum(s == 'up to date' for s in status.values())}, "
+          f"failed {sum(s == 'failed' for s in status.values())}")
+    print("="*70)
+    return status
+
+
+if __name__ == "__main__":
+    parser = add_render_arguments(argparse.ArgumentParser(description=__doc__.splitlines()[1]))
+    args = parser.parse_args()
+    status = main(**render_options(args))
+    # Failed figures are kept out of the manifest; a non-zero exit keeps the
+    # pipeline from recording the stage as done
+    if 'failed' in status.values():
+        sys.exit(1)
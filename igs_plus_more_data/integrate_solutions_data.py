@@ -1,9 +1,9 @@
 import pandas as pd
 from pathlib import Path
 
-BASE = Path(
-    '/Users/cyrilkups/Desktop/DataDrive Project/Data Drive Datasets/Data That Back Solution')
-OUT = Path('/Users/cyrilkups/Desktop/DataDrive Project/igs_plus_more_data/integrated_county_solutions.csv')
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BASE = PROJECT_ROOT / 'Data Drive Datasets' / 'Data That Back Solution'
+OUT = PROJECT_ROOT / 'igs_plus_more_data' / 'integrated_county_solutions.csv'
 
 
 def clean_numeric(value):
@@ -15,10 +15,10 @@ Strategy:
 - Apply learned patterns to predict Lonoke improvements under interventions
 """
 
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
-import joblib
 
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.preprocessing import StandardScaler
@@ -27,11 +27,18 @@ from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'igs_ml' / 'src'))
+from modeling.feature_schema import FeatureSchema, scale_features  # noqa: E402
+from modeling.model_artifacts import dump_artifact, write_manifest  # noqa: E402
+from modeling.fast_models import export_fast_models  # noqa: E402
+from profiling.instrumentation import steps  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
 
 def load_lonoke_data():
     """Load Lonoke County tract-level IGS data"""
-    path = Path(
-        '/Users/cyrilkups/Desktop/DataDrive Project/igs_ml/data/igs_trends_features.csv')
+    path = PROJECT_ROOT / 'igs_ml' / 'data' / 'igs_trends_features.csv'
     df = pd.read_csv(path)
     df['county'] = 'Lonoke County, AR'
     df['data_source'] = 'lonoke'
@@ -41,8 +48,7 @@ def load_lonoke_data():
 
 def load_solution_counties():
     """Load solution counties data"""
-    path = Path(
-        '/Users/cyrilkups/Desktop/DataDrive Project/igs_plus_more_data/integrated_county_solutions.csv')
+    path = PROJECT_ROOT / 'igs_plus_more_data' / 'integrated_county_solutions.csv'
     df = pd.read_csv(path)
     df['data_source'] = 'solution'
     print(f"Loaded solution counties: {len(df)} rows")
@@ -281,7 +287,9 @@ def train_augmented_model(X, y, target_name, random_state=42):
         'test_rmse': test_rmse,
         'cv_scores': cv_scores,
         'feature_importance': feature_importance,
-        'feature_names': list(X.columns)
+        'feature_names': list(X.columns),
+        # Training medians double as fill values for missing inputs
+        'fill_values': X.median().to_dict()
     }
 
 
@@ -290,8 +298,15 @@ def save_augmented_models(results, target_name, output_dir='models_augmented'):
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
     # Save model and scaler
-    joblib.dump(results['model'], f"{output_dir}/{target_name}_model.joblib")
-    joblib.dump(results['scaler'], f"{output_dir}/{target_name}_scaler.joblib")
+    dump_artifact(results['model'], f"{output_dir}/{target_name}_model.joblib")
+    dump_artifact(results['scaler'], f"{output_dir}/{target_name}_scaler.joblib")
+
+    # Save feature schema (column order + median fill values)
+    schema = FeatureSchema(target=target_name,
+                           features=tuple(results['feature_names']),
+                           fill_values=results.get('fill_values', {}))
+    schema.save(output_dir)
+    results['schema'] = schema
 
     # Save feature importance
     results['feature_importance'].to_csv(
@@ -339,6 +354,13 @@ def predict_lonoke_interventions(combined_df, trained_models):
     print(
         f"  Minority Businesses: {baseline.get('minority_owned_businesses_pct', 'N/A'):.2f}%")
 
+    # Features Lonoke lacks are filled with each model's training medians
+    # (FeatureSchema.to_array(fill_missing=True)) rather than passed as NaN
+    features = {f for info in trained_models.values() for f in info['schema'].features}
+    missing = sorted(f for f in features if pd.isna(baseline.get(f)))
+    if missing:
+        print(f"  ⚠ Missing for Lonoke, filled with training medians: {missing}")
+
     # Intervention scenarios
     scenarios = {
         'Housing Affordability': {
@@ -380,16 +402,13 @@ def predict_lonoke_interventions(combined_df, trained_models):
         for target in ['igs_score', 'place_score', 'economy_score', 'community_score']:
             if target in trained_models:
                 model_info = trained_models[target]
-                features = model_info['feature_names']
 
-                # Prepare feature vector
-                X_scenario = pd.DataFrame([scenario_data[features]]).fillna(
-                    pd.Series({f: scenario_data.get(f, 0) for f in features})
-                )
-                X_scenario = X_scenario.fillna(X_scenario.median())
+                # Prepare feature vector (missing values -> training medians)
+                X_scenario = model_info['schema'].to_array(
+                    scenario_data, fill_missing=True)
 
                 # Scale and predict
-                X_scaled = model_info['scaler'].transform(X_scenario)
+                X_scaled = scale_features(model_info['scaler'], X_scenario)
                 pred = model_info['model'].predict(X_scaled)[0]
 
                 predictions[target] = pred
@@ -407,12 +426,9 @@ def predict_lonoke_interventions(combined_df, trained_models):
     for target in ['igs_score', 'place_score', 'economy_score', 'community_score']:
         if target in trained_models:
             model_info = trained_models[target]
-            features = model_info['feature_names']
-            X_scenario = pd.DataFrame([scenario_data[features]]).fillna(
-                pd.Series({f: scenario_data.get(f, 0) for f in features})
-            )
-            X_scenario = X_scenario.fillna(X_scenario.median())
-            X_scaled = model_info['scaler'].transform(X_scenario)
+            X_scenario = model_info['schema'].to_array(
+                scenario_data, fill_missing=True)
+            X_scaled = scale_features(model_info['scaler'], X_scenario)
             pred = model_info['model'].predict(X_scaled)[0]
             predictions[target] = pred
             predictions[f'{target}_gain'] = pred - baseline.get(target, 0)
@@ -435,10 +451,14 @@ if __name__ == "__main__":
     print("AUGMENTED MODEL TRAINING - SOLUTION COUNTIES + LONOKE")
     print("="*70)
 
+    step = steps('train_augmented_model')
+
     # Load and combine datasets
+    step('load_data')
     combined_df = prepare_combined_dataset()
 
     # Engineer features
+    step('engineer_features')
     combined_df = engineer_features(combined_df)
 
     # Train models for each target
@@ -446,6 +466,7 @@ if __name__ == "__main__":
     trained_models = {}
 
     for target in targets:
+        step(f'train_{target}')
         X, y, feature_names = prepare_training_data(combined_df, target)
 
         if len(X) < 10:
@@ -456,11 +477,22 @@ if __name__ == "__main__":
         results['feature_names'] = feature_names
         trained_models[target] = results
 
+        step(f'save_{target}')
         save_augmented_models(results, target)
 
+    # NumPy exports for the dashboard's fast-start CLI, then the manifest
+    # (written last: tells model watchers this set of artifacts is complete)
+    if trained_models:
+        export_fast_models('models_augmented', list(trained_models),
+                           models={t: r['model'] for t, r in trained_models.items()},
+                           scalers={t: r['scaler'] for t, r in trained_models.items()})
+        write_manifest('models_augmented')
+
     # Predict Lonoke interventions
     if trained_models:
+        step('predict_lonoke_interventions')
         predictions = predict_lonoke_interventions(combined_df, trained_models)
+    step.done()
 
     print("\n" + "="*70)
     print("AUGMENTED TRAINING COMPLETE!")
@@ -468,5 +500,7 @@ if __name__ == "__main__":
     print("\nOutputs saved to: models_augmented/")
     print("  - {target}_model.joblib")
     print("  - {target}_scaler.joblib")
+    print("  - {target}_schema.json")
+    print("  - {target}_packed.npz (NumPy-only copy for fast start)")
     print("  - {target}_feature_importance.csv")
     print("  - lonoke_intervention_predictions.csv")
@@ -1,10 +1,8 @@
 import { NextResponse } from 'next/server';
-import fs from 'fs/promises';
-import path from 'path';
-import Papa from 'papaparse';
+import { productPayload, payloadResponse } from '@/utils/dataProducts';
 
-// Absolute path to CSV in the workspace
-const ABSOLUTE_CSV_PATH = '/Users/cyrilkups/Desktop/DataDrive Project/igs_ml/data/igs_trends_features.csv';
+// Default series: the report's focus tract (?tract=<11-digit id> or ?county=<5-digit FIPS>)
+const FOCUS_TRACT = '05085020800';
 
 const fallbackData = [
   { year: 2019, igs: 51.2, place: 26.5, economy: 22.8, community: 35.3 },
@@ -15,28 +13,20 @@ const fallbackData = [
   { year: 2024, igs: 58.03, place: 21.0, economy: 20.0, community: 40.0 },
 ];
 
-export async function GET() {
-  try {
-    const fileContent = await fs.readFile(ABSOLUTE_CSV_PATH, 'utf-8');
-    const parsed = Papa.parse(fileContent, { header: true, skipEmptyLines: true });
+export async function GET(request: Request) {
+  const { searchParams } = new URL(request.url);
+  const county = searchParams.get('county');
+  const tract = searchParams.get('tract') || FOCUS_TRACT;
+  const key = county ? `county:${county}` : `tract:${tract}`;
 
-    if (parsed.errors?.length) {
-      console.warn('CSV parse errors:', parsed.errors);
-    }
+  const payload = productPayload('igs_trends', key, (trends) => {
+    const series = county ? trends.counties[county] : trends.tracts[tract];
+    return series ? { data: series } : null;
+  });
+  if (payload) return payloadResponse(request, payload);
 
-    const rows = (parsed.data as any[]).map((row) => {
-      const year = Number(row.year || row.Year || row.DATE || row.date || row[Object.keys(row)[0]]);
-      const igs = Number(row.igs || row.IGS || row.igs_score || row['IGS Score']);
-      const place = Number(row.place || row.Place || row.place_score || row['Place']);
-      const economy = Number(row.economy || row.Economy || row.economy_score || row['Economy']);
-      const community = Number(row.community || row.Community || row.community_score || row['Community']);
-      return { year, igs, place, economy, community };
-    }).filter(r => Number.isFinite(r.year));
-
-    const data = rows.length ? rows : fallbackData;
-    return NextResponse.json({ data });
-  } catch (err) {
-    console.warn('Failed to read trends CSV, using fallback:', (err as Error)?.message);
-    return NextResponse.json({ data: fallbackData });
+  if (searchParams.has('county') || searchParams.has('tract')) {
+    return NextResponse.json({ error: `No trends for ${key}` }, { status: 404 });
   }
+  return NextResponse.json({ data: fallbackData });
 }
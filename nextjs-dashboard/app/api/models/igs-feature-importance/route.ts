@@ -1,8 +1,8 @@
 import { NextResponse } from 'next/server';
-import fs from 'fs/promises';
-import Papa from 'papaparse';
+import { productPayload, payloadResponse } from '@/utils/dataProducts';
 
-const ABSOLUTE_PATH = '/Users/cyrilkups/Desktop/DataDrive Project/igs_plus_more_data/models_combined/igs_score_feature_importance.csv';
+// ?method=impurity (default) | permutation | sobol (Sobol total-effect indices)
+const METHODS = ['impurity', 'permutation', 'sobol'];
 
 const fallback = [
   { feature: 'Broadband Access', importance: 0.22 },
@@ -15,17 +15,12 @@ const fallback = [
   { feature: 'Crime Rate', importance: 0.05 },
 ];
 
-export async function GET() {
-  try {
-    const content = await fs.readFile(ABSOLUTE_PATH, 'utf-8');
-    const parsed = Papa.parse(content, { header: true, skipEmptyLines: true });
-    const rows = (parsed.data as any[]).map((row) => ({
-      feature: String(row.feature || row.Feature || row.variable || row['Feature Name'] || row[Object.keys(row)[0]]),
-      importance: Number(row.importance || row.Importance || row.value || row['Importance Score'] || row[Object.keys(row)[1]]),
-    })).filter(r => r.feature && Number.isFinite(r.importance));
-    return NextResponse.json({ data: rows.length ? rows : fallback });
-  } catch (e) {
-    console.warn('Failed to read feature importance, using fallback:', (e as Error)?.message);
-    return NextResponse.json({ data: fallback });
-  }
+export async function GET(request: Request) {
+  const requested = new URL(request.url).searchParams.get('method') || 'impurity';
+  const method = METHODS.includes(requested) ? requested : 'impurity';
+  const payload = productPayload('importances', method, (importances) => {
+    const rows = importances.igs_score?.[method];
+    return rows?.length ? { data: rows } : null;
+  });
+  return payload ? payloadResponse(request, payload) : NextResponse.json({ data: fallback });
 }
@@ -1,6 +1,8 @@
 import { NextResponse } from 'next/server';
+import { getProduct, productPayload, payloadResponse } from '@/utils/dataProducts';
 
-// Sample IGS data for Lonoke County
+// Sample IGS data for Lonoke County; data-driven fields are replaced by the
+// report_data product (igs_ml/src/pipeline/export_data_products.py)
 const sampleData = {
   metadata: {
     title: 'Lonoke County IGS Comprehensive Report',
@@ -107,73 +109,101 @@ const sampleData = {
   },
 };
 
-function formatReportData(reportType: string) {
-  const latest = sampleData.historical_data[sampleData.historical_data.length - 1];
-  const previous = sampleData.historical_data[sampleData.historical_data.length - 2];
+type ReportData = typeof sampleData;
+
+const REPORT_TYPES = ['comprehensive', 'summary', 'trends', 'pillars', 'predictions'];
+
+// Replace the sample figures with the exported report_data product, if present
+function buildReportData(): ReportData {
+  const product = getProduct('report_data');
+  if (!product) return sampleData;
+  const latest = product.indicator_trends[product.indicator_trends.length - 1];
+  return {
+    ...sampleData,
+    metadata: { ...sampleData.metadata, ...product.metadata },
+    executive_summary: { ...sampleData.executive_summary, ...product.executive_summary },
+    historical_data: product.historical_data,
+    detailed_indicators: {
+      economic: { ...sampleData.detailed_indicators.economic, median_income: latest.median_income, minority_business_pct: latest.minority_owned_businesses_pct },
+      infrastructure: { ...sampleData.detailed_indicators.infrastructure, broadband_access: latest.broadband_access_pct, housing_burden: latest.housing_cost_burden_pct },
+      community: { ...sampleData.detailed_indicators.community, early_education: latest.early_education_enrollment_pct },
+    },
+    ml_model_info: { ...sampleData.ml_model_info, top_features: product.top_features },
+    indicator_trends: product.indicator_trends,
+    ml_forecasts: product.ml_forecasts,
+    threshold: product.threshold,
+    model_accuracy: product.model_accuracy ?? sampleData.model_accuracy,
+    intervention_impacts: product.intervention_impacts,
+  };
+}
+
+function formatReportData(reportType: string, data: ReportData) {
+  const latest = data.historical_data[data.historical_data.length - 1];
+  const previous = data.historical_data[data.historical_data.length - 2];
 
   switch (reportType) {
     case 'comprehensive':
-      return sampleData;
+      return data;
 
     case 'summary':
       return {
         key_metrics: [
-          { metric: 'IGS Score', value: latest.igs_score, change: sampleData.executive_summary.igs_change_pct, status: 'Declining' },
-          { metric: 'Place Score', value: latest.place_score, change: sampleData.executive_summary.place_change_pct, status: 'Stable' },
-          { metric: 'Economy Score', value: latest.economy_score, change: sampleData.executive_summary.economy_change_pct, status: 'Declining' },
-          { metric: 'Community Score', value: latest.community_score, change: sampleData.executive_summary.community_change_pct, status: 'Declining' },
+          { metric: 'IGS Score', value: latest.igs_score, change: data.executive_summary.igs_change_pct, status: 'Declining' },
+          { metric: 'Place Score', value: latest.place_score, change: data.executive_summary.place_change_pct, status: 'Stable' },
+          { metric: 'Economy Score', value: latest.economy_score, change: data.executive_summary.economy_change_pct, status: 'Declining' },
+          { metric: 'Community Score', value: latest.community_score, change: data.executive_summary.community_change_pct, status: 'Declining' },
         ],
         critical_indicators: {
-          median_income: sampleData.detailed_indicators.economic.median_income,
-          housing_burden: sampleData.detailed_indicators.infrastructure.housing_burden,
-          broadband_access: sampleData.detailed_indicators.infrastructure.broadband_access,
-          early_education: sampleData.detailed_indicators.community.early_education,
+          median_income: data.detailed_indicators.economic.median_income,
+          housing_burden: data.detailed_indicators.infrastructure.housing_burden,
+          broadband_access: data.detailed_indicators.infrastructure.broadband_access,
+          early_education: data.detailed_indicators.community.early_education,
         },
       };
 
     case 'trends':
       return {
-        yearly_trends: sampleData.historical_data.map((row, idx) => ({
+        yearly_trends: data.historical_data.map((row, idx) => ({
           year: row.year,
           igs_score: row.igs_score,
-          growth_rate: idx > 0 ? ((row.igs_score - sampleData.historical_data[idx - 1].igs_score) / sampleData.historical_data[idx - 1].igs_score * 100) : 0,
+          growth_rate: idx > 0 ? ((row.igs_score - data.historical_data[idx - 1].igs_score) / data.historical_data[idx - 1].igs_score * 100) : 0,
         })),
-        pillar_trends: sampleData.historical_data.map(row => ({
+        pillar_trends: data.historical_data.map(row => ({
           year: row.year,
           place_score: row.place_score,
           economy_score: row.economy_score,
           community_score: row.community_score,
         })),
-        indicator_trends: sampleData.indicator_trends,
+        indicator_trends: data.indicator_trends,
       };
 
     case 'pillars':
       return {
         breakdown: [
-          { pillar: 'Place', score: latest.place_score, change: sampleData.executive_summary.place_change_pct, weight: 33.3 },
-          { pillar: 'Economy', score: latest.economy_score, change: sampleData.executive_summary.economy_change_pct, weight: 33.3 },
-          { pillar: 'Community', score: latest.community_score, change: sampleData.executive_summary.community_change_pct, weight: 33.3 },
+          { pillar: 'Place', score: latest.place_score, change: data.executive_summary.place_change_pct, weight: 33.3 },
+          { pillar: 'Economy', score: latest.economy_score, change: data.executive_summary.economy_change_pct, weight: 33.3 },
+          { pillar: 'Community', score: latest.community_score, change: data.executive_summary.community_change_pct, weight: 33.3 },
         ],
         place_indicators: {
-          broadband: sampleData.detailed_indicators.infrastructure.broadband_access,
-          housing_burden: sampleData.detailed_indicators.infrastructure.housing_burden,
+          broadband: data.detailed_indicators.infrastructure.broadband_access,
+          housing_burden: data.detailed_indicators.infrastructure.housing_burden,
         },
         economy_indicators: {
-          median_income: sampleData.detailed_indicators.economic.median_income,
-          minority_business: sampleData.detailed_indicators.economic.minority_business_pct,
+          median_income: data.detailed_indicators.economic.median_income,
+          minority_business: data.detailed_indicators.economic.minority_business_pct,
         },
         community_indicators: {
-          early_education: sampleData.detailed_indicators.community.early_education,
+          early_education: data.detailed_indicators.community.early_education,
         },
       };
 
     case 'predictions':
       return {
-        ml_forecasts: sampleData.ml_forecasts,
-        threshold: sampleData.threshold,
-        model_accuracy: sampleData.model_accuracy,
-        model_details: sampleData.model_details,
-        intervention_impacts: sampleData.intervention_impacts,
+        ml_forecasts: data.ml_forecasts,
+        threshold: data.threshold,
+        model_accuracy: data.model_accuracy,
+        model_details: data.model_details,
+        intervention_impacts: data.intervention_impacts,
       };
 
     default:
@@ -185,11 +215,14 @@ export async function GET(request: Request) {
   try {
     const { searchParams } = new URL(request.url);
     const reportType = searchParams.get('type') || 'comprehensive';
-    const dateRange = searchParams.get('dateRange') || 'all-time';
 
-    const data = formatReportData(reportType);
-    
-    return NextResponse.json(data);
+    // Each report type is built and serialized once per server process
+    if (REPORT_TYPES.includes(reportType)) {
+      const payload = productPayload('report_data', reportType, () => formatReportData(reportType, buildReportData()));
+      if (payload) return payloadResponse(request, payload);
+    }
+
+    return NextResponse.json(formatReportData(reportType, sampleData));
   } catch (error: any) {
     console.error('Report data fetch error:', error);
     return NextResponse.json(
@@ -6,140 +6,149 @@ Loads trained Random Forest models and predicts intervention impacts
 
 import sys
 import json
-import numpy as np
-import pandas as pd
 from pathlib import Path
-import joblib
 import warnings
 warnings.filterwarnings('ignore')
 
+# Only NumPy-level modules at import time: the models load from the
+# fast-start exports, so neither scikit-learn nor pandas is imported unless
+# --explain needs the original estimators
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / 'igs_ml' / 'src'))
+from modeling.feature_schema import scale_features  # noqa: E402
+from modeling.fast_models import export_fast_models, load_fast_models  # noqa: E402
+from analysis.forecast_engine import ForecastEngine, ForecastScenario  # noqa: E402
+from analysis.policy_scenario import SCORE_TYPES, policy_rows  # noqa: E402
+
+
+def load_models(models_dir):
+    """
+    Models, scalers and schemas for the four scores.
+
+    Uses the NumPy exports when they match the trained models; otherwise
+    loads the joblib artifacts and refreshes the exports for the next call.
+    """
+    loaded = load_fast_models(models_dir, SCORE_TYPES)
+    if loaded is not None:
+        return loaded
+    from modeling.model_artifacts import load_pillar_models
+    models, scalers, schemas = load_pillar_models(models_dir, SCORE_TYPES)
+    try:
+        export_fast_models(models_dir, SCORE_TYPES, models, scalers)
+    except OSError:
+        # Read-only deployment: keep using the joblib models
+        pass
+    return models, scalers, schemas
+
+
+def check_projection(impact, gap, tolerance=0.05):
+    """
+    Warn (on stderr, stdout carries the JSON) when the 2030 projection gap
+    and the headline impact point in opposite directions.
+    """
+    if abs(impact) > tolerance and abs(gap) > tolerance and (impact > 0) != (gap > 0):
+        print(f"⚠ 2030 projection gap ({gap:+.2f}) disagrees in sign with the "
+              f"IGS impact ({impact:+.2f})", file=sys.stderr)
+        return False
+    return True
+
 
 def main():
-    # Parse command line arguments
-    if len(sys.argv) != 4:
+    # Parse command line arguments (optional --intervals adds Monte Carlo
+    # bounds, --explain adds per-feature contributions to each score change)
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if len(args) != 3 or flags - {'--intervals', '--explain'}:
         print(json.dumps(
-            {"error": "Usage: run_policy_simulation.py <housing_reduction> <education_increase> <business_increase>"}))
+            {"error": "Usage: run_policy_simulation.py <housing_reduction> <education_increase> <business_increase> [--intervals] [--explain]"}))
         sys.exit(1)
 
-    housing_reduction = float(sys.argv[1])
-    education_increase = float(sys.argv[2])
-    business_increase = float(sys.argv[3])
+    housing_reduction = float(args[0])
+    education_increase = float(args[1])
+    business_increase = float(args[2])
 
     # Load trained models
-    models_dir = Path(
-        '/Users/cyrilkups/Desktop/DataDrive Project/igs_plus_more_data/models_augmented')
+    models_dir = PROJECT_ROOT / 'igs_plus_more_data' / 'models_augmented'
 
     try:
-        igs_model = joblib.load(models_dir / 'igs_score_model.joblib')
-        igs_scaler = joblib.load(models_dir / 'igs_score_scaler.joblib')
-        place_model = joblib.load(models_dir / 'place_score_model.joblib')
-        place_scaler = joblib.load(models_dir / 'place_score_scaler.joblib')
-        economy_model = joblib.load(models_dir / 'economy_score_model.joblib')
-        economy_scaler = joblib.load(
-            models_dir / 'economy_score_scaler.joblib')
-        community_model = joblib.load(
-            models_dir / 'community_score_model.joblib')
-        community_scaler = joblib.load(
-            models_dir / 'community_score_scaler.joblib')
+        models, scalers, schemas = load_models(models_dir)
+        # All augmented models share the 18-feature schema
+        schema = schemas['igs_score']
     except Exception as e:
         print(json.dumps({"error": f"Failed to load models: {str(e)}"}))
         sys.exit(1)
 
-    # Baseline 2024 values for Lonoke County (Tract 20800)
-    baseline = {
-        'year': 2024,
-        'median_income': 36500,
-        'broadband_access_pct': 58.7,
-        'minority_owned_businesses_pct': 8.3,
-        'housing_cost_burden_pct': 86.5,
-        'early_education_enrollment_pct': 33.4,
-        'income_growth': -3.1,
-        'broadband_growth': 2.9,
-        'minority_business_growth': 0.0,
-        'housing_burden_change': 0.0,
-        'early_ed_growth': -3.3,
-        'igs_score': 27.0,
-        'place_score': 21.0,
-        'economy_score': 20.0,
-        'community_score': 40.0
-    }
+    # Baseline (tract 20800, 2024) and intervention rows
+    baseline, intervention = policy_rows(
+        housing_reduction, education_increase, business_increase)
 
-    # Create intervention scenario
-    intervention = baseline.copy()
-    intervention['housing_cost_burden_pct'] = max(
-        0, baseline['housing_cost_burden_pct'] - housing_reduction)
-    intervention['early_education_enrollment_pct'] = min(
-        100, baseline['early_education_enrollment_pct'] + education_increase)
-    intervention['minority_owned_businesses_pct'] = min(
-        100, baseline['minority_owned_businesses_pct'] + business_increase)
-
-    # Calculate changes
-    intervention['housing_burden_change'] = intervention['housing_cost_burden_pct'] - \
-        baseline['housing_cost_burden_pct']
-    intervention['early_ed_growth'] = ((intervention['early_education_enrollment_pct'] - baseline['early_education_enrollment_pct']) /
-                                       baseline['early_education_enrollment_pct'] * 100) if baseline['early_education_enrollment_pct'] > 0 else 0
-    intervention['minority_business_growth'] = ((intervention['minority_owned_businesses_pct'] - baseline['minority_owned_businesses_pct']) /
-                                                baseline['minority_owned_businesses_pct'] * 100) if baseline['minority_owned_businesses_pct'] > 0 else 0
-
-    # Feature columns (18 features used in training)
-    feature_cols = [
-        'median_income', 'broadband_access_pct', 'minority_owned_businesses_pct',
-        'housing_cost_burden_pct', 'early_education_enrollment_pct',
-        'income_growth', 'broadband_growth', 'minority_business_growth',
-        'housing_burden_change', 'early_ed_growth',
-        'igs_score_lag1', 'place_score_lag1', 'economy_score_lag1', 'community_score_lag1',
-        'igs_score_change', 'place_score_change', 'economy_score_change', 'community_score_change'
-    ]
+    # Baseline and intervention rows as one (2, 18) matrix in model order
+    X = schema.to_array([baseline, intervention])
 
-    # Add lagged and change features
-    for score_type in ['igs_score', 'place_score', 'economy_score', 'community_score']:
-        baseline[f'{score_type}_lag1'] = baseline[score_type]
-        baseline[f'{score_type}_change'] = 0
-        intervention[f'{score_type}_lag1'] = baseline[score_type]
-        intervention[f'{score_type}_change'] = 0
+    predictions = {
+        target: models[target].predict(scale_features(scalers[target], X))
+        for target in SCORE_TYPES
+    }
 
     # Predict baseline
-    X_baseline = pd.DataFrame([baseline])[feature_cols].fillna(0)
-    X_baseline_scaled = igs_scaler.transform(X_baseline)
-
-    baseline_pred = {
-        'igs_score': float(igs_model.predict(X_baseline_scaled)[0]),
-        'place_score': float(place_model.predict(place_scaler.transform(X_baseline))[0]),
-        'economy_score': float(economy_model.predict(economy_scaler.transform(X_baseline))[0]),
-        'community_score': float(community_model.predict(community_scaler.transform(X_baseline))[0])
-    }
+    baseline_pred = {target: float(predictions[target][0]) for target in SCORE_TYPES}
 
     # Predict intervention
-    X_intervention = pd.DataFrame([intervention])[feature_cols].fillna(0)
-    X_intervention_scaled = igs_scaler.transform(X_intervention)
-
-    intervention_pred = {
-        'igs_score': float(igs_model.predict(X_intervention_scaled)[0]),
-        'place_score': float(place_model.predict(place_scaler.transform(X_intervention))[0]),
-        'economy_score': float(economy_model.predict(economy_scaler.transform(X_intervention))[0]),
-        'community_score': float(community_model.predict(community_scaler.transform(X_intervention))[0])
-    }
+    intervention_pred = {target: float(predictions[target][1]) for target in SCORE_TYPES}
 
     # Calculate impacts
-    impacts = {
-        'igs_score': intervention_pred['igs_score'] - baseline_pred['igs_score'],
-        'place_score': intervention_pred['place_score'] - baseline_pred['place_score'],
-        'economy_score': intervention_pred['economy_score'] - baseline_pred['economy_score'],
-        'community_score': intervention_pred['community_score'] - baseline_pred['community_score']
-    }
+    impacts = {target: intervention_pred[target] - baseline_pred[target]
+               for target in SCORE_TYPES}
+
+    # Optional prediction intervals from per-tree Monte Carlo draws
+    intervals = None
+    if '--intervals' in flags:
+        from analysis.uncertainty import MonteCarloEngine, UncertaintyConfig
+        engine = MonteCarloEngine(models, scalers, {target: schema for target in SCORE_TYPES})
+        intervals = engine.simulate(X[0], X[1], UncertaintyConfig())
+
+    # Optional TreeSHAP attributions (cached per model hash and row); these
+    # walk the original estimators, so load them here
+    attributions = None
+    if '--explain' in flags:
+        from modeling.model_artifacts import load_pillar_models, model_hash
+        from modeling.tree_attribution import TreeAttributor, explain_change
+        estimators, estimator_scalers, _ = load_pillar_models(models_dir, SCORE_TYPES)
+        attributions = {
+            target: explain_change(
+                TreeAttributor.from_estimator(estimators[target], model_hash(models_dir, target)),
+                schema, estimator_scalers[target], X[0], X[1])
+            for target in SCORE_TYPES
+        }
 
-    # Project to 2030 (linear progression)
+    # Project to 2030: roll features forward year by year and re-predict.
+    # The intervention is in place from the first projected year and both
+    # scenarios share the baseline path's lagged scores, so the gap between
+    # the lines comes from the policy levers alone, as in `impacts`
     projection_years = [2024, 2025, 2026, 2027, 2028, 2029, 2030]
-    projection_data = []
-
-    for i, year in enumerate(projection_years):
-        progress = i / (len(projection_years) - 1)
-        projection_data.append({
+    horizon = len(projection_years) - 1
+    forecaster = ForecastEngine(models, scalers, {target: schema for target in SCORE_TYPES})
+    level_deltas = {
+        feature: intervention[feature] - baseline[feature]
+        for feature in ('housing_cost_burden_pct', 'early_education_enrollment_pct',
+                        'minority_owned_businesses_pct')
+    }
+    paths = forecaster.forecast_arrays(
+        baseline, [ForecastScenario('intervention', level_deltas)],
+        horizon=horizon, start_year=projection_years[0], anchor_to_observed=True,
+        score_state='baseline')
+
+    # scores: (scenario, tract, year); scenario 0 is the baseline
+    baseline_path, intervention_path = paths['scores']['igs_score'][:, 0]
+    projection_data = [
+        {
             'year': str(year),
-            # Continuing decline trend (-0.3 per year)
-            'baseline': round(27.0 - (0.3 * i), 2),
-            'intervention': round(27.0 + (impacts['igs_score'] * progress), 2)
-        })
+            'baseline': round(float(baseline_path[i]), 2),
+            'intervention': round(float(intervention_path[i]), 2)
+        }
+        for i, year in enumerate(projection_years)
+    ]
+    check_projection(impacts['igs_score'], intervention_path[-1] - baseline_path[-1])
 
     # Prepare result
     result = {
@@ -154,6 +163,12 @@ def main():
         }
     }
 
+    if intervals is not None:
+        result['intervals'] = intervals
+
+    if attributions is not None:
+        result['attributions'] = attributions
+
     print(json.dumps(result))
 
 
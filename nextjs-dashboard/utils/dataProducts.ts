@@ -0,0 +1,79 @@
+import fs from 'fs';
+import path from 'path';
+import crypto from 'crypto';
+import { NextResponse } from 'next/server';
+
+// Precomputed payloads written by igs_ml/src/pipeline/export_data_products.py
+const PRODUCTS_DIR = path.join(process.cwd(), 'data', 'products');
+
+type Manifest = {
+  schema_version: number;
+  products: Record<string, { file: string; etag: string; bytes: number }>;
+};
+
+export type Payload = { body: string; etag: string };
+
+let manifest: Manifest | null | undefined;
+const parsed = new Map<string, any>();
+const payloads = new Map<string, Payload>();
+
+function loadManifest(): Manifest | null {
+  if (manifest === undefined) {
+    try {
+      manifest = JSON.parse(fs.readFileSync(path.join(PRODUCTS_DIR, 'manifest.json'), 'utf-8'));
+    } catch (e) {
+      console.warn('Data products unavailable, using fallbacks:', (e as Error)?.message);
+      manifest = null;
+    }
+  }
+  return manifest as Manifest | null;
+}
+
+/** Parsed product, read from disk once per server process. */
+export function getProduct<T = any>(name: string): T | null {
+  if (!parsed.has(name)) {
+    const entry = loadManifest()?.products[name];
+    try {
+      parsed.set(name, entry ? JSON.parse(fs.readFileSync(path.join(PRODUCTS_DIR, entry.file), 'utf-8')) : null);
+    } catch (e) {
+      console.warn(`Failed to read data product ${name}:`, (e as Error)?.message);
+      parsed.set(name, null);
+    }
+  }
+  return parsed.get(name);
+}
+
+/**
+ * Serialized response body for one view of a product, built once per key.
+ * The ETag combines the product's content ETag with the view key.
+ */
+export function productPayload(name: string, key: string, build: (product: any) => unknown): Payload | null {
+  const cacheKey = `${name}:${key}`;
+  if (!payloads.has(cacheKey)) {
+    const product = getProduct(name);
+    const entry = loadManifest()?.products[name];
+    const view = product && entry ? build(product) : null;
+    // Misses are not cached, so arbitrary query values cannot grow the cache
+    if (view == null) return null;
+    payloads.set(cacheKey, {
+      body: JSON.stringify(view),
+      etag: `"${crypto.createHash('sha256').update(`${entry!.etag}:${key}`).digest('hex').slice(0, 20)}"`,
+    });
+  }
+  return payloads.get(cacheKey)!;
+}
+
+/** 304 when the client already holds this payload, otherwise the cached body. */
+export function payloadResponse(request: Request, payload: Payload): Response {
+  const headers = {
+    ETag: payload.etag,
+    'Cache-Control': 'public, max-age=0, must-revalidate',
+  };
+  const cached = (request.headers.get('if-none-match') || '').split(',').map((tag) => tag.trim().replace(/^W\//, ''));
+  if (cached.includes(payload.etag)) {
+    return new Response(null, { status: 304, headers });
+  }
+  return new NextResponse(payload.body, {
+    headers: { ...headers, 'Content-Type': 'application/json' },
+  });
+}